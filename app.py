@@ -1,22 +1,74 @@
 # cli.py
 import click
-from rich.console import Console
-from rich.table import Table
-from sqlalchemy.orm import sessionmaker
-from datetime import datetime
-import sqlalchemy as sa
 
-from lib.models import User, Company, Job, Application, engine
+# Only click is imported up front. The database session, the models and rich
+# are loaded by the commands that use them, so `--help` and other commands
+# that never touch the database start quickly.
+from lib.db import session, configure, DEFAULT_BATCH_SIZE, PRAGMA_PROFILES
 
-Session = sessionmaker(bind=engine)
-session = Session()
+class LazyConsole:
+    """Stands in for rich's Console and imports rich on first use."""
+    _console = None
 
-console = Console()
+    def __getattr__(self, name):
+        if LazyConsole._console is None:
+            from rich.console import Console
+            LazyConsole._console = Console()
+        return getattr(LazyConsole._console, name)
+
+console = LazyConsole()
 
 @click.group()
-def cli():
+@click.option('--database-url', help='SQLAlchemy database URL (default: $SWIPEMATCH_DATABASE_URL or the local SQLite file).')
+@click.option('--db-profile', type=click.Choice(list(PRAGMA_PROFILES)), help='SQLite tuning profile (default: $SWIPEMATCH_DB_PROFILE or "default").')
+def cli(database_url, db_profile):
     """📘 Job Tracker CLI App"""
-    pass
+    if database_url or db_profile:
+        configure(url=database_url, profile=db_profile)
+
+def list_options(command):
+    """Paging options shared by the list-* commands."""
+    command = click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(min=1), help='Rows fetched per query.')(command)
+    command = click.option('--stream/--table', default=True, help='Print each batch as soon as it is fetched (default), or hold every row for one table.')(command)
+    command = click.option('--after-id', type=int, help='Only show rows with an ID greater than this (keyset cursor).')(command)
+    command = click.option('--limit', type=click.IntRange(min=1), help='Maximum number of rows to show.')(command)
+    return command
+
+def new_table(title, columns):
+    from rich.table import Table
+    table = Table(title=title)
+    table.add_column(columns[0], justify="right")
+    for column in columns[1:]:
+        table.add_column(column)
+    return table
+
+def print_listing(title, columns, pages, format_row, stream=True, limit=None):
+    """Render keyset pages as one table per page as they arrive, or all in one table.
+
+    Streaming keeps one page in memory at a time; a single table holds every
+    row until the listing ends.
+    """
+    table = None
+    shown = 0
+    last_id = None
+
+    for number, page in enumerate(pages, start=1):
+        if table is None or stream:
+            table = new_table(f"{title} (page {number})" if stream else title, columns)
+        for row in page:
+            table.add_row(*format_row(row))
+        shown += len(page)
+        last_id = page[-1][0]
+        if stream:
+            console.print(table)
+
+    if table is None:
+        console.print(new_table(title, columns))
+    elif not stream:
+        console.print(table)
+
+    if limit is not None and shown == limit:
+        console.print(f"[dim]More rows may follow: use --after-id {last_id}[/dim]")
 
 @cli.command()
 @click.option('--name', prompt='User name')
@@ -25,6 +77,7 @@ def cli():
 @click.option('--role', prompt='Role (applicant/employer)')
 def create_user(name, email, mobile, role):
     """➕ Create a new user"""
+    from lib.models import User
     try:
         user = User(name=name, email=email, mobile=mobile, role=role)
         session.add(user)
@@ -41,6 +94,7 @@ def create_user(name, email, mobile, role):
 @click.option('--user-id', prompt="User ID to update")
 def update_user(user_id):
     """➕ Update user account"""
+    from lib.models import User
     user = session.query(User).filter_by(id=user_id).first()
 
     if not user:
@@ -72,7 +126,11 @@ def update_user(user_id):
 @click.option('--user-id', prompt="User ID to Fetch and display details")
 def fetch_user(user_id):
     """👤 Fetch and display user details"""
-    user = session.query(User).filter_by(id=user_id).first()
+    from rich.table import Table
+    from lib.models import User
+    from lib.cache import records
+    from lib.queries import user_details
+    user = records.get(User, user_id, lambda: user_details(session, user_id))
 
     if not user:
         console.print(f"[red]User with ID {user_id} not found.[/red]")
@@ -136,6 +194,7 @@ def fetch_user(user_id):
 @click.option('--user-id', prompt='User ID to delete', type=int)
 def delete_user(user_id):
     """❌ Delete a user"""
+    from lib.models import User
     user = session.query(User).filter_by(id=user_id).first()
 
     if not user:
@@ -156,21 +215,21 @@ def delete_user(user_id):
         console.print(f"[red]Error deleting user: {e}[/red]")
 
 @cli.command()
-def list_users():
+@list_options
+def list_users(limit, after_id, stream, batch_size):
     """📋 List all users"""
-    users = session.query(User).all()
-    table = Table(title="Users")
-    table.add_column("ID", justify="right")
-    table.add_column("Name")
-    table.add_column("Email")
-    table.add_column("Role")
-    table.add_column("Mobile")
-
-    for u in users:
-        table.add_row(str(u.id), u.name, u.email, u.role, str(u.mobile))
+    from lib.models import User
+    from lib.queries import user_rows, keyset_pages
+    pages = keyset_pages(user_rows(session), User.id, after_id=after_id, limit=limit, batch_size=batch_size)
+    print_listing(
+        "Users",
+        ["ID", "Name", "Email", "Role", "Mobile"],
+        pages,
+        lambda u: (str(u[0]), u[1], u[2], u[3], str(u[4])),
+        stream=stream,
+        limit=limit,
+    )
 
-    console.print(table)
-    
 
 
 @cli.command()
@@ -178,6 +237,7 @@ def list_users():
 @click.option('--industry', prompt='Industry')
 @click.option('--website', prompt='Website')
 def create_company(name, industry, website):
+    from lib.models import Company
     try:
         """🏢 Create a company"""
         company = Company(name=name, industry=industry, website=website)
@@ -192,25 +252,30 @@ def create_company(name, industry, website):
         console.print(f"[bold red]Unexpected error:[/] {e}")
 
 @cli.command()
-def list_companies():
+@list_options
+def list_companies(limit, after_id, stream, batch_size):
     """🏭 List all companies"""
-    companies = session.query(Company).all()
-    table = Table(title="Companies")
-    table.add_column("ID", justify="right")
-    table.add_column("Name")
-    table.add_column("Industry")
-    table.add_column("Website")
-
-    for c in companies:
-        table.add_row(str(c.id), c.name, c.industry, c.website)
-
-    console.print(table)
+    from lib.models import Company
+    from lib.queries import company_rows, keyset_pages
+    pages = keyset_pages(company_rows(session), Company.id, after_id=after_id, limit=limit, batch_size=batch_size)
+    print_listing(
+        "Companies",
+        ["ID", "Name", "Industry", "Website"],
+        pages,
+        lambda c: (str(c[0]), c[1], c[2], c[3]),
+        stream=stream,
+        limit=limit,
+    )
 
 @cli.command()
 @click.option('--company-id', prompt="Company ID to fetch details")
 def fetch_company(company_id):
     """🏭 Fetch and display company details"""
-    company = session.query(Company).filter_by(id=company_id).first()
+    from rich.table import Table
+    from lib.models import Company
+    from lib.cache import records
+    from lib.queries import company_details
+    company = records.get(Company, company_id, lambda: company_details(session, company_id))
 
     if not company:
         console.print(f"[red]❌ Company with ID {company_id} not found.[/red]")
@@ -231,6 +296,7 @@ def fetch_company(company_id):
 @click.option('--company-id', prompt="Company ID to update")
 def update_company(company_id):
     """✏️ Update company details"""
+    from lib.models import Company
     company = session.query(Company).filter_by(id=company_id).first()
 
     if not company:
@@ -263,6 +329,7 @@ def update_company(company_id):
 @click.option('--company-id', prompt="Company ID to update")
 def delete_company(company_id):
     """❌ Delete a company"""
+    from lib.models import Company
     company = session.query(Company).filter_by(id=company_id).first()
 
     if not company:
@@ -293,6 +360,7 @@ def delete_company(company_id):
 @click.option('--company_id', prompt='Company ID', type=int)
 def create_job(title, description, location, salary, type, company_id):
     """💼 Create a job listing"""
+    from lib.models import Job
     try:
         job = Job(name=title, description=description, location=location, salary=salary, type=type, company_id=company_id)
         session.add(job)
@@ -309,6 +377,7 @@ def create_job(title, description, location, salary, type, company_id):
 @click.option('--job-id', prompt='Job ID to update', type=int)
 def update_job(job_id):
     """✏️ Update a job listing"""
+    from lib.models import Job
     job = session.query(Job).filter_by(id=job_id).first()
 
     if not job:
@@ -345,6 +414,7 @@ def update_job(job_id):
 @click.option('--job-id', prompt='Job ID to delete', type=int)
 def delete_job(job_id):
     """❌ Delete a job"""
+    from lib.models import Job
     job = session.query(Job).filter_by(id=job_id).first()
 
     if not job:
@@ -365,39 +435,54 @@ def delete_job(job_id):
         console.print(f"[red]Error deleting user: {e}[/red]")
 
 @cli.command()
-def list_jobs():
-    """🧾 List all jobs"""
-    jobs = session.query(Job).all()
-    table = Table(title="Jobs")
-    table.add_column("ID", justify="right")
-    table.add_column("Title")
-    table.add_column("Description")
-    table.add_column("Location")
-    table.add_column("Salary")
-    table.add_column("Contract Type")
-    table.add_column("Company ID")
-    table.add_column("Company Name")
-
-    for job in jobs:
-        company = job.company
-        table.add_row(
-            str(job.id), 
-            job.name, 
-            job.description if job.description else "N/A", 
-            job.location if job.location else "N/A", 
-            f"${job.salary:,.2f}", 
-            job.type if job.type else "N/A", 
-            str(job.company_id),
-            company.name if company else "N/A",
-        )
-
-    console.print(table)
+@list_options
+@click.option('--min-salary', type=float, help='Only jobs paying at least this much.')
+@click.option('--max-salary', type=float, help='Only jobs paying at most this much.')
+@click.option('--type', 'types', multiple=True, help='Contract type (repeatable; any of them matches).')
+@click.option('--location', 'locations', multiple=True, help='Location (repeatable; any of them matches).')
+@click.option('--company', help='Company ID or name.')
+def list_jobs(min_salary, max_salary, types, locations, company, limit, after_id, stream, batch_size):
+    """🧾 List jobs, optionally filtered by salary range, type, location or company"""
+    from lib.models import Job
+    from lib.queries import job_rows, filter_jobs, keyset_pages
+    try:
+        query = filter_jobs(job_rows(session), min_salary, max_salary, types, locations, company)
+    except ValueError as ve:
+        console.print(f"[bold red]Error:[/] {ve}")
+        return
+    filtered = any((min_salary is not None, max_salary is not None, types, locations, company))
+    pages = keyset_pages(query, Job.id, after_id=after_id, limit=limit, batch_size=batch_size)
+    print_listing(
+        "Jobs (filtered)" if filtered else "Jobs",
+        ["ID", "Title", "Description", "Location", "Salary", "Contract Type", "Company ID", "Company Name"],
+        pages,
+        format_job_row,
+        stream=stream,
+        limit=limit,
+    )
+
+def format_job_row(row):
+    job_id, name, description, location, salary, job_type, company_id, company_name = row
+    return (
+        str(job_id),
+        name,
+        description if description else "N/A",
+        location if location else "N/A",
+        f"${salary:,.2f}" if salary is not None else "N/A",
+        job_type if job_type else "N/A",
+        str(company_id),
+        company_name if company_name else "N/A",
+    )
 
 @cli.command()
 @click.option('--job-id', prompt='Job ID to fetch and Display details')
 def fetch_job(job_id):
     """🏭 Fetch and display company details"""
-    job = session.query(Job).filter_by(id=job_id).first()
+    from rich.table import Table
+    from lib.models import Job
+    from lib.cache import records
+    from lib.queries import job_details
+    job = records.get(Job, job_id, lambda: job_details(session, job_id))
 
     if not job:
         console.print(f"[red]Job with ID {job_id} not found.[/red]")
@@ -413,25 +498,151 @@ def fetch_job(job_id):
     table.add_row("Location", job.location if job.location else "N/A")
     table.add_row("Salary", f"${job.salary:,.2f}")
     table.add_row("Contract Type", job.type if job.type else "N/A")
-    table.add_row("Company ID", str(job.company.id))
-    table.add_row("Company Name", job.company.name if job.company else "N/A")
+    table.add_row("Company ID", str(job.company_id))
+    table.add_row("Company Name", job.company_name if job.company_name else "N/A")
     
     console.print(table)
 
 
 
+@cli.command()
+@click.argument('query')
+@click.option('--limit', default=20, show_default=True, type=click.IntRange(min=1))
+def search_jobs(query, limit):
+    """🔎 Full-text search over job title, description, location and company"""
+    from lib.search import search_jobs as run_search, ensure_job_search
+    if session.get_bind().dialect.name != 'sqlite':
+        console.print("[bold red]Error:[/] Full-text job search needs the SQLite backend.")
+        return
+    if ensure_job_search(session.connection()):
+        session.commit()
+
+    try:
+        results = run_search(session, query, limit=limit)
+    except ValueError as ve:
+        console.print(f"[bold red]Error:[/] {ve}")
+        return
+
+    if not results:
+        console.print(f"[yellow]No jobs match '{query}'.[/yellow]")
+        return
+
+    table = new_table(f"Jobs matching '{query}'", ["ID", "Title", "Location", "Salary", "Contract Type", "Company Name"])
+    for job_id, name, location, salary, job_type, company_name, score in results:
+        table.add_row(
+            str(job_id),
+            name,
+            location if location else "N/A",
+            f"${salary:,.2f}" if salary is not None else "N/A",
+            job_type if job_type else "N/A",
+            company_name if company_name else "N/A",
+        )
+    console.print(table)
+
+@cli.command()
+@click.option('--user-id', prompt='User ID', type=int)
+@click.option('--top-k', default=10, show_default=True, type=click.IntRange(min=1), help='Number of jobs to show.')
+@click.option('--min-salary', type=float, help='Preferred minimum salary.')
+@click.option('--max-salary', type=float, help='Preferred maximum salary.')
+@click.option('--type', 'types', multiple=True, help='Preferred contract type (repeatable).')
+@click.option('--location', 'locations', multiple=True, help='Preferred location (repeatable).')
+@click.option('--industry', 'industries', multiple=True, help='Preferred industry (repeatable).')
+def feed(user_id, top_k, min_salary, max_salary, types, locations, industries):
+    """💘 Ranked feed of jobs the user hasn't applied to yet"""
+    from lib.models import User, Job
+    from lib.matching import Preferences, job_feed
+    from lib.queries import job_rows
+
+    user = session.get(User, user_id)
+    if not user:
+        console.print(f"[red]User with ID {user_id} not found.[/red]")
+        return
+
+    try:
+        preferences = Preferences(min_salary, max_salary, types, locations, industries)
+        ranked = job_feed(session, user_id, preferences, top_k=top_k)
+    except ValueError as ve:
+        console.print(f"[bold red]Error:[/] {ve}")
+        return
+
+    if not ranked:
+        console.print(f"[yellow]No new jobs to show for '{user.name}'.[/yellow]")
+        return
+
+    rows = {row[0]: row for row in job_rows(session).filter(Job.id.in_([job_id for job_id, _ in ranked]))}
+    table = new_table(f"Job feed for {user.name}", ["Rank", "Score", "Job ID", "Title", "Location", "Salary", "Contract Type", "Company Name"])
+    for rank, (job_id, score) in enumerate(ranked, start=1):
+        _, name, _, location, salary, job_type, _, company_name = rows[job_id]
+        table.add_row(
+            str(rank),
+            f"{score:.2f}",
+            str(job_id),
+            name,
+            location if location else "N/A",
+            f"${salary:,.2f}" if salary is not None else "N/A",
+            job_type if job_type else "N/A",
+            company_name if company_name else "N/A",
+        )
+    console.print(table)
+
+@cli.command()
+@click.argument('user_ids', type=click.File('r'), default='-')
+@click.argument('output', default='-')
+@click.option('--top-k', default=10, show_default=True, type=click.IntRange(min=1), help='Jobs per user.')
+@click.option('--concurrency', default=16, show_default=True, type=click.IntRange(min=1), help='Feeds computed at once, each on its own connection.')
+def feed_batch(user_ids, output, top_k, concurrency):
+    """⚡ Ranked feeds for many users (IDs one per line) at once, as JSON lines"""
+    import asyncio
+    import json
+    import time
+    from lib.async_queries import async_engine, feeds
+    from lib.transitions import read_ids
+
+    async def run(ids):
+        engine = async_engine()
+        try:
+            return await feeds(engine, ids, top_k=top_k, concurrency=concurrency)
+        finally:
+            await engine.dispose()
+
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(run(list(read_ids(user_ids, "user"))))
+    except ValueError as ve:
+        console.print(f"[bold red]Error:[/] {ve}")
+        return
+    lines = (json.dumps({'user_id': user_id, 'jobs': [{'job_id': job_id, 'score': round(score, 4)} for job_id, score in ranked]})
+             for user_id, ranked in results)
+    if output == '-':
+        for line in lines:
+            click.echo(line)
+        return
+    with open(output, 'w', encoding='utf-8') as out:
+        for line in lines:
+            out.write(line + '\n')
+    seconds = time.perf_counter() - start
+    console.print(f"✅ [green]{len(results)} feeds written to {output}[/] in {seconds:.2f}s — {len(results) / seconds:,.0f} feeds/sec")
+
 @cli.command()
 @click.option('--user_id', prompt='User ID')
 @click.option('--job_id', prompt='Job ID')
 @click.option('--status', prompt='Application status')
 def create_application(user_id, job_id, status):
-    """📨 Create a job application"""
+    """📨 Create a job application (applying again to the same job updates its status)"""
+    from lib import validators
+    from lib.models import Application
+    from lib.swipes import application_upsert
     try:
-        print(user_id, job_id, status)
-        app = Application(user_id=int(user_id), job_id=int(job_id), status=status)
-        session.add(app)
+        values = {
+            'user_id': validators.numeric_id(user_id, "user_id"),
+            'job_id': validators.numeric_id(job_id, "job_id"),
+            'status': validators.status(status),
+        }
+        # one statement either way; the unique (user_id, job_id) index decides
+        statement = application_upsert(session.connection()).values(**values).returning(Application.__table__.c.id)
+        application_id = session.execute(statement).scalar_one()
         session.commit()
-        console.print(f"✅ [green]Application submitted by User {user_id} for Job {job_id}[/]")
+        console.print(f"✅ [green]Application #{application_id} submitted by User {user_id} for Job {job_id}[/]")
     except ValueError as ve:
         session.rollback()
         console.print(f"[bold red]Error:[/] {ve}")
@@ -439,68 +650,269 @@ def create_application(user_id, job_id, status):
         session.rollback()
         console.print(f"[bold red]Unexpected error:[/] {e}")
 
+@cli.command()
+@click.argument('source', type=click.File('r'), default='-')
+@click.option('--format', 'fmt', type=click.Choice(['jsonl', 'csv']), help='Input format (default: from the file extension, jsonl for stdin).')
+@click.option('--chunk-size', default=10000, show_default=True, type=click.IntRange(min=1), help='Swipes validated and inserted per transaction.')
+def swipe_batch(source, fmt, chunk_size):
+    """👉 Record many (user_id, job_id, decision) swipes from a JSONL/CSV file or stdin"""
+    from lib.db import get_engine
+    from lib.swipes import read_swipes, ingest_swipes
+
+    if fmt is None:
+        fmt = 'csv' if source.name.lower().endswith('.csv') else 'jsonl'
+
+    try:
+        report = ingest_swipes(get_engine(), read_swipes(source, fmt), chunk_size=chunk_size)
+    except ValueError as ve:
+        console.print(f"[bold red]Error:[/] {ve}")
+        return
+
+    console.print(
+        f"✅ [green]{report.inserted} applications recorded[/] from {report.received} swipes "
+        f"({report.passed} passed, {report.duplicates} duplicates, {report.rejected} rejected) "
+        f"in {report.seconds:.2f}s — {report.rate:,.0f} swipes/sec"
+    )
+    for number, reason in report.errors:
+        console.print(f"[red]  record {number}: {reason}[/red]")
+    if report.rejected > len(report.errors):
+        console.print(f"[red]  ... and {report.rejected - len(report.errors)} more rejected records[/red]")
+
+def run_import(model, source, fmt, chunk_size):
+    from lib.db import get_engine
+    from lib.imports import import_file
+
+    try:
+        report = import_file(get_engine(), model, source, fmt, chunk_size=chunk_size)
+    except (ValueError, OSError) as error:
+        console.print(f"[bold red]Error:[/] {error}")
+        return
+
+    console.print(
+        f"✅ [green]{report.inserted} {model.__tablename__} imported[/] from {report.received} records "
+        f"({report.rejected} rejected) in {report.seconds:.2f}s — {report.rate:,.0f} records/sec"
+    )
+    for number, reason in report.errors:
+        console.print(f"[red]  record {number}: {reason}[/red]")
+    if report.rejected > len(report.errors):
+        console.print(f"[red]  ... and {report.rejected - len(report.errors)} more rejected records[/red]")
+
+def import_options(command):
+    """Source and chunking options shared by the import-* commands."""
+    command = click.option('--chunk-size', default=10000, show_default=True, type=click.IntRange(min=1), help='Records validated and inserted per transaction.')(command)
+    command = click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl', 'parquet']), help='Input format (default: from the file extension, jsonl for stdin).')(command)
+    return click.argument('source', type=click.Path(exists=True, dir_okay=False, allow_dash=True), default='-')(command)
+
+@cli.command()
+@import_options
+def import_companies(source, fmt, chunk_size):
+    """🏢 Bulk-import companies (name, industry, website) from a CSV/JSONL/Parquet file"""
+    from lib.models import Company
+    run_import(Company, source, fmt, chunk_size)
+
+@cli.command()
+@import_options
+def import_jobs(source, fmt, chunk_size):
+    """💼 Bulk-import jobs (name, description, location, salary, type, company or company_id) from a CSV/JSONL/Parquet file"""
+    from lib.models import Job
+    run_import(Job, source, fmt, chunk_size)
+
+@cli.command()
+@click.argument('table', type=click.Choice(['users', 'companies', 'jobs', 'applications', 'application-view']))
+@click.argument('output', default='-')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl', 'parquet']), help='Output format (default: from the file extension, csv for stdout).')
+@click.option('--compression', type=click.Choice(['gzip', 'zstd', 'snappy']), help='gzip for any format; zstd and snappy for Parquet.')
+@click.option('--batch-size', default=50000, show_default=True, type=click.IntRange(min=1), help='Rows fetched and written per batch.')
+def export(table, output, fmt, compression, batch_size):
+    """📤 Stream a table (or application-view) to a CSV/JSONL/Parquet file or stdout"""
+    from lib.db import get_engine
+    from lib.exports import export_rows
+
+    if compression is None and output.lower().endswith('.gz'):
+        compression = 'gzip'
+    try:
+        with get_engine().connect() as connection:
+            rows, seconds = export_rows(connection, table, output, fmt, compression, batch_size=batch_size)
+    except (ValueError, OSError) as error:
+        console.print(f"[bold red]Error:[/] {error}")
+        return
+
+    if output != '-':
+        rate = rows / seconds if seconds else 0.0
+        console.print(f"✅ [green]{rows} rows exported to {output}[/] in {seconds:.2f}s — {rate:,.0f} rows/sec")
+
+@cli.command()
+@click.argument('directory')
+@click.option('--batch-size', default=50000, show_default=True, type=click.IntRange(min=1), help='Rows fetched per batch.')
+@click.option('--refresh', is_flag=True, help='Apply only the changes since the snapshot already in DIRECTORY.')
+def snapshot_jobs(directory, batch_size, refresh):
+    """🗂️ Write a memory-mappable job catalog snapshot to DIRECTORY"""
+    import os
+    import time
+    from lib.catalog import JobCatalog
+    from lib.db import get_engine
+
+    start = time.perf_counter()
+    try:
+        with get_engine().connect() as connection:
+            if refresh and os.path.isdir(directory):
+                catalog = JobCatalog.open(directory).refresh(connection)
+            else:
+                catalog = JobCatalog.build(connection, batch_size=batch_size)
+        catalog.save(directory)
+    except (ValueError, OSError) as error:
+        console.print(f"[bold red]Error:[/] {error}")
+        return
+    seconds = time.perf_counter() - start
+    console.print(
+        f"✅ [green]{len(catalog)} jobs written to {directory}[/] in {seconds:.2f}s — "
+        f"{catalog.nbytes / 2**20:,.1f} MiB, {len(catalog.types)} types, "
+        f"{len(catalog.locations)} locations, {len(catalog.companies)} companies"
+    )
+
+@cli.command()
+@click.argument('table', type=click.Choice(['users', 'companies', 'jobs']))
+@click.option('--since', help='Watermark printed by the previous run; omit to list every row.')
+def changes(table, since):
+    """🔄 Show rows changed and deleted since a watermark"""
+    from datetime import datetime
+    from lib.changes import changes_since
+    from lib.db import get_engine
+
+    try:
+        watermark = datetime.fromisoformat(since) if since else None
+    except ValueError:
+        console.print(f"[bold red]Error:[/] Watermark must look like 'YYYY-MM-DD HH:MM:SS', not '{since}'.")
+        return
+    try:
+        with get_engine().connect() as connection:
+            feed = changes_since(connection, table, watermark)
+    except ValueError as ve:
+        console.print(f"[bold red]Error:[/] {ve}")
+        return
+
+    listing = new_table(f"Changes to {table}" + (f" since {since}" if since else ""), ["ID", "Change", "Updated At"])
+    for record_id in feed.deleted:
+        listing.add_row(str(record_id), "[red]deleted[/red]", "")
+    for row in feed.changed:
+        updated_at = row.updated_at.strftime("%Y-%m-%d %H:%M:%S") if row.updated_at else "N/A"
+        listing.add_row(str(row.id), "changed", updated_at)
+    console.print(listing)
+    console.print(f"{len(feed.changed)} changed, {len(feed.deleted)} deleted. Next time: --since '{feed.watermark.isoformat(sep=' ')}'")
+
 @cli.command()
 @click.option('--application_id', prompt='Application ID')
 def fetch_application(application_id):
     """🔍 Fetch a specific application"""
-    app = session.query(Application).filter_by(id=application_id).first()
+    from rich.table import Table
+    from lib.models import Application
+    from lib.cache import records
+    from lib.queries import application_details
+    app = records.get(Application, application_id, lambda: application_details(session, application_id))
 
     if not app:
         console.print(f"[red]Application with ID {application_id} not found.[/red]")
         return
 
-    job = app.job
-    user = app.user
-    
-    table = Table(title=f"Application Details (ID: {user.id})")
+    table = Table(title=f"Application Details (ID: {app.user_id})")
     table.add_column("Field")
     table.add_column("Value")
 
-    table.add_row("User Id", str(user.id))
-    table.add_row("User Name", user.name)
-    table.add_row("Job Id", str(job.id))
-    table.add_row("Job Name", job.name)
+    table.add_row("User Id", str(app.user_id))
+    table.add_row("User Name", app.user_name)
+    table.add_row("Job Id", str(app.job_id))
+    table.add_row("Job Name", app.job_name)
     table.add_row("Status", app.status)
     table.add_row("Date", app.date.strftime('%Y-%m-%d'))
     
     console.print(table)
     
 @cli.command()
-def list_applications():
+@list_options
+def list_applications(limit, after_id, stream, batch_size):
     """📄 List all applications"""
-    apps = session.query(Application).all()
-    table = Table(title="Applications")
-    table.add_column("ID", justify="right")
-    table.add_column("User ID")
-    table.add_column("User Name")
-    table.add_column("Job ID")
-    table.add_column("Job Name")
+    from lib.models import Application
+    from lib.queries import application_rows, keyset_pages
+    pages = keyset_pages(application_rows(session), Application.id, after_id=after_id, limit=limit, batch_size=batch_size)
+    print_listing(
+        "Applications",
+        ["ID", "User ID", "User Name", "Job ID", "Job Name", "Status", "Date"],
+        pages,
+        format_application_row,
+        stream=stream,
+        limit=limit,
+    )
+
+def format_application_row(row):
+    app_id, user_id, user_name, job_id, job_name, status, date = row
+    return (
+        str(app_id),
+        str(user_id),
+        user_name if user_name else "N/A",
+        str(job_id),
+        job_name if job_name else "N/A",
+        status,
+        date.strftime("%Y-%m-%d") if date else "N/A",
+    )
+
+@cli.command()
+@click.option('--job-id', type=int, help='Counts for one job.')
+@click.option('--user-id', type=int, help='Counts for one user.')
+def application_counts(job_id, user_id):
+    """📊 Show a job's or a user's applications by status (read from the maintained counters)"""
+    from lib.models import Job, User
+    from lib.counters import application_counts as read_counts
+    if (job_id is None) == (user_id is None):
+        console.print("[bold red]Error:[/] Pass exactly one of --job-id or --user-id.")
+        return
+
+    model, record_id = (Job, job_id) if job_id is not None else (User, user_id)
+    counts = read_counts(session, model, record_id)
+    from rich.table import Table
+    table = Table(title=f"Applications for {model.__name__} {record_id}")
     table.add_column("Status")
-    table.add_column("Date")
-    
+    table.add_column("Count", justify="right")
+    for status, count in counts.items():
+        table.add_row(status, str(count))
+    console.print(table)
 
-    for a in apps:
-        print(a.id)
-        print(a.job)
-        print(a.user)
-        user = a.user
-        job = a.job
+@cli.command()
+@click.option('--company-id', prompt='Company ID', type=int)
+@click.option('--limit', default=20, show_default=True, type=click.IntRange(min=1), help='Jobs shown, busiest first (totals cover all jobs).')
+def company_dashboard(company_id, limit):
+    """📊 Show a company's hiring funnel per job: counts, conversion rates, days open"""
+    from lib.models import Company
+    from lib.dashboard import company_funnel, funnel_totals
+    company = session.query(Company._name.label('name')).filter(Company.id == company_id).first()
+    if not company:
+        console.print(f"[red]❌ Company with ID {company_id} not found.[/red]")
+        return
+
+    funnels = company_funnel(session, company_id)
+    totals = funnel_totals(funnels)
+    busiest = sorted(funnels, key=lambda funnel: (-funnel.total, funnel.job_id))[:limit]
+
+    table = new_table(
+        f"{company.name} — {len(funnels)} jobs, {totals.total} applications",
+        ["Job ID", "Title", "Applications", "Interviewed", "Offered", "Hired", "Rejected", "Days open"],
+    )
+    for funnel in busiest + [totals]:
         table.add_row(
-            str(a.id),
-            str(a.user_id),
-            user.name,
-            str(a.job_id),
-            job.name,
-            a.status,
-            a.date.strftime("%Y-%m-%d")
+            str(funnel.job_id) if funnel.job_id is not None else "",
+            funnel.name,
+            str(funnel.total),
+            *(f"{count} ({funnel.rate(count):.0%})" for count in (
+                funnel.interviewed, funnel.offers, funnel.counts['accepted'], funnel.counts['rejected'])),
+            f"{funnel.days_open:.1f}" if funnel.days_open is not None else "N/A",
+            end_section=bool(busiest) and funnel is busiest[-1],
         )
-
     console.print(table)
 
 @cli.command()
 @click.option('--application_id', prompt='Application ID', type=int)
 def update_application(application_id):
     """✏️ Update an application"""
+    from lib.models import Application
     app = session.query(Application).filter_by(id=application_id).first()
 
     if not app:
@@ -518,11 +930,46 @@ def update_application(application_id):
         session.rollback()
         console.print(f"[red]Error updating application: {e}[/red]")
 
+@cli.command()
+@click.option('--to', 'to_status', required=True, help='New status.')
+@click.option('--from', 'from_status', help='Only change applications in this status (default: any other status).')
+@click.option('--job-id', type=int, help="Change this job's applications.")
+@click.option('--ids', help='Comma-separated application IDs to change.')
+@click.option('--ids-file', type=click.File('r'), help="File (or '-' for stdin) with one application ID per line.")
+@click.option('--chunk-size', default=5000, show_default=True, type=click.IntRange(min=1), help='Applications changed per UPDATE statement.')
+def bulk_update_applications(to_status, from_status, job_id, ids, ids_file, chunk_size):
+    """🔁 Move many applications to a new status at once (by job or by ID list)"""
+    import time
+    from lib.db import get_engine
+    from lib.transitions import read_ids, transition_job, transition_ids
+
+    if sum(source is not None for source in (job_id, ids, ids_file)) != 1:
+        console.print("[bold red]Error:[/] Pass exactly one of --job-id, --ids or --ids-file.")
+        return
+
+    started = time.perf_counter()
+    try:
+        if job_id is not None:
+            changed = transition_job(get_engine(), job_id, from_status, to_status, chunk_size=chunk_size)
+        else:
+            lines = ids.replace(',', '\n').splitlines() if ids is not None else ids_file
+            changed = transition_ids(get_engine(), read_ids(lines), from_status, to_status, chunk_size=chunk_size)
+    except ValueError as ve:
+        console.print(f"[bold red]Error:[/] {ve}")
+        return
+    # objects the shell's session already holds must not show the old status
+    session.expire_all()
+
+    console.print(
+        f"✅ [green]{changed} applications moved to '{to_status.lower()}'[/] "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
 
 @cli.command()
 @click.option('--application_id', prompt='Application ID', type=int)
 def delete_application(application_id):
     """❌ Delete an application"""
+    from lib.models import Application
     app = session.query(Application).filter_by(id=application_id).first()
 
     if not app:
@@ -538,31 +985,110 @@ def delete_application(application_id):
     else:
         console.print("[yellow]Deletion cancelled.[/yellow]")
 
+@cli.command()
+@click.option('--company-id', 'company_ids', multiple=True, type=int, help='Company to delete with its jobs and their applications (repeatable).')
+@click.option('--job-id', 'job_ids', multiple=True, type=int, help='Job to delete with its applications (repeatable).')
+@click.option('--user-id', 'user_ids', multiple=True, type=int, help='User to delete with their applications (repeatable).')
+@click.option('--orphans', is_flag=True, help='Also delete jobs and applications whose company, job or user no longer exists.')
+@click.option('--yes', is_flag=True, help='Skip the confirmation prompt.')
+def purge(company_ids, job_ids, user_ids, orphans, yes):
+    """🧹 Delete companies, jobs or users in bulk; the database cascades to their children"""
+    from lib.db import get_engine
+    from lib.models import Company, Job, User
+    from lib.purge import purge as purge_rows, purge_orphans
+    from sqlalchemy.exc import SQLAlchemyError
+
+    targets = [(Company, company_ids), (Job, job_ids), (User, user_ids)]
+    if not any(ids for _, ids in targets) and not orphans:
+        console.print("[bold red]Error:[/] Pass --company-id, --job-id, --user-id or --orphans.")
+        return
+
+    requested = ', '.join(f"{len(ids)} {model.__tablename__}" for model, ids in targets if ids)
+    if not yes and not click.confirm(f"Delete {requested or 'orphaned rows'} and everything that depends on them?", default=False):
+        console.print("[yellow]Deletion cancelled.[/yellow]")
+        return
+
+    try:
+        for model, ids in targets:
+            if ids:
+                deleted = purge_rows(get_engine(), model, ids)
+                console.print(f"[green]{deleted} {model.__tablename__} deleted.[/green]")
+        if orphans:
+            for table, deleted in purge_orphans(get_engine()).items():
+                console.print(f"[green]{deleted} orphaned {table} deleted.[/green]")
+    except (ValueError, SQLAlchemyError) as error:
+        console.print(f"[bold red]Error:[/] {error}")
+    # the shell's session may still hold the deleted rows
+    session.expire_all()
+
+@cli.command()
+@click.option('--users', default=20, show_default=True, type=click.IntRange(min=0))
+@click.option('--companies', default=20, show_default=True, type=click.IntRange(min=0))
+@click.option('--jobs', default=20, show_default=True, type=click.IntRange(min=0))
+@click.option('--applications', default=20, show_default=True, type=click.IntRange(min=0))
+@click.option('--batch-size', default=10_000, show_default=True, type=click.IntRange(min=1), help='Rows per executemany batch.')
+@click.option('--append', is_flag=True, help='Keep existing rows instead of clearing the tables first.')
+def seed(users, companies, jobs, applications, batch_size, append):
+    """🌱 Fill the database with fake data in bulk"""
+    from lib.db import get_engine
+    from lib.seed import bulk_seed
+    try:
+        bulk_seed(
+            get_engine(),
+            users=users,
+            companies=companies,
+            jobs=jobs,
+            applications=applications,
+            batch_size=batch_size,
+            clear=not append,
+            report=console.print,
+        )
+        console.print("[green]🌱 Seeding complete![/green]")
+    except ValueError as ve:
+        console.print(f"[bold red]Error:[/] {ve}")
+
+@cli.command()
+def cache_stats():
+    """📈 Show hit/miss counters of the fetch-* lookup cache (useful inside the shell)"""
+    from lib.cache import records
+    stats = records.stats()
+    console.print(
+        f"{stats['size']}/{stats['maxsize']} entries (ttl {stats['ttl']:g}s) — "
+        f"{stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), "
+        f"{stats['evictions']} evicted, {stats['expirations']} expired"
+    )
+
+@cli.command()
+def shell():
+    """🐚 Interactive shell that keeps one database connection open across commands"""
+    from lib.shell import CliShell
+    CliShell(cli).cmdloop()
+
+# Registered at import time so the shell and tests see every command
+cli.add_command(create_user)
+cli.add_command(list_users)
+cli.add_command(update_user)
+cli.add_command(fetch_user)
+cli.add_command(delete_user)
+# cli.add_command(list_user_applications)
+
+cli.add_command(create_job)
+cli.add_command(list_jobs)
+cli.add_command(fetch_job)
+cli.add_command(update_job)
+cli.add_command(delete_job)
+
+cli.add_command(create_company)
+cli.add_command(list_companies)
+cli.add_command(fetch_company)
+cli.add_command(update_company)
+cli.add_command(delete_company)
+
+cli.add_command(create_application)
+cli.add_command(list_applications)
+cli.add_command(fetch_application)
+cli.add_command(update_application)
+cli.add_command(delete_application)
+
 if __name__ == '__main__':
-    cli.add_command(create_user)
-    cli.add_command(list_users)
-    cli.add_command(update_user)
-    cli.add_command(fetch_user)
-    cli.add_command(delete_user)
-    # cli.add_command(list_user_applications)
-    
-    cli.add_command(create_job)
-    cli.add_command(list_jobs)
-    cli.add_command(fetch_job)
-    cli.add_command(update_job)
-    cli.add_command(delete_job)
-    
-    cli.add_command(create_company)
-    cli.add_command(list_companies)
-    cli.add_command(fetch_company)
-    cli.add_command(update_company)
-    cli.add_command(delete_company)
-        
-    cli.add_command(create_application)
-    cli.add_command(list_applications)
-    cli.add_command(fetch_application)
-    cli.add_command(update_application)
-    cli.add_command(delete_application)
-    
     cli()
-    
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""Asyncio versions of the fetch, list, create and feed operations.
+
+A service front-end or a batch driver can keep many of these in flight on
+one event loop: while one request waits on the database, the loop runs the
+others. Each function takes an AsyncSession (from `session_factory`) and
+runs the same query code as the CLI (lib.queries, lib.matching) through
+`AsyncSession.run_sync`, so the SQL, the validation and the rows returned
+are identical; only the waiting is done with `await`.
+
+Use one session per concurrent task. Like a sync Session, an AsyncSession
+must not be used by two tasks at once.
+"""
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from lib import queries, validators
+from lib.db import DEFAULT_BATCH_SIZE, create_async_engine_for, current_profile, current_url
+from lib.matching import DEFAULT_TOP_K, JobFeatures, Preferences, application_history, job_features, rank_jobs
+from lib.models import User, Company, Job, Application
+from lib.swipes import application_upsert
+
+def async_engine():
+    """A new asyncio engine for the configured database URL and profile."""
+    return create_async_engine_for(current_url(), current_profile())
+
+def session_factory(engine):
+    """AsyncSession maker for `engine`; committed objects stay readable without a refresh."""
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+async def fetch_user(session, user_id):
+    """One user (see lib.queries.user_details), or None."""
+    return await session.run_sync(queries.user_details, user_id)
+
+async def fetch_company(session, company_id):
+    return await session.run_sync(queries.company_details, company_id)
+
+async def fetch_job(session, job_id):
+    return await session.run_sync(queries.job_details, job_id)
+
+async def fetch_application(session, application_id):
+    return await session.run_sync(queries.application_details, application_id)
+
+def first_page(query, id_column, after_id, limit):
+    return next(queries.keyset_pages(query, id_column, after_id=after_id, limit=limit, batch_size=limit), [])
+
+async def list_users(session, after_id=None, limit=DEFAULT_BATCH_SIZE):
+    """Up to `limit` users after `after_id`, in id order; pass the last id back for the next page."""
+    return await session.run_sync(lambda sync: first_page(queries.user_rows(sync), User.id, after_id, limit))
+
+async def list_companies(session, after_id=None, limit=DEFAULT_BATCH_SIZE):
+    return await session.run_sync(lambda sync: first_page(queries.company_rows(sync), Company.id, after_id, limit))
+
+async def list_jobs(session, after_id=None, limit=DEFAULT_BATCH_SIZE, **filters):
+    """A page of jobs; `filters` are those of lib.queries.filter_jobs."""
+    return await session.run_sync(
+        lambda sync: first_page(queries.filter_jobs(queries.job_rows(sync), **filters), Job.id, after_id, limit)
+    )
+
+async def list_applications(session, after_id=None, limit=DEFAULT_BATCH_SIZE):
+    return await session.run_sync(lambda sync: first_page(queries.application_rows(sync), Application.id, after_id, limit))
+
+async def create(session, model, **fields):
+    """Insert one `model` (User, Company or Job) and return its id.
+
+    `fields` are validated by the model's setters, as in the create-*
+    commands, so bad input raises ValueError before anything is sent.
+    """
+    record = model(**fields)
+    session.add(record)
+    try:
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    return record.id
+
+async def create_application(session, user_id, job_id, status):
+    """Apply `user_id` to `job_id`, or change the status of their existing application; returns its id."""
+    values = {
+        'user_id': validators.numeric_id(user_id, "user_id"),
+        'job_id': validators.numeric_id(job_id, "job_id"),
+        'status': validators.status(status),
+    }
+    statement = application_upsert(session.bind).values(**values).returning(Application.__table__.c.id)
+    try:
+        application_id = (await session.execute(statement)).scalar_one()
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    return application_id
+
+async def load_job_features(session):
+    """The feed's job columns (lib.matching.JobFeatures), loaded once and shared by every feed call."""
+    return await session.run_sync(JobFeatures.load)
+
+async def job_feed(session, user_id, preferences=None, top_k=DEFAULT_TOP_K, features=None):
+    """Top `top_k` unapplied jobs for `user_id`, as (job id, score) pairs.
+
+    Only the user's application history is read per call when `features`
+    is given; the ranking itself is CPU work and runs on the loop. It is
+    kept out of `run_sync`: NumPy's passes inside that greenlet crash the
+    interpreter now and then while aiosqlite's threads are running.
+    """
+    if features is None:
+        features = await session.run_sync(job_features.get)
+    job_ids, weights = await session.run_sync(application_history, user_id)
+    return rank_jobs(features, preferences or Preferences(), job_ids, weights, top_k=top_k)
+
+async def feeds(engine, user_ids, preferences=None, top_k=DEFAULT_TOP_K, concurrency=16):
+    """[(user id, ranked jobs)] for every user in `user_ids`, in order, `concurrency` users at a time.
+
+    The job columns are loaded once; each feed then costs one query for
+    the user's history, and up to `concurrency` of those are awaited
+    together, each on its own session and connection.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1.")
+    make_session = session_factory(engine)
+    async with make_session() as session:
+        features = await load_job_features(session)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(user_id):
+        async with slots, make_session() as session:
+            return user_id, await job_feed(session, user_id, preferences, top_k, features)
+
+    return await asyncio.gather(*(one(user_id) for user_id in user_ids))
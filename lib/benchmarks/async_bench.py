@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Compare request throughput of the sync session with concurrent asyncio sessions.
+
+Usage (from the project root):
+    python lib/benchmarks/async_bench.py [--requests 2000] [--concurrency 32] [--latency-ms 5] [--min-speedup 2]
+
+Seeds a scratch SQLite database, then serves the same mix of requests
+(fetch a job, fetch a user, a page of filtered jobs, a ranked feed) two
+ways: one after another through a sync Session, the way app.py does, and
+`--concurrency` at a time on one event loop through lib.async_queries.
+
+A local SQLite file answers in microseconds, so it shows the overhead of
+the async path. To show what overlapping buys against a server database,
+the run is repeated with `--latency-ms` of simulated network round trip
+added to every statement (a blocking sleep on the sync path, an awaited
+one on the async path). The speedup with latency is checked against
+`--min-speedup`. Ranking a feed is a few milliseconds of CPU on the loop,
+which caps how far the async path can pull ahead.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from lib import async_queries, db, queries
+from lib.matching import JobFeatures, job_feed
+from lib.models import Job
+from lib.seed import bulk_seed
+
+# 3-4x is measured at the default latency; the margin absorbs noisy machines
+MIN_SPEEDUP = 2
+
+def request_mix(count, users, jobs, rng):
+    kinds = ('job', 'user', 'page', 'feed')
+    return [(kinds[i % len(kinds)], rng.randint(1, jobs if i % 2 == 0 else users)) for i in range(count)]
+
+def add_latency(engine, seconds, asynchronous):
+    """Delay every statement by `seconds`, like a round trip to a database server."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def round_trip(conn, cursor, statement, parameters, context, executemany):
+        if asynchronous:
+            # runs inside the async engine's greenlet: yield to the loop while "waiting"
+            await_only(asyncio.sleep(seconds))
+        else:
+            time.sleep(seconds)
+
+def serve_sync(engine, requests, features):
+    with Session(engine) as session:
+        for kind, key in requests:
+            if kind == 'job':
+                queries.job_details(session, key)
+            elif kind == 'user':
+                queries.user_details(session, key)
+            elif kind == 'page':
+                next(queries.keyset_pages(queries.filter_jobs(queries.job_rows(session), types=['contract']),
+                                          Job.id, after_id=key, limit=20, batch_size=20), None)
+            else:
+                job_feed(session, key, top_k=10, features=features)
+            # like a request handler: don't carry a transaction into the next one
+            session.rollback()
+
+async def serve_async(engine, requests, features, concurrency):
+    make_session = async_queries.session_factory(engine)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def serve(kind, key):
+        async with slots, make_session() as session:
+            if kind == 'job':
+                await async_queries.fetch_job(session, key)
+            elif kind == 'user':
+                await async_queries.fetch_user(session, key)
+            elif kind == 'page':
+                await async_queries.list_jobs(session, after_id=key, limit=20, types=['contract'])
+            else:
+                await async_queries.job_feed(session, key, top_k=10, features=features)
+
+    await asyncio.gather(*(serve(kind, key) for kind, key in requests))
+
+def measure(url, requests, features, concurrency, latency):
+    sync_engine = db.create_engine_for(url, 'safe')
+    if latency:
+        add_latency(sync_engine, latency, asynchronous=False)
+    start = time.perf_counter()
+    serve_sync(sync_engine, requests, features)
+    sync_rate = len(requests) / (time.perf_counter() - start)
+    sync_engine.dispose()
+
+    async def run():
+        engine = db.create_async_engine_for(url, 'safe')
+        if latency:
+            add_latency(engine.sync_engine, latency, asynchronous=True)
+        try:
+            # open the pool's connections before timing, as a warm service would have
+            await serve_async(engine, requests[:concurrency], features, concurrency)
+            start = time.perf_counter()
+            await serve_async(engine, requests, features, concurrency)
+            return len(requests) / (time.perf_counter() - start)
+        finally:
+            await engine.dispose()
+
+    return sync_rate, asyncio.run(run())
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--users', type=int, default=20_000)
+    parser.add_argument('--jobs', type=int, default=50_000)
+    parser.add_argument('--applications', type=int, default=200_000)
+    parser.add_argument('--latency-ms', type=float, default=5.0)
+    parser.add_argument('--min-speedup', type=float, default=MIN_SPEEDUP)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{tempfile.mkdtemp()}/async_bench.db"
+    # WAL lets the concurrent readers proceed without waiting on each other
+    db.configure(url, profile='safe')
+    bulk_seed(db.get_engine(), users=args.users, companies=200, jobs=args.jobs,
+              applications=args.applications, report=lambda line: None)
+    with Session(db.get_engine()) as session:
+        features = JobFeatures.load(session)
+    requests = request_mix(args.requests, args.users, args.jobs, random.Random(7))
+
+    print(f"requests   : {args.requests:,} (job, user, job page, feed), concurrency {args.concurrency}")
+    speedup = None
+    for latency in (0.0, args.latency_ms / 1000):
+        sync_rate, async_rate = measure(url, requests, features, args.concurrency, latency)
+        speedup = async_rate / sync_rate
+        label = f"+{latency * 1000:g} ms/stmt" if latency else "local"
+        print(f"{label:<11}: sync {sync_rate:8,.0f} req/s   async {async_rate:8,.0f} req/s   ({speedup:.1f}x)")
+
+    print(f"min speedup: {args.min_speedup:.1f}x with {args.latency_ms:g} ms latency")
+    if speedup < args.min_speedup:
+        print("❌ Concurrent requests don't overlap enough.")
+        sys.exit(1)
+    print("✅ Concurrent requests overlap their database waits.")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Compare repeated fetch-* lookups with and without the identity cache.
+
+Usage (from the project root):
+    python lib/benchmarks/cache_bench.py [--jobs 100000] [--lookups 50000] [--hot 200]
+
+Seeds a scratch database, then looks up jobs (with their company name)
+drawn from a small hot set, the access pattern of a shell session or a
+service answering the same popular listings: once straight from the
+database and once through lib.cache.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy.orm import Session
+
+from lib.db import create_engine_for
+from lib.cache import IdentityCache
+from lib.models import Job
+from lib.queries import job_details
+from lib.seed import bulk_seed
+
+def latencies(lookup, ids):
+    timings = []
+    for job_id in ids:
+        start = time.perf_counter()
+        lookup(job_id)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+def describe(label, timings):
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"{label:<9}: {statistics.median(timings):8.1f} µs median, {p99:8.1f} µs p99")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100_000)
+    parser.add_argument('--lookups', type=int, default=50_000)
+    parser.add_argument('--hot', type=int, default=200, help='Number of distinct jobs looked up.')
+    args = parser.parse_args()
+
+    engine = create_engine_for(f"sqlite:///{tempfile.mkdtemp()}/cache_bench.db")
+    bulk_seed(engine, users=1, companies=1000, jobs=args.jobs, applications=0, report=lambda line: None)
+    session = Session(bind=engine)
+
+    hot = random.sample(range(1, args.jobs + 1), min(args.hot, args.jobs))
+    ids = random.choices(hot, k=args.lookups)
+    cache = IdentityCache(maxsize=max(args.hot, 1))
+
+    describe("database", latencies(lambda job_id: job_details(session, job_id), ids))
+    describe("cached", latencies(lambda job_id: cache.get(Job, job_id, lambda: job_details(session, job_id)), ids))
+    stats = cache.stats()
+    print(f"cache    : {stats['hits']:,} hits, {stats['misses']:,} misses ({stats['hit_rate']:.1%} hit rate)")
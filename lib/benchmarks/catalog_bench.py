@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Time opening a memory-mapped JobCatalog snapshot and compare its footprint with ORM jobs.
+
+Usage (from the project root):
+    python lib/benchmarks/catalog_bench.py [--jobs 5000000] [--orm-sample 20000] [--budget-ms 50]
+
+Synthesizes a catalog (4 contract types, 300 locations, 5,000 companies),
+saves it to a temporary directory and times `JobCatalog.open` plus a batch
+of random `row` lookups on the mapped files. For scale, it then measures
+with tracemalloc what the same number of jobs would cost as loaded `Job`
+objects, extrapolated from a sample.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from lib.catalog import JobCatalog, pack_strings
+
+OPEN_BUDGET_MS = 50
+
+def synthetic_catalog(count, rng):
+    types = ['full-time', 'part-time', 'contract', 'internship']
+    locations = [f"City {i}" for i in range(300)]
+    companies = [f"Company {i}" for i in range(5000)]
+    company_codes = rng.integers(0, len(companies), count).astype(np.int32)
+    titles = [f"Job title {i}".encode('utf-8') for i in range(count)]
+    offsets, blob = pack_strings(titles)
+    return JobCatalog({
+        'ids': np.arange(1, count + 1, dtype=np.int64),
+        'salary': rng.integers(30000, 250000, count).astype(np.float64),
+        'company_ids': company_codes.astype(np.int64) + 1,
+        'type_codes': rng.integers(0, len(types), count).astype(np.int16),
+        'location_codes': rng.integers(0, len(locations), count).astype(np.int32),
+        'company_codes': company_codes,
+        'name_offsets': offsets,
+        'name_bytes': blob,
+    }, types, locations, companies)
+
+def orm_bytes_per_job(sample):
+    """Bytes per loaded Job (with its session identity map entry), from a throwaway database."""
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+
+    from lib.base import Base
+    from lib.models import Job
+
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Job.__table__), [
+            {'name': f"Job title {i}", 'description': "Synthetic", 'location': f"City {i % 300}",
+             'salary': 30000 + i, 'type': 'full-time', 'company_id': None}
+            for i in range(sample)
+        ])
+    with Session(engine) as session:
+        tracemalloc.start()
+        jobs = session.query(Job).all()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(jobs) == sample
+    engine.dispose()
+    return size / sample
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=5_000_000)
+    parser.add_argument('--orm-sample', type=int, default=20000)
+    parser.add_argument('--lookups', type=int, default=1000)
+    parser.add_argument('--budget-ms', type=float, default=OPEN_BUDGET_MS)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'catalog')
+        start = time.perf_counter()
+        synthetic_catalog(args.jobs, rng).save(path)
+        print(f"jobs      : {args.jobs:,} (built and saved in {time.perf_counter() - start:.1f} s)")
+
+        start = time.perf_counter()
+        catalog = JobCatalog.open(path)
+        opened_ms = (time.perf_counter() - start) * 1000
+
+        wanted = rng.integers(1, args.jobs + 1, args.lookups)
+        start = time.perf_counter()
+        rows = [catalog.row(job_id) for job_id in wanted]
+        lookup_us = (time.perf_counter() - start) * 1e6 / args.lookups
+        assert all(row is not None for row in rows)
+
+        catalog_bytes = catalog.nbytes / args.jobs
+        orm_bytes = orm_bytes_per_job(args.orm_sample)
+        print(f"open      : {opened_ms:6.2f} ms")
+        print(f"row()     : {lookup_us:6.1f} µs per lookup ({args.lookups} random ids)")
+        print(f"catalog   : {catalog_bytes:6.1f} bytes/job ({catalog.nbytes / 2**20:,.0f} MiB on disk, mapped on demand)")
+        print(f"ORM Job   : {orm_bytes:6.1f} bytes/job (~{orm_bytes * args.jobs / 2**30:,.1f} GiB for all of them)")
+        del catalog, rows
+
+    print(f"budget    : {args.budget_ms:.1f} ms")
+    if opened_ms > args.budget_ms:
+        print("❌ Opening the catalog is over budget.")
+        sys.exit(1)
+    print("✅ Opening the catalog is within budget.")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Time `company-dashboard` for one company with many jobs and applications.
+
+Usage (from the project root):
+    python lib/benchmarks/dashboard_bench.py [--jobs 10000] [--applications 1000000] [--runs 10] [--budget-ms 200]
+
+Seeds a scratch database where every job belongs to one company, then
+runs the command in-process (warm, as in the shell) and compares the
+median with the budget. Also times the GROUP BY over `applications`
+that backends without the counter triggers fall back to.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from click.testing import CliRunner
+
+from lib import db
+from lib.dashboard import grouped_funnel
+from lib.seed import bulk_seed
+
+DASHBOARD_BUDGET_MS = 200
+
+def median_ms(function, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=10_000)
+    parser.add_argument('--applications', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=DASHBOARD_BUDGET_MS)
+    args = parser.parse_args()
+
+    db.configure(f"sqlite:///{tempfile.mkdtemp()}/dashboard_bench.db")
+    bulk_seed(db.get_engine(), users=50_000, companies=1, jobs=args.jobs,
+              applications=args.applications, report=lambda line: None)
+
+    from app import cli
+    runner = CliRunner()
+    command = ['company-dashboard', '--company-id', '1']
+    runner.invoke(cli, command)  # imports and mapper configuration
+    dashboard = median_ms(lambda: runner.invoke(cli, command), args.runs)
+    grouped = median_ms(lambda: grouped_funnel(db.get_session(), 1), max(args.runs // 5, 1))
+
+    print(f"jobs / apps   : {args.jobs:,} / {args.applications:,}")
+    print(f"dashboard     : {dashboard:.1f} ms median ({args.runs} runs)")
+    print(f"GROUP BY only : {grouped:.1f} ms median (fallback without counters)")
+    print(f"budget        : {args.budget_ms:.1f} ms")
+    if dashboard > args.budget_ms:
+        print("over budget")
+        sys.exit(1)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Time a ranked job feed over a synthetic catalog.
+
+Usage (from the project root):
+    python lib/benchmarks/feed_bench.py [--jobs 1000000] [--runs 20] [--budget-ms 100] [--db-jobs 200000]
+
+Scores a random catalog with realistic cardinalities (4 contract types,
+a few hundred locations, a handful of industries) against a user with a
+short application history, the same work `app.py feed` does after loading.
+
+Then times the whole job_feed path against a seeded scratch SQLite
+database: the first feed, which loads the job columns, and later feeds,
+which reuse them after checking the change feed and read only the user's
+history. The later feeds are held to the same budget. `--db-jobs 0`
+skips this part.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from lib import db
+from lib.matching import JobFeatures, Preferences, STATUS_WEIGHTS, job_features, job_feed, rank_jobs
+from lib.seed import bulk_seed
+
+FEED_BUDGET_MS = 100
+
+def synthetic_features(count, rng):
+    types = ['full-time', 'part-time', 'contract', 'internship']
+    locations = [f"City {i}" for i in range(300)]
+    industries = ['Technology', 'Finance', 'DevOps', 'CyberSecurity', 'Health', 'Retail']
+    return JobFeatures(
+        ids=np.arange(1, count + 1),
+        salary=rng.integers(30000, 250000, count).astype(np.float64),
+        type_codes=rng.integers(0, len(types), count), types=types,
+        location_codes=rng.integers(0, len(locations), count), locations=locations,
+        industry_codes=rng.integers(0, len(industries), count), industries=industries,
+    )
+
+def database_feeds(jobs, users, runs, preferences):
+    """(first feed ms, median later feed ms) of job_feed on a freshly seeded database."""
+    db.configure(f"sqlite:///{tempfile.mkdtemp()}/feed_bench.db")
+    engine = db.get_engine()
+    bulk_seed(engine, users=users, companies=200, jobs=jobs, applications=users * 20, report=lambda line: None)
+    # rows stamped in the current second count as changed; let it pass
+    time.sleep(1.1)
+    job_features.clear()
+    user_ids = [random.randint(1, users) for _ in range(runs + 1)]
+    timings = []
+    with Session(engine) as session:
+        for user_id in user_ids:
+            start = time.perf_counter()
+            job_feed(session, user_id, preferences, top_k=20)
+            timings.append((time.perf_counter() - start) * 1000)
+            session.rollback()
+    assert job_features.loads == 1, "later feeds reloaded the job columns"
+    return timings[0], statistics.median(timings[1:])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=1_000_000)
+    parser.add_argument('--history', type=int, default=50)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=FEED_BUDGET_MS)
+    parser.add_argument('--db-jobs', type=int, default=200_000)
+    parser.add_argument('--db-users', type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    features = synthetic_features(args.jobs, rng)
+    history = rng.integers(1, args.jobs + 1, args.history)
+    weights = rng.choice(list(STATUS_WEIGHTS.values()), args.history)
+    preferences = Preferences(min_salary=80000, types=['contract'], locations=['City 3', 'City 9'])
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        rank_jobs(features, preferences, history, weights, top_k=20)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    median = statistics.median(timings)
+    print(f"jobs      : {args.jobs:,}")
+    print(f"feed      : {median:.1f} ms median, {min(timings):.1f} ms best ({args.runs} runs)")
+    over_budget = median > args.budget_ms
+    if args.db_jobs:
+        first, later = database_feeds(args.db_jobs, args.db_users, args.runs, preferences)
+        print(f"database  : {args.db_jobs:,} jobs; job_feed {first:.1f} ms first (loads the jobs), "
+              f"{later:.1f} ms median after")
+        over_budget = over_budget or later > args.budget_ms
+    print(f"budget    : {args.budget_ms:.1f} ms")
+    if over_budget:
+        print("❌ Feed is over budget.")
+        sys.exit(1)
+    print("✅ Feed is within budget.")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Time filtered job lookups against the in-memory JobIndex.
+
+Usage (from the project root):
+    python lib/benchmarks/job_index_bench.py [--jobs 1000000] [--runs 20] [--budget-ms 20]
+
+Builds an index over a random catalog (4 contract types, 300 locations)
+and times a mix of salary-range, category and combined filters, the way a
+long-lived process would answer repeated `list-jobs` style queries.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from lib.job_index import JobIndex
+
+LOOKUP_BUDGET_MS = 20
+
+QUERIES = {
+    'salary range': dict(min_salary=90000, max_salary=110000),
+    'type': dict(types=['contract']),
+    'type + locations': dict(types=['contract', 'internship'], locations=['City 3', 'City 9', 'City 27']),
+    'all combined': dict(min_salary=80000, max_salary=150000, types=['full-time'], locations=['City 3', 'City 9'], company_ids=[7, 11]),
+}
+
+def synthetic_index(count, rng):
+    types = ['full-time', 'part-time', 'contract', 'internship']
+    locations = [f"City {i}" for i in range(300)]
+    return JobIndex(
+        ids=np.arange(1, count + 1),
+        salary=rng.integers(30000, 250000, count).astype(np.float64),
+        type_codes=rng.integers(0, len(types), count), types=types,
+        location_codes=rng.integers(0, len(locations), count), locations=locations,
+        company_ids=rng.integers(1, 100, count),
+    )
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=LOOKUP_BUDGET_MS)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    start = time.perf_counter()
+    index = synthetic_index(args.jobs, rng)
+    print(f"jobs      : {args.jobs:,} (index built in {(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    worst = 0.0
+    for name, filters in QUERIES.items():
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            ids = index.search(**filters, limit=500)
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        worst = max(worst, median)
+        print(f"{name:<17}: {median:6.2f} ms median, {min(timings):6.2f} ms best ({len(ids)} shown of {index.count(**filters):,})")
+
+    print(f"budget           : {args.budget_ms:.1f} ms")
+    if worst > args.budget_ms:
+        print("❌ Lookups are over budget.")
+        sys.exit(1)
+    print("✅ Lookups are within budget.")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Write and read throughput under each SQLite PRAGMA profile.
+
+Usage (from the project root):
+    python lib/benchmarks/pragma_bench.py [--commits 2000] [--bulk 100000] [--reads 50000]
+
+Each profile gets a fresh scratch database and runs the same workload:
+- commits: one-row transactions (what create-* / swipe commands do)
+- bulk:    one large executemany transaction (what seeding does)
+- reads:   random primary-key lookups plus an indexed range scan
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import insert, select
+
+from lib.base import Base
+from lib.db import PRAGMA_PROFILES, create_engine_for
+from lib.models import Company, Job
+
+def job_row(company_id):
+    return {
+        'name': 'Engineer',
+        'location': random.choice(['Nairobi', 'Mombasa', 'Remote']),
+        'description': 'Build things',
+        'salary': random.randint(50000, 200000),
+        'type': 'full-time',
+        'company_id': company_id,
+    }
+
+def run(profile, args, directory):
+    engine = create_engine_for(f"sqlite:///{os.path.join(directory, profile + '.db')}", profile)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        company_id = connection.execute(
+            insert(Company.__table__), {'name': 'Acme', 'industry': 'Tech', 'website': 'https://acme.example.com'}
+        ).inserted_primary_key[0]
+
+    start = time.perf_counter()
+    for _ in range(args.commits):
+        with engine.begin() as connection:
+            connection.execute(insert(Job.__table__), job_row(company_id))
+    commits = args.commits / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        connection.execute(insert(Job.__table__), [job_row(company_id) for _ in range(args.bulk)])
+    bulk = args.bulk / (time.perf_counter() - start)
+
+    total = args.commits + args.bulk
+    jobs = Job.__table__
+    with engine.connect() as connection:
+        start = time.perf_counter()
+        for _ in range(args.reads):
+            connection.execute(select(jobs).where(jobs.c.id == random.randint(1, total))).first()
+        reads = args.reads / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(20):
+            connection.execute(select(jobs.c.id).where(jobs.c.salary.between(90000, 110000))).all()
+        scans = 20 / (time.perf_counter() - start)
+
+    engine.dispose()
+    return commits, bulk, reads, scans
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--commits', type=int, default=2000)
+    parser.add_argument('--bulk', type=int, default=100_000)
+    parser.add_argument('--reads', type=int, default=50_000)
+    args = parser.parse_args()
+
+    random.seed(3)
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'profile':<12}{'commits/s':>12}{'bulk rows/s':>14}{'lookups/s':>12}{'scans/s':>10}")
+        for profile in PRAGMA_PROFILES:
+            commits, bulk, reads, scans = run(profile, args, directory)
+            print(f"{profile:<12}{commits:>12,.0f}{bulk:>14,.0f}{reads:>12,.0f}{scans:>10,.1f}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Compare FTS5 job search against a LIKE '%term%' scan.
+
+Usage (from the project root):
+    python lib/benchmarks/search_bench.py [--jobs 1000000] [--db /tmp/search_bench.db]
+
+Builds (or reuses) a scratch database with the requested number of jobs,
+then times the same searches through `jobs_fts` and through LIKE:
+
+- all matches: count every matching job (what any ranking has to visit)
+- top N: FTS5 ranked by bm25 vs. the first N LIKE hits, unranked
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from lib.models import Job
+from lib.search import search_jobs, match_expression
+from lib.seed import bulk_seed
+
+TERMS = ['engineer', 'manager', 'nurse', 'teacher', 'actuary', 'zoologist']
+
+LIKE_WHERE = """
+    FROM jobs LEFT JOIN companies ON companies.id = jobs.company_id
+    WHERE jobs.name LIKE :pattern OR jobs.description LIKE :pattern
+       OR jobs.location LIKE :pattern OR companies.name LIKE :pattern
+"""
+LIKE_COUNT_SQL = text(f"SELECT count(*) {LIKE_WHERE}")
+LIKE_FIRST_SQL = text(f"SELECT jobs.id, jobs.name {LIKE_WHERE} LIMIT :limit")
+FTS_COUNT_SQL = text("SELECT count(*) FROM jobs_fts WHERE jobs_fts MATCH :match")
+
+def timed(run, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=1_000_000)
+    parser.add_argument('--db', default='/tmp/search_bench.db')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    with Session(engine) as session:
+        existing = session.query(Job).count() if os.path.exists(args.db) else 0
+    if existing != args.jobs:
+        print(f"Seeding {args.jobs:,} jobs into {args.db} ...")
+        bulk_seed(engine, users=0, companies=max(1, args.jobs // 100), jobs=args.jobs, applications=0)
+
+    with Session(engine) as session:
+        print(f"{'term':<12}{'matches':>9}{'FTS all':>10}{'LIKE all':>10}{'FTS top':>10}{'LIKE first':>11}   (ms)")
+        for term in TERMS:
+            pattern = f"%{term}%"
+            fts_all, matches = timed(
+                lambda: session.execute(FTS_COUNT_SQL, {'match': match_expression(term)}).scalar(), args.repeat)
+            like_all, _ = timed(lambda: session.execute(LIKE_COUNT_SQL, {'pattern': pattern}).scalar(), args.repeat)
+            fts_top, _ = timed(lambda: search_jobs(session, term, limit=args.limit), args.repeat)
+            like_first, _ = timed(
+                lambda: session.execute(LIKE_FIRST_SQL, {'pattern': pattern, 'limit': args.limit}).all(), args.repeat)
+            print(f"{term:<12}{matches:>9,}{fts_all:>10.2f}{like_all:>10.2f}{fts_top:>10.2f}{like_first:>11.2f}")
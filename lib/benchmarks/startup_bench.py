@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Measure how long `python app.py --help` takes to start.
+
+Usage (from the project root):
+    python lib/benchmarks/startup_bench.py [--runs 20] [--budget-ms 150]
+
+Exits non-zero when the median exceeds the budget, so it can be used as a
+regression check for imports that sneak back into app.py's top level.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STARTUP_BUDGET_MS = 150
+
+def time_command(args, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS)
+    args = parser.parse_args()
+
+    baseline = time_command([sys.executable, '-c', 'pass'], args.runs)
+    help_run = time_command([sys.executable, 'app.py', '--help'], args.runs)
+
+    interpreter = statistics.median(baseline)
+    median = statistics.median(help_run)
+    print(f"interpreter only : {interpreter:7.1f} ms (median of {args.runs})")
+    print(f"app.py --help    : {median:7.1f} ms (median of {args.runs}, min {min(help_run):.1f} ms)")
+    print(f"budget           : {args.budget_ms:7.1f} ms")
+
+    if median > args.budget_ms:
+        print("❌ Startup is over budget.")
+        sys.exit(1)
+    print("✅ Startup is within budget.")
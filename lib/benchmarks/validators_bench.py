@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Measure how many validated model objects can be constructed per second.
+
+Usage (from the project root):
+    python lib/benchmarks/validators_bench.py [--objects 100000]
+
+"before" replays the checks the setters used to do inline (a print() per
+mobile/role assignment, re.match with an uncompiled pattern, allowed-value
+lists rebuilt per call) with stdout sent to /dev/null, and builds the same
+objects by assigning the mapped columns directly, so lib.validators doesn't
+run on that path. "after" constructs the actual models, whose setters use
+lib.validators.
+"""
+import argparse
+import contextlib
+import os
+import re
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from lib.models import User, Job, Application
+
+def legacy_checks(index):
+    print(len(str(759233322)))
+    if not isinstance(int(759233322), int) or len(str(759233322)) < 9:
+        raise ValueError
+    print('applicant')
+    if 'applicant' not in ['applicant', 'employer']:
+        raise ValueError
+    if not re.match(r'^\S+@\S+\.\S+$', f"user{index}@example.com"):
+        raise ValueError
+    if 'full-time' not in ['full-time', 'part-time', 'contract', 'internship']:
+        raise ValueError
+    if 'applied' not in ['applied', 'interviewing', 'rejected', 'offered', 'accepted']:
+        raise ValueError
+
+def construct(index):
+    User(name="Alice Doe", email=f"user{index}@example.com", mobile=759233322, role="applicant")
+    Job(name="Engineer", location="Nairobi", description="Build things", salary=90000, type="full-time")
+    Application(user_id=1, job_id=1, status="applied")
+
+def legacy_construct(index):
+    legacy_checks(index)
+    # underscore attributes are the mapped columns: no setter, no validator
+    User(_name="Alice Doe", _email=f"user{index}@example.com", _mobile=759233322, _role="applicant")
+    Job(_name="Engineer", _location="Nairobi", _description="Build things", _salary=90000, _type="full-time")
+    Application(_user_id=1, _job_id=1, _status="applied")
+
+def rate(function, count):
+    started = time.perf_counter()
+    for index in range(count):
+        function(index)
+    return count / (time.perf_counter() - started)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--objects', type=int, default=100_000)
+    args = parser.parse_args()
+
+    # The old prints went to the terminal, which is slower still than /dev/null
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        before = rate(legacy_construct, args.objects)
+    after = rate(construct, args.objects)
+
+    print(f"before : {before:>10,.0f} user+job+application sets/sec")
+    print(f"after  : {after:>10,.0f} user+job+application sets/sec  ({after / before:.2f}x)")
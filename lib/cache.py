@@ -0,0 +1,126 @@
+"""Read-through cache for single-record lookups (the fetch-* commands).
+
+Entries are immutable result rows keyed by (table, id), kept in LRU order
+and dropped after a TTL, so a long-lived process (the shell) serves
+repeated lookups from memory while other writers' changes still show up
+within `ttl` seconds. Every UPDATE, DELETE and upsert executed in this
+process, whether an ORM flush or Core (transitions, purges, swipe imports,
+seed resets) sends it, drops the cached rows of its table along with
+rows of other tables that embed them (a job row carries its company
+name). Plain INSERTs only add rows, which can't be cached yet. Raw SQL
+strings aren't inspected.
+"""
+import os
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import Insert, UpdateBase
+
+from lib import db
+
+DEFAULT_MAXSIZE = int(os.environ.get('SWIPEMATCH_CACHE_SIZE', 1024))
+DEFAULT_TTL = float(os.environ.get('SWIPEMATCH_CACHE_TTL', 30))
+
+# table -> tables whose cached rows include its columns
+DEPENDENTS = {
+    'companies': ('jobs',),
+    'users': ('applications',),
+    'jobs': ('applications',),
+}
+
+class IdentityCache:
+    """Bounded LRU cache with per-entry expiry and hit/miss counters."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.url = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, model, record_id, load):
+        """Return the cached row for `model` `record_id`, calling `load()` on a miss.
+
+        Only found rows are cached, so a record created later is not hidden
+        by an earlier "not found".
+        """
+        try:
+            key = (model.__tablename__, int(record_id))
+        except (TypeError, ValueError):
+            return load()
+
+        # a different database means nothing cached so far applies
+        if self.url != db.current_url():
+            self.clear()
+            self.url = db.current_url()
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            value, expires = entry
+            if self.clock() < expires:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self.entries[key]
+            self.expirations += 1
+
+        self.misses += 1
+        value = load()
+        if value is not None:
+            self.entries[key] = (value, self.clock() + self.ttl)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, table, record_id=None):
+        """Drop one record (or the whole table) and every cached row that embeds it."""
+        if record_id is None:
+            for key in [key for key in self.entries if key[0] == table]:
+                del self.entries[key]
+        else:
+            self.entries.pop((table, record_id), None)
+        for dependent in DEPENDENTS.get(table, ()):
+            self.invalidate(dependent)
+
+    def clear(self):
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+records = IdentityCache()
+
+@event.listens_for(Engine, "after_execute")
+def invalidate_executed(conn, clauseelement, multiparams, params, execution_options, result):
+    if not isinstance(clauseelement, UpdateBase):
+        return
+    # ON CONFLICT ... DO UPDATE is the dialect insert's post-values clause
+    if isinstance(clauseelement, Insert) and getattr(clauseelement, '_post_values_clause', None) is None:
+        return
+    records.invalidate(clauseelement.table.name)
@@ -0,0 +1,336 @@
+"""Read-only, column-oriented snapshot of the jobs table.
+
+A JobCatalog keeps each field as one NumPy array instead of one ORM object
+per job: ids, salaries and company ids are plain numeric columns; contract
+type, location and company name are interned into small vocabularies and
+stored as integer codes; titles are one UTF-8 buffer plus an offsets
+array. A million jobs cost tens of megabytes instead of the instance state,
+attribute dicts and relationship bookkeeping of a million `Job` objects.
+
+`save` writes the columns as .npy files in a directory and publishes it by
+swapping a symlink in one rename. `open` maps them back with
+`mmap_mode='r'`, so a new process can use a multi-million-job catalog
+straight away: nothing is read or copied until a column is touched, and
+then only the pages that are.
+
+Each catalog records the change-feed watermark it was taken at (see
+lib/changes.py). `refresh` reads only the jobs and companies changed since
+then and splices them into a new catalog.
+"""
+import itertools
+import json
+import os
+from datetime import datetime
+import shutil
+import tempfile
+
+import numpy as np
+from sqlalchemy import func, select
+
+from lib.changes import changes_since, database_now
+from lib.models import Company, Job
+
+FORMAT_VERSION = 1
+DEFAULT_BATCH_SIZE = 50000
+
+# column name -> dtype, in the order they are saved
+COLUMNS = {
+    'ids': np.int64,
+    'salary': np.float64,
+    'company_ids': np.int64,
+    'type_codes': np.int16,
+    'location_codes': np.int32,
+    'company_codes': np.int32,
+    'name_offsets': np.int64,
+    'name_bytes': np.uint8,
+}
+
+# the columns with one entry per job
+ROW_COLUMNS = ('ids', 'salary', 'company_ids', 'type_codes', 'location_codes', 'company_codes')
+
+class Interner:
+    """Maps strings to dense integer codes, continuing `vocabulary`; None is -1."""
+
+    def __init__(self, vocabulary=()):
+        self.codes = {value: code for code, value in enumerate(vocabulary)}
+
+    def __call__(self, value):
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+    @property
+    def vocabulary(self):
+        return list(self.codes)
+
+class JobCatalog:
+    """Jobs as parallel arrays sorted by id, with interned categorical columns."""
+
+    def __init__(self, columns, types, locations, companies, watermark=None):
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+        self.types = list(types)
+        self.locations = list(locations)
+        self.companies = list(companies)
+        # change-feed time the snapshot is complete up to
+        self.watermark = watermark
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the column arrays (vocabularies excluded)."""
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+    @classmethod
+    def build(cls, connection, batch_size=DEFAULT_BATCH_SIZE):
+        """Snapshot the jobs table with one streamed SELECT, batch by batch."""
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        # taken first: anything changed while the rows stream in is refreshed later
+        watermark = database_now(connection)
+        count = connection.execute(select(func.count()).select_from(Job.__table__)).scalar()
+        jobs, companies = Job.__table__, Company.__table__
+        statement = (
+            select(jobs.c.id, jobs.c.salary, jobs.c.company_id, jobs.c.type, jobs.c.location, companies.c.name, jobs.c.name)
+            .outerjoin(companies, jobs.c.company_id == companies.c.id)
+            .order_by(jobs.c.id)
+        )
+
+        columns = {name: np.empty(count, dtype=COLUMNS[name]) for name in ROW_COLUMNS}
+        interners = Interner(), Interner(), Interner()
+        names, filled = [], 0
+        result = connection.execution_options(yield_per=batch_size).execute(statement)
+        for batch in result.partitions():
+            end = filled + len(batch)
+            if end > count:
+                # rows added since the count; the snapshot keeps what it counted
+                batch, end = batch[:count - filled], count
+            encoded, encoded_names = encode_rows(batch, *interners)
+            for name in ROW_COLUMNS:
+                columns[name][filled:end] = encoded[name]
+            names.extend(encoded_names)
+            filled = end
+            if filled == count:
+                break
+        result.close()
+
+        for name in ROW_COLUMNS:
+            columns[name] = columns[name][:filled]
+        columns['name_offsets'], columns['name_bytes'] = pack_strings(names)
+        types, locations, companies_ = interners
+        return cls(columns, types.vocabulary, locations.vocabulary, companies_.vocabulary, watermark)
+
+    def refresh(self, connection, until=None):
+        """A new catalog with the changes made since this one's watermark.
+
+        Only jobs changed or deleted since then are read from the database;
+        unchanged rows are copied over array by array. A company rename or
+        delete re-resolves every job's company name from the (small)
+        companies table. A catalog without a watermark is rebuilt in full.
+        Raises ValueError on backends that don't record deletes.
+        """
+        if self.watermark is None:
+            return type(self).build(connection)
+        jobs = changes_since(connection, 'jobs', self.watermark, until)
+        companies = changes_since(connection, 'companies', self.watermark, jobs.watermark)
+        company_table = Company.__table__
+        recode_companies = bool(companies.changed or companies.deleted)
+        if recode_companies:
+            directory = dict(connection.execute(select(company_table.c.id, company_table.c.name)).all())
+        else:
+            wanted = {row.company_id for row in jobs.changed if row.company_id is not None}
+            directory = dict(connection.execute(
+                select(company_table.c.id, company_table.c.name).where(company_table.c.id.in_(wanted))
+            ).all()) if wanted else {}
+
+        dropped = np.fromiter(itertools.chain(jobs.deleted, (row.id for row in jobs.changed)), dtype=np.int64)
+        # ids are sorted, so the dropped rows are found by binary search rather than a scan
+        found = np.searchsorted(self.ids, dropped)
+        inside = found < len(self.ids)
+        found = found[inside][np.asarray(self.ids)[found[inside]] == dropped[inside]]
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[found] = False
+        kept = np.flatnonzero(keep)
+        changed = sorted(jobs.changed, key=lambda row: row.id)
+        interners = Interner(self.types), Interner(self.locations), Interner(self.companies)
+        added, added_names = encode_rows(
+            [(row.id, row.salary, row.company_id, row.type, row.location, directory.get(row.company_id), row.name)
+             for row in changed],
+            *interners,
+        )
+        # new rows go where their ids sort among the kept ones
+        at = np.searchsorted(self.ids[kept], added['ids'])
+        columns = {name: np.insert(np.asarray(getattr(self, name))[kept], at, added[name]) for name in ROW_COLUMNS}
+        new_offsets, new_bytes = pack_strings(added_names)
+        columns['name_offsets'], columns['name_bytes'] = splice_strings(
+            (self.name_offsets, self.name_bytes), kept, (new_offsets, new_bytes), at,
+        )
+
+        types, locations, company_names = interners
+        company_vocabulary = company_names.vocabulary
+        if recode_companies:
+            columns['company_codes'], company_vocabulary = company_codes(columns['company_ids'], directory)
+        return type(self)(columns, types.vocabulary, locations.vocabulary, company_vocabulary, jobs.watermark)
+
+    def save(self, path):
+        """Write the catalog to `path`, replacing any catalog already there.
+
+        `path` is a symlink to a version directory beside it. The files go
+        into a new version directory and the link is swapped onto it with a
+        single rename, so a reader opening `path` finds the old catalog or
+        the new one, never neither and never a mix. The version the link
+        pointed to is kept until the next save, for readers that resolved
+        it just before the swap; older versions are removed. Concurrent
+        saves to the same `path` are not supported.
+        """
+        parent, name = os.path.split(os.path.abspath(path))
+        prefix = f'.{name}.v-'
+        staging = tempfile.mkdtemp(prefix=prefix, dir=parent)
+        try:
+            for column in COLUMNS:
+                np.save(os.path.join(staging, f'{column}.npy'), getattr(self, column), allow_pickle=False)
+            with open(os.path.join(staging, 'catalog.json'), 'w', encoding='utf-8') as manifest:
+                json.dump({
+                    'version': FORMAT_VERSION,
+                    'jobs': len(self),
+                    'types': self.types,
+                    'locations': self.locations,
+                    'companies': self.companies,
+                    'watermark': self.watermark.isoformat() if self.watermark else None,
+                }, manifest)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        if os.path.isdir(path) and not os.path.islink(path):
+            # a catalog saved as a plain directory before snapshots were
+            # published through a link: move it to a version name once,
+            # the only time `path` is briefly missing
+            legacy = tempfile.mkdtemp(prefix=prefix, dir=parent)
+            os.rmdir(legacy)
+            os.rename(path, legacy)
+            os.symlink(os.path.basename(legacy), path)
+        keep = {os.path.basename(staging)}
+        if os.path.islink(path):
+            keep.add(os.path.basename(os.readlink(path)))
+        link = staging + '.link'
+        os.symlink(os.path.basename(staging), link)
+        os.replace(link, path)
+        for entry in os.listdir(parent):
+            version = os.path.join(parent, entry)
+            if entry.startswith(prefix) and entry not in keep and not os.path.islink(version) and os.path.isdir(version):
+                shutil.rmtree(version, ignore_errors=True)
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a catalog written by `save`; columns are read-only views of the files."""
+        # resolve the link once so every file comes from the same version
+        directory = os.path.realpath(path)
+        try:
+            with open(os.path.join(directory, 'catalog.json'), encoding='utf-8') as manifest:
+                meta = json.load(manifest)
+        except FileNotFoundError:
+            raise ValueError(f"No job catalog at '{path}'.") from None
+        if meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Job catalog at '{path}' has format version {meta.get('version')}; expected {FORMAT_VERSION}.")
+        columns = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r', allow_pickle=False)
+            for name in COLUMNS
+        }
+        watermark = meta.get('watermark')
+        return cls(columns, meta['types'], meta['locations'], meta['companies'],
+                   datetime.fromisoformat(watermark) if watermark else None)
+
+    def position(self, job_id):
+        """Row position of `job_id`, or None if the catalog doesn't have it."""
+        found = int(np.searchsorted(self.ids, job_id))
+        return found if found < len(self.ids) and self.ids[found] == job_id else None
+
+    def name(self, position):
+        start, end = self.name_offsets[position], self.name_offsets[position + 1]
+        return bytes(self.name_bytes[start:end]).decode('utf-8')
+
+    def row(self, job_id):
+        """One job as a dict with its strings decoded, or None."""
+        position = self.position(job_id)
+        if position is None:
+            return None
+        salary = float(self.salary[position])
+        return {
+            'id': int(self.ids[position]),
+            'name': self.name(position),
+            'salary': None if np.isnan(salary) else salary,
+            'type': decode(self.types, self.type_codes[position]),
+            'location': decode(self.locations, self.location_codes[position]),
+            'company_id': None if self.company_ids[position] < 0 else int(self.company_ids[position]),
+            'company_name': decode(self.companies, self.company_codes[position]),
+        }
+
+    def job_index(self):
+        """A lib.job_index.JobIndex over this snapshot, without going back to the database."""
+        from lib.job_index import JobIndex
+        return JobIndex(self.ids, self.salary, self.type_codes, self.types,
+                        self.location_codes, self.locations, self.company_ids)
+
+def decode(vocabulary, code):
+    return None if code < 0 else vocabulary[code]
+
+def encode_rows(rows, types, locations, companies):
+    """Column arrays and encoded titles for (id, salary, company_id, type, location, company name, title) rows."""
+    if not rows:
+        return {name: np.empty(0, dtype=COLUMNS[name]) for name in ROW_COLUMNS}, []
+    ids, salaries, company_ids, job_types, job_locations, company_names, job_names = zip(*rows)
+    return {
+        'ids': np.array(ids, dtype=np.int64),
+        'salary': np.array([np.nan if salary is None else salary for salary in salaries], dtype=np.float64),
+        'company_ids': np.array([-1 if company_id is None else company_id for company_id in company_ids], dtype=np.int64),
+        'type_codes': np.array([types(value) for value in job_types], dtype=COLUMNS['type_codes']),
+        'location_codes': np.array([locations(value) for value in job_locations], dtype=COLUMNS['location_codes']),
+        'company_codes': np.array([companies(value) for value in company_names], dtype=COLUMNS['company_codes']),
+    }, [(name or '').encode('utf-8') for name in job_names]
+
+def company_codes(company_ids, directory):
+    """Codes and vocabulary of company names for `company_ids`, from a {company id: name} directory."""
+    interner = Interner()
+    known = np.array(sorted(directory), dtype=np.int64)
+    codes_by_company = np.array([interner(directory[company_id]) for company_id in known], dtype=COLUMNS['company_codes'])
+    codes = np.full(len(company_ids), -1, dtype=COLUMNS['company_codes'])
+    if len(known):
+        found = np.minimum(np.searchsorted(known, company_ids), len(known) - 1)
+        present = known[found] == company_ids
+        codes[present] = codes_by_company[found[present]]
+    return codes, interner.vocabulary
+
+def splice_strings(old, kept, new, at):
+    """Pack the kept strings of `old` with all of `new` inserted before positions `at`.
+
+    Works on runs of strings that are contiguous in their source buffer, so
+    the cost is a few slice copies per change rather than per string.
+    """
+    (old_offsets, old_bytes), (new_offsets, new_bytes) = old, new
+    old_offsets, new_offsets = np.asarray(old_offsets), np.asarray(new_offsets)
+    source = np.insert(np.zeros(len(kept), dtype=np.int8), at, 1)
+    starts = np.insert(old_offsets[:-1][kept], at, new_offsets[:-1])
+    lengths = np.insert(np.diff(old_offsets)[kept], at, np.diff(new_offsets))
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    packed = np.empty(offsets[-1], dtype=np.uint8)
+
+    # a run continues while the next string comes from the same buffer, right after this one
+    breaks = np.flatnonzero((source[1:] != source[:-1]) | (starts[1:] != starts[:-1] + lengths[:-1])) + 1
+    bounds = np.concatenate(([0], breaks, [len(lengths)])) if len(lengths) else np.zeros(1, dtype=np.int64)
+    buffers = (old_bytes, new_bytes)
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        begin = starts[first]
+        packed[offsets[first]:offsets[last]] = buffers[source[first]][begin:begin + offsets[last] - offsets[first]]
+    return offsets, packed
+
+def pack_strings(encoded):
+    """(offsets, bytes) for a list of byte strings; item i is bytes[offsets[i]:offsets[i + 1]]."""
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8).copy()
@@ -0,0 +1,190 @@
+"""Change feed over `updated_at`, with tombstones for deleted rows.
+
+`users`, `companies` and `jobs` stamp `updated_at` on insert and on every
+ORM or Core update, and the column is indexed, so "what changed since T" is
+an index range scan instead of a full read of the table. Deletes leave the
+table name and id in `tombstones`; triggers record them on SQLite and
+PostgreSQL, including deletes done by `ON DELETE CASCADE`. A consumer keeps
+the `watermark` of its last poll and passes it as `since` next time. It
+applies the deletes first, then the changed rows (SQLite may reuse the id
+of a deleted row).
+
+Timestamps come from the database clock, at one-second resolution on
+SQLite, so a poll only covers time up to the moment it runs and the
+watermark is that moment: writes stamped in the current second are picked
+up by the next poll. A write whose transaction commits well after its
+statement ran can still fall behind a poll taken in between; pass an
+earlier `since` to re-read a margin, since changes are safe to apply twice.
+Other backends record no tombstones, so they only offer full syncs.
+"""
+from sqlalchemy import String, delete, func, or_, select, type_coerce
+
+from lib.models import User, Company, Job, Tombstone
+
+FEED_MODELS = {'users': User, 'companies': Company, 'jobs': Job}
+
+def tombstone_trigger(table):
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS {table}_tombstone_after_delete AFTER DELETE ON {table} BEGIN
+        INSERT INTO tombstones (table_name, record_id) VALUES ('{table}', old.id);
+    END"""
+
+TRIGGERS = tuple(f"{table}_tombstone_after_delete" for table in FEED_MODELS)
+
+INSTALL_STATEMENTS = [tombstone_trigger(table) for table in FEED_MODELS]
+
+UNINSTALL_STATEMENTS = [f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGERS]
+
+# PostgreSQL triggers call a function; one serves every table through TG_TABLE_NAME
+POSTGRESQL_INSTALL_STATEMENTS = [
+    """
+    CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO tombstones (table_name, record_id) VALUES (TG_TABLE_NAME, old.id);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    *(f"DROP TRIGGER IF EXISTS {table}_tombstone_after_delete ON {table}" for table in FEED_MODELS),
+    *(f"CREATE TRIGGER {table}_tombstone_after_delete AFTER DELETE ON {table} "
+      f"FOR EACH ROW EXECUTE FUNCTION record_tombstone()" for table in FEED_MODELS),
+]
+
+POSTGRESQL_UNINSTALL_STATEMENTS = [
+    *(f"DROP TRIGGER IF EXISTS {table}_tombstone_after_delete ON {table}" for table in FEED_MODELS),
+    "DROP FUNCTION IF EXISTS record_tombstone()",
+]
+
+# where each backend lists its triggers
+TRIGGER_CATALOGS = {
+    'sqlite': "SELECT name FROM sqlite_master WHERE type = 'trigger'",
+    'postgresql': "SELECT tgname FROM pg_trigger WHERE NOT tgisinternal",
+}
+
+def tracks_deletes(connection):
+    """True if deletes on this backend leave tombstones (SQLite, PostgreSQL)."""
+    return connection.dialect.name in TRIGGER_CATALOGS
+
+def install_tombstones(connection):
+    """Create the delete triggers (idempotent; SQLite and PostgreSQL)."""
+    statements = POSTGRESQL_INSTALL_STATEMENTS if connection.dialect.name == 'postgresql' else INSTALL_STATEMENTS
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+def uninstall_tombstones(connection):
+    statements = POSTGRESQL_UNINSTALL_STATEMENTS if connection.dialect.name == 'postgresql' else UNINSTALL_STATEMENTS
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+def ensure_tombstones(connection):
+    """Install the delete triggers if this database is missing any of them.
+
+    Returns True when they had to be created.
+    """
+    present = set(connection.exec_driver_sql(TRIGGER_CATALOGS[connection.dialect.name]).scalars())
+    missing = not present.issuperset(TRIGGERS)
+    if missing:
+        install_tombstones(connection)
+    return missing
+
+class Changes:
+    """Rows of one table changed, and ids deleted, between two watermarks."""
+
+    def __init__(self, table, changed, deleted, watermark):
+        self.table = table
+        self.changed = changed
+        self.deleted = deleted
+        self.watermark = watermark
+
+    def __len__(self):
+        return len(self.changed) + len(self.deleted)
+
+def database_now(connection):
+    """The database's current time, the upper bound of a poll."""
+    return connection.execute(select(func.now())).scalar()
+
+def comparable(connection, column, value):
+    """`column` and `value` ready to compare.
+
+    On SQLite the column holds CURRENT_TIMESTAMP text ('YYYY-MM-DD HH:MM:SS');
+    a bound datetime would be written with microseconds and sort after the
+    stored value of the same second, so both sides are compared as that text.
+    """
+    if connection.dialect.name == 'sqlite':
+        return type_coerce(column, String), value.strftime('%Y-%m-%d %H:%M:%S')
+    return column, value
+
+def window(connection, column, since, until):
+    """WHERE clause for since <= column < until; with no `since`, rows never
+    stamped count too, and with no `until` there is no upper bound."""
+    if since is None:
+        column_, until_ = comparable(connection, column, until)
+        return or_(column.is_(None), column_ < until_)
+    column_, since_ = comparable(connection, column, since)
+    if until is None:
+        return column_ >= since_
+    _, until_ = comparable(connection, column, until)
+    return (column_ >= since_) & (column_ < until_)
+
+def feed_model(connection, table, since):
+    model = FEED_MODELS.get(table)
+    if model is None:
+        raise ValueError(f"No change feed for '{table}'; choose from {', '.join(FEED_MODELS)}.")
+    if since is not None and not tracks_deletes(connection):
+        raise ValueError(f"Deletes aren't recorded on {connection.dialect.name}; only a full sync (no since) is possible.")
+    return model
+
+def changes_since(connection, table, since=None, until=None):
+    """Changes to `table` ('users', 'companies' or 'jobs') from `since` up to `until`.
+
+    Without `since`, every row is returned as changed and no deletes (a full
+    sync); an incremental poll raises ValueError on backends that don't
+    record deletes, as it would silently miss them. `until` defaults to the
+    database's current time and becomes the returned watermark. Changed
+    rows come in (updated_at, id) order.
+    """
+    model = feed_model(connection, table, since)
+    if until is None:
+        until = database_now(connection)
+
+    rows = model.__table__
+    changed = connection.execute(
+        select(rows).where(window(connection, rows.c.updated_at, since, until)).order_by(rows.c.updated_at, rows.c.id)
+    ).all()
+    deleted = []
+    if since is not None:
+        tombstones = Tombstone.__table__
+        deleted = connection.execute(
+            select(tombstones.c.record_id)
+            .where(tombstones.c.table_name == table, window(connection, tombstones.c.deleted_at, since, until))
+            .order_by(tombstones.c.id)
+        ).scalars().all()
+        # an id deleted twice (SQLite reuses the highest id) is reported once
+        deleted = list(dict.fromkeys(deleted))
+    return Changes(table, changed, deleted, until)
+
+def has_changes(connection, table, since, until=None):
+    """True if any row of `table` changed, or was deleted, from `since` up to `until`.
+
+    Two LIMIT 1 index probes: for callers that only need to know whether
+    something they derived from the table is out of date. Without `until`
+    the current second counts too.
+    """
+    rows = feed_model(connection, table, since).__table__
+    tombstones = Tombstone.__table__
+    probes = (
+        select(rows.c.id).where(window(connection, rows.c.updated_at, since, until)).limit(1),
+        select(tombstones.c.id)
+        .where(tombstones.c.table_name == table, window(connection, tombstones.c.deleted_at, since, until))
+        .limit(1),
+    )
+    return any(connection.execute(probe).first() is not None for probe in probes)
+
+def prune_tombstones(connection, before):
+    """Forget deletes older than `before`; consumers with an older watermark must do a full sync.
+
+    Returns the number of tombstones removed.
+    """
+    tombstones = Tombstone.__table__
+    column, before = comparable(connection, tombstones.c.deleted_at, before)
+    return connection.execute(delete(tombstones).where(column < before)).rowcount
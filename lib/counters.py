@@ -0,0 +1,181 @@
+"""Per-job and per-user application counts, kept current by triggers.
+
+`job_application_counts` and `user_application_counts` hold one row per
+job/user with a column per status plus a total. Triggers on `applications`
+(SQLite, and PL/pgSQL on PostgreSQL) adjust them on every insert, delete
+and change of status, job or user, so reading a funnel is a primary-key
+lookup instead of a scan of `applications`. Each row also carries the
+summed Julian day of its open applications, from which the dashboard
+derives their average age. On other backends the tables exist but are not
+maintained, so `application_counts` aggregates `applications` there
+instead; `rebuild_application_counts` recomputes the tables from scratch.
+"""
+from sqlalchemy import func, text
+
+from lib.changes import TRIGGER_CATALOGS
+from lib.models import Application, Job, User, JobApplicationCounts, UserApplicationCounts
+from lib.validators import STATUS_CHOICES
+
+# Statuses of applications still waiting on the employer
+OPEN_STATUSES = ('applied', 'interviewing')
+
+# (summary table, applications column it is keyed by)
+SUMMARIES = (
+    ('job_application_counts', 'job_id'),
+    ('user_application_counts', 'user_id'),
+)
+
+# Julian day of a timestamp on each backend that maintains the counts; on
+# PostgreSQL a timestamp without time zone counts from the epoch as if UTC
+JULIAN_DAYS = {
+    'sqlite': "julianday({})",
+    'postgresql': "(EXTRACT(EPOCH FROM {}) / 86400 + 2440587.5)",
+}
+
+def maintains_counts(connection):
+    """True if triggers keep the summary tables current on this backend (SQLite, PostgreSQL)."""
+    return connection.dialect.name in JULIAN_DAYS
+
+def open_since(row=None, dialect='sqlite'):
+    """Julian day of an application's date while it is still open, else 0 (SQL)."""
+    prefix = f"{row}." if row else ""
+    statuses = ', '.join(f"'{status}'" for status in OPEN_STATUSES)
+    day = JULIAN_DAYS[dialect].format(f"{prefix}date")
+    return f"CASE WHEN {prefix}status IN ({statuses}) THEN COALESCE({day}, 0) ELSE 0 END"
+
+def is_status(row, status):
+    return f"CASE WHEN {row}.status = '{status}' THEN 1 ELSE 0 END"
+
+def add_statement(table, key, dialect='sqlite'):
+    flags = ', '.join(is_status('new', status) for status in STATUS_CHOICES)
+    updates = ', '.join(f"{status} = {table}.{status} + excluded.{status}" for status in STATUS_CHOICES)
+    since = open_since('new', dialect)
+    return f"""
+        INSERT INTO {table} ({key}, {', '.join(STATUS_CHOICES)}, total, open_since_sum)
+        SELECT new.{key}, {flags}, 1, {since} WHERE new.{key} IS NOT NULL
+        ON CONFLICT ({key}) DO UPDATE SET {updates}, total = {table}.total + 1,
+            open_since_sum = {table}.open_since_sum + excluded.open_since_sum;"""
+
+def remove_statement(table, key, dialect='sqlite'):
+    updates = ', '.join(f"{status} = {status} - {is_status('old', status)}" for status in STATUS_CHOICES)
+    since = open_since('old', dialect)
+    return f"""
+        UPDATE {table} SET {updates}, total = total - 1,
+            open_since_sum = open_since_sum - {since}
+        WHERE {key} = old.{key};"""
+
+def trigger(name, event, body):
+    return f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON applications BEGIN{body}\n    END"
+
+INSTALL_STATEMENTS = [
+    trigger("application_counts_after_insert", "INSERT",
+            ''.join(add_statement(table, key) for table, key in SUMMARIES)),
+    trigger("application_counts_after_delete", "DELETE",
+            ''.join(remove_statement(table, key) for table, key in SUMMARIES)),
+    trigger("application_counts_after_update", "UPDATE OF status, job_id, user_id, date",
+            ''.join(remove_statement(table, key) for table, key in SUMMARIES)
+            + ''.join(add_statement(table, key) for table, key in SUMMARIES)),
+]
+
+TRIGGERS = ('application_counts_after_insert', 'application_counts_after_delete', 'application_counts_after_update')
+
+UNINSTALL_STATEMENTS = [f"DROP TRIGGER IF EXISTS {name}" for name in reversed(TRIGGERS)]
+
+# PostgreSQL triggers call a function; one serves all three, branching on TG_OP
+POSTGRESQL_INSTALL_STATEMENTS = [
+    f"""
+    CREATE OR REPLACE FUNCTION maintain_application_counts() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN{''.join(remove_statement(table, key, 'postgresql') for table, key in SUMMARIES)}
+        END IF;
+        IF TG_OP <> 'DELETE' THEN{''.join(add_statement(table, key, 'postgresql') for table, key in SUMMARIES)}
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    *(f"DROP TRIGGER IF EXISTS {name} ON applications" for name in TRIGGERS),
+    *(f"CREATE TRIGGER {name} AFTER {event} ON applications "
+      f"FOR EACH ROW EXECUTE FUNCTION maintain_application_counts()"
+      for name, event in zip(TRIGGERS, ("INSERT", "DELETE", "UPDATE OF status, job_id, user_id, date"))),
+]
+
+POSTGRESQL_UNINSTALL_STATEMENTS = [
+    *(f"DROP TRIGGER IF EXISTS {name} ON applications" for name in reversed(TRIGGERS)),
+    "DROP FUNCTION IF EXISTS maintain_application_counts()",
+]
+
+def install_application_counts(connection):
+    """Create the maintenance triggers (idempotent; SQLite and PostgreSQL)."""
+    statements = POSTGRESQL_INSTALL_STATEMENTS if connection.dialect.name == 'postgresql' else INSTALL_STATEMENTS
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+def uninstall_application_counts(connection):
+    statements = POSTGRESQL_UNINSTALL_STATEMENTS if connection.dialect.name == 'postgresql' else UNINSTALL_STATEMENTS
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+def rebuild_application_counts(connection):
+    """Recompute both summary tables from `applications` in one GROUP BY each."""
+    sums = ', '.join(f"SUM(CASE WHEN status = '{status}' THEN 1 ELSE 0 END)" for status in STATUS_CHOICES)
+    # open_since_sum is only meaningful (and only maintained) where triggers keep it
+    since = f"SUM({open_since(dialect=connection.dialect.name)})" if maintains_counts(connection) else "0"
+    for table, key in SUMMARIES:
+        connection.execute(text(f"DELETE FROM {table}"))
+        connection.execute(text(f"""
+            INSERT INTO {table} ({key}, {', '.join(STATUS_CHOICES)}, total, open_since_sum)
+            SELECT {key}, {sums}, COUNT(*), {since} FROM applications
+            WHERE {key} IS NOT NULL
+            GROUP BY {key}
+        """))
+
+def ensure_application_counts(connection):
+    """Install the triggers and backfill the counts if this database is missing any of them.
+
+    The counts can't be trusted once a trigger has been missing, so they are
+    recomputed whenever one had to be created. Returns True in that case.
+    """
+    present = set(connection.exec_driver_sql(TRIGGER_CATALOGS[connection.dialect.name]).scalars())
+    missing = not present.issuperset(TRIGGERS)
+    if missing:
+        install_application_counts(connection)
+        rebuild_application_counts(connection)
+    return missing
+
+NAMES = STATUS_CHOICES + ('total',)
+
+def summary_counts(session, model, record_id):
+    """Counts read from the trigger-maintained summary tables (SQLite, PostgreSQL)."""
+    summary, key = {Job: (JobApplicationCounts, 'job_id'), User: (UserApplicationCounts, 'user_id')}[model]
+    row = (
+        session.query(*(getattr(summary, name) for name in NAMES))
+        .filter(getattr(summary, key) == record_id)
+        .first()
+    )
+    return dict(zip(NAMES, row if row is not None else (0,) * len(NAMES)))
+
+def grouped_counts(session, model, record_id):
+    """Counts aggregated straight from `applications` in one GROUP BY."""
+    key = {Job: Application._job_id, User: Application._user_id}[model]
+    counts = dict.fromkeys(NAMES, 0)
+    for status, count in (
+        session.query(Application._status, func.count())
+        .filter(key == record_id)
+        .group_by(Application._status)
+    ):
+        if status in STATUS_CHOICES:
+            counts[status] = count
+        counts['total'] += count
+    return counts
+
+def application_counts(session, model, record_id):
+    """{status: count, ..., 'total': n} for one job or user (all zero if it has none).
+
+    Only SQLite and PostgreSQL have the triggers that keep the summary
+    tables current, so other backends count the applications directly
+    (served by the job_id/user_id indexes).
+    """
+    if maintains_counts(session.get_bind()):
+        return summary_counts(session, model, record_id)
+    return grouped_counts(session, model, record_id)
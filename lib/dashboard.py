@@ -0,0 +1,119 @@
+"""Employer pipeline dashboard: per-job application funnels for one company.
+
+On SQLite and PostgreSQL the funnel is read from `job_application_counts`
+(see lib.counters), one row per job, so a company with 10k jobs and a
+million applications costs a 10k-row join instead of an aggregate over the
+million. Elsewhere, where those counters are not trigger-maintained, it
+is one GROUP BY over the company's jobs LEFT JOINed to their applications.
+Neither path walks `Company.jobs` / `Job.applications`.
+
+Applications only record when they were made, not when their status last
+changed, so "days open" is the average age of the job's applications that
+are still in progress (applied or interviewing): an upper bound on their
+time in the current status.
+"""
+from sqlalchemy import func, case
+
+from lib.counters import OPEN_STATUSES, maintains_counts
+from lib.models import Job, Application, JobApplicationCounts
+from lib.validators import STATUS_CHOICES
+
+class JobFunnel:
+    """Application counts by status for one job, plus the derived rates."""
+
+    def __init__(self, job_id, name, counts, days_open):
+        self.job_id = job_id
+        self.name = name
+        self.counts = counts
+        self.days_open = days_open
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    @property
+    def open(self):
+        return sum(self.counts[status] for status in OPEN_STATUSES)
+
+    @property
+    def interviewed(self):
+        """Applications that got at least as far as an interview."""
+        return self.counts['interviewing'] + self.counts['offered'] + self.counts['accepted']
+
+    @property
+    def offers(self):
+        return self.counts['offered'] + self.counts['accepted']
+
+    def rate(self, count):
+        return count / self.total if self.total else 0.0
+
+def summary_funnel(session, company_id):
+    """Funnels read from the trigger-maintained job_application_counts (SQLite, PostgreSQL)."""
+    summary = JobApplicationCounts
+    still_open = sum(getattr(summary, status) for status in OPEN_STATUSES)
+    query = (
+        session.query(
+            Job.id,
+            Job._name,
+            *(func.coalesce(getattr(summary, status), 0) for status in STATUS_CHOICES),
+            julian_now(session.connection()) - summary.open_since_sum / func.nullif(still_open, 0),
+        )
+        .outerjoin(summary, summary.job_id == Job.id)
+        .filter(Job.company_id == company_id)
+    )
+    return [
+        JobFunnel(job_id, name, dict(zip(STATUS_CHOICES, counts)), days_open)
+        for job_id, name, *counts, days_open in query
+    ]
+
+def julian_now(connection):
+    """SQL expression for the current Julian day, as lib.counters sums them."""
+    if connection.dialect.name == 'sqlite':
+        return func.julianday('now')
+    # LOCALTIMESTAMP, like the stored dates, has no time zone
+    return func.extract('epoch', func.localtimestamp()) / 86400 + 2440587.5
+
+def age_in_days(connection, column):
+    """SQL expression for how many days ago `column` was, on SQLite or PostgreSQL."""
+    if connection.dialect.name == 'sqlite':
+        return func.julianday('now') - func.julianday(column)
+    return func.extract('epoch', func.now() - column) / 86400.0
+
+def grouped_funnel(session, company_id):
+    """Funnels aggregated straight from `applications` in one GROUP BY."""
+    status = Application._status
+    query = (
+        session.query(
+            Job.id,
+            Job._name,
+            *(func.count(case((status == name, 1))) for name in STATUS_CHOICES),
+            func.avg(case((status.in_(OPEN_STATUSES), age_in_days(session.connection(), Application.date)))),
+        )
+        .outerjoin(Application, Application._job_id == Job.id)
+        .filter(Job.company_id == company_id)
+        .group_by(Job.id, Job._name)
+    )
+    return [
+        JobFunnel(job_id, name, dict(zip(STATUS_CHOICES, counts)), days_open)
+        for job_id, name, *counts, days_open in query
+    ]
+
+def company_funnel(session, company_id):
+    """JobFunnel for every job of `company_id` (jobs without applications included)."""
+    if maintains_counts(session.get_bind()):
+        return summary_funnel(session, company_id)
+    return grouped_funnel(session, company_id)
+
+def funnel_totals(funnels):
+    """One JobFunnel summing all of `funnels` (days_open weighted by open applications)."""
+    counts = dict.fromkeys(STATUS_CHOICES, 0)
+    weighted = 0.0
+    for funnel in funnels:
+        for status, count in funnel.counts.items():
+            counts[status] += count
+        if funnel.days_open is not None:
+            weighted += funnel.days_open * funnel.open
+    totals = JobFunnel(None, "All jobs", counts, None)
+    if totals.open:
+        totals.days_open = weighted / totals.open
+    return totals
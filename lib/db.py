@@ -0,0 +1,218 @@
+"""Engine and session management.
+
+Nothing here touches SQLAlchemy at import time: the engine and the
+session are created on first use, so commands that never reach the
+database (e.g. `--help`) don't pay for it.
+"""
+import os
+
+DEFAULT_DATABASE_URL = 'sqlite:///swipe_match_hired.db'
+DATABASE_URL = os.environ.get('SWIPEMATCH_DATABASE_URL', DEFAULT_DATABASE_URL)
+DEFAULT_BATCH_SIZE = 500
+
+# Connection pool for server databases (PostgreSQL etc.); SQLite keeps
+# SQLAlchemy's defaults. Each value can be overridden from the environment.
+POOL_SIZE = int(os.environ.get('SWIPEMATCH_POOL_SIZE', 10))
+POOL_MAX_OVERFLOW = int(os.environ.get('SWIPEMATCH_POOL_MAX_OVERFLOW', 20))
+POOL_TIMEOUT = int(os.environ.get('SWIPEMATCH_POOL_TIMEOUT', 30))
+# Recycle before typical server/proxy idle timeouts cut connections
+POOL_RECYCLE = int(os.environ.get('SWIPEMATCH_POOL_RECYCLE', 1800))
+
+# SQLite PRAGMAs applied to every new connection, by profile name.
+# - default:    SQLite's own settings (rollback journal, synchronous=FULL)
+# - safe:       WAL so readers don't wait on writers, still fsync on every commit
+# - throughput: WAL with synchronous=NORMAL (a crash can lose the last commits
+#               but never corrupts the file), memory-mapped reads, a 64 MB page
+#               cache and in-memory temp tables
+PRAGMA_PROFILES = {
+    'default': {},
+    'safe': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+    },
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 268435456,
+        'cache_size': -65536,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+}
+DEFAULT_PROFILE = os.environ.get('SWIPEMATCH_DB_PROFILE', 'default')
+
+_url = DATABASE_URL
+_profile = DEFAULT_PROFILE
+_engine = None
+_session = None
+
+def apply_pragmas(engine, pragmas):
+    """Run `pragmas` on every connection `engine` opens (SQLite only)."""
+    from sqlalchemy import event
+
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+def enforce_foreign_keys(engine):
+    """Turn on SQLite's foreign key checks (off by default) for every connection
+    `engine` opens, so ON DELETE CASCADE removes children in the database."""
+    from sqlalchemy import event
+
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.close()
+
+def begin_sqlite_transaction(connection):
+    """Open SQLite's transaction on `connection` now instead of at its first write.
+
+    pysqlite only issues BEGIN before INSERT/UPDATE/DELETE, so DDL run first
+    in an `engine.begin()` block (dropping a trigger for a bulk load) commits
+    on its own and survives a rollback. Calling this before such DDL makes it
+    part of the transaction. No-op on other backends, whose DDL is already
+    transactional or can't be.
+    """
+    if connection.dialect.name != 'sqlite':
+        return
+    if not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN")
+
+def engine_options(url):
+    """Keyword arguments for create_engine() suited to the backend of `url`."""
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.pool import QueuePool
+
+    if make_url(url).get_backend_name() == 'sqlite':
+        return {}
+    return {
+        'poolclass': QueuePool,
+        'pool_size': POOL_SIZE,
+        'max_overflow': POOL_MAX_OVERFLOW,
+        'pool_timeout': POOL_TIMEOUT,
+        'pool_recycle': POOL_RECYCLE,
+        # a cheap round trip on checkout instead of failing on a dropped connection
+        'pool_pre_ping': True,
+    }
+
+def create_engine_for(url, profile='default'):
+    """Build an engine for `url` with pooling for its backend and, on SQLite,
+    the named PRAGMA profile applied."""
+    from sqlalchemy import create_engine
+
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}'. Choose from: {', '.join(PRAGMA_PROFILES)}.")
+    engine = create_engine(url, **engine_options(url))
+    apply_pragmas(engine, PRAGMA_PROFILES[profile])
+    enforce_foreign_keys(engine)
+    return engine
+
+# asyncio driver used by create_async_engine_for, per backend
+ASYNC_DRIVERS = {'sqlite': 'aiosqlite', 'postgresql': 'asyncpg'}
+
+def async_url(url):
+    """`url` with its backend's asyncio driver (aiosqlite, asyncpg) in place of the sync one."""
+    from importlib.util import find_spec
+    from sqlalchemy.engine import make_url
+
+    url = make_url(url)
+    backend = url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No asyncio driver for '{backend}' databases. Supported: {', '.join(ASYNC_DRIVERS)}.")
+    if find_spec(driver) is None:
+        raise ValueError(f"Async access to {backend} needs the '{driver}' package.")
+    return url.set(drivername=f"{backend}+{driver}")
+
+def create_async_engine_for(url, profile='default'):
+    """Asyncio counterpart of create_engine_for: same pooling, PRAGMAs and foreign keys.
+
+    Async connections belong to the event loop that opened them, so the
+    engine isn't shared process-wide; create one per loop and dispose it
+    (`await engine.dispose()`) before the loop closes.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}'. Choose from: {', '.join(PRAGMA_PROFILES)}.")
+    options = engine_options(url)
+    if 'poolclass' in options:
+        options['poolclass'] = AsyncAdaptedQueuePool
+    engine = create_async_engine(async_url(url), **options)
+    # connect events run on the sync facade, with the driver's adapted connection
+    apply_pragmas(engine.sync_engine, PRAGMA_PROFILES[profile])
+    enforce_foreign_keys(engine.sync_engine)
+    return engine
+
+def current_url():
+    """The URL the process-wide engine uses (or will use once created)."""
+    return _url
+
+def current_profile():
+    """The PRAGMA profile the process-wide engine uses (or will use once created)."""
+    return _profile
+
+def get_engine():
+    """Return the process-wide engine, creating it on first call."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine_for(_url, _profile)
+    return _engine
+
+def get_session():
+    """Return the process-wide session, creating it on first call."""
+    global _session
+    if _session is None:
+        from sqlalchemy.orm import Session
+        _session = Session(bind=get_engine())
+    return _session
+
+def configure(url=None, profile=None):
+    """Change the database URL and/or PRAGMA profile, dropping any existing connections."""
+    global _url, _profile
+    if profile is not None and profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}'. Choose from: {', '.join(PRAGMA_PROFILES)}.")
+    dispose()
+    if url is not None:
+        _url = url
+    if profile is not None:
+        _profile = profile
+
+def release():
+    """End the session's open transaction, if any, returning its connection to the pool.
+
+    Long-lived callers (the shell) do this between commands so a finished
+    command never holds a read lock or stale identity map into the next one.
+    """
+    if _session is not None:
+        _session.rollback()
+
+def dispose():
+    """Close the session and the engine's pool; both are recreated on next use."""
+    global _engine, _session
+    if _session is not None:
+        _session.close()
+        _session = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+class SessionProxy:
+    """Stands in for the session and opens the real one on first attribute access."""
+
+    def __getattr__(self, name):
+        return getattr(get_session(), name)
+
+session = SessionProxy()
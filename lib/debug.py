@@ -1,17 +1,13 @@
 #!/usr/bin/env python3
-from faker import Faker
-import random
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from lib.models import User, Company, Job, Application, engine
-from lib.base import Base
+from lib.db import get_engine
+from lib.models import User, Company, Job, Application
 
-Session = sessionmaker(bind=engine)
-fake = Faker()
+Session = sessionmaker(bind=get_engine())
 
 if __name__ == '__main__':
     session = Session()
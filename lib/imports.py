@@ -0,0 +1,211 @@
+"""Bulk import of companies and jobs from CSV, JSONL or Parquet files.
+
+Files are read as a stream of chunks, so a feed of any size needs memory
+for one chunk only. Each chunk is checked column-wise with
+`validate_batch`, jobs get their company resolved through an in-memory
+name -> id map loaded once per run, and the surviving rows go in with a
+single executemany insert in the chunk's own transaction. Imported jobs
+are added to the search index in one pass per chunk rather than by the
+per-row trigger.
+"""
+import csv
+import gzip
+import itertools
+import json
+import sys
+import time
+
+from sqlalchemy import insert, select
+
+from lib.models import Company, Job
+from lib.search import deferred_job_indexing
+from lib.validators import validate_batch
+
+DEFAULT_CHUNK_SIZE = 10000
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+# Only the first few problems are kept; the rest are just counted
+MAX_REPORTED_ERRORS = 20
+
+COMPANY_FIELDS = ('name', 'industry', 'website')
+JOB_FIELDS = ('name', 'description', 'location', 'salary', 'type')
+
+class ImportReport:
+    """Counters for one import run."""
+
+    def __init__(self):
+        self.received = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def rate(self):
+        return self.received / self.seconds if self.seconds else 0.0
+
+    def reject(self, number, reason):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((number, reason))
+
+def detect_format(path):
+    """Input format from a file name, ignoring a trailing .gz."""
+    name = path.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    for format in FORMATS:
+        if name.endswith(f'.{format}'):
+            return format
+    return 'jsonl'
+
+def open_text(path):
+    """Open `path` for streaming text reads; '-' is stdin and .gz is decompressed on the fly."""
+    if path == '-':
+        return sys.stdin
+    if path.lower().endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+def read_rows(path, format):
+    """Yield one dict per record in the file (None for a JSONL line that isn't an object)."""
+    if format == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet import needs pyarrow: pip install pyarrow") from None
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=DEFAULT_CHUNK_SIZE):
+            yield from batch.to_pylist()
+        return
+
+    if format not in ('csv', 'jsonl'):
+        raise ValueError(f"Unsupported import format '{format}'. Use {', '.join(FORMATS)}.")
+    stream = open_text(path)
+    try:
+        if format == 'csv':
+            yield from csv.DictReader(stream)
+        else:
+            for line in stream:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    yield None
+                    continue
+                yield record if isinstance(record, dict) else None
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def columns_of(rows, fields):
+    return {field: [row.get(field) if row else None for row in rows] for field in fields}
+
+def text(value):
+    return value.strip() if isinstance(value, str) else value
+
+def company_directory(connection):
+    """(name -> id, set of ids) for every company; duplicate names resolve to the oldest."""
+    by_name, ids = {}, set()
+    for company_id, name in connection.execute(select(Company.id, Company._name).order_by(Company.id)):
+        ids.add(company_id)
+        if name is not None:
+            by_name.setdefault(name.strip().lower(), company_id)
+    return by_name, ids
+
+def company_values(numbered, report):
+    rows = [row for _, row in numbered]
+    columns = columns_of(rows, COMPANY_FIELDS)
+    result = validate_batch(Company, columns)
+    values = []
+    for position, (number, row) in enumerate(numbered):
+        if row is None:
+            report.reject(number, "Malformed record.")
+        elif result.invalid[position]:
+            report.reject(number, ' '.join(result.reasons(position)))
+        else:
+            values.append({field: text(columns[field][position]) for field in COMPANY_FIELDS})
+    return values
+
+def job_values(numbered, report, companies):
+    by_name, ids = companies
+    rows = [row for _, row in numbered]
+    columns = columns_of(rows, JOB_FIELDS + ('company', 'company_id'))
+    result = validate_batch(Job, {field: columns[field] for field in JOB_FIELDS})
+    values = []
+    for position, (number, row) in enumerate(numbered):
+        if row is None:
+            report.reject(number, "Malformed record.")
+            continue
+        if result.invalid[position]:
+            report.reject(number, ' '.join(result.reasons(position)))
+            continue
+
+        company_id, company = columns['company_id'][position], columns['company'][position]
+        if company_id not in (None, ''):
+            try:
+                company_id = int(company_id)
+            except (TypeError, ValueError):
+                report.reject(number, "company_id must be a valid numeric ID.")
+                continue
+            if company_id not in ids:
+                report.reject(number, f"Company {company_id} does not exist.")
+                continue
+        elif company:
+            company_id = by_name.get(str(company).strip().lower())
+            if company_id is None:
+                report.reject(number, f"Company '{company}' does not exist.")
+                continue
+        else:
+            report.reject(number, "Each job needs a company or company_id.")
+            continue
+
+        values.append({
+            'name': text(columns['name'][position]),
+            'description': text(columns['description'][position]),
+            'location': text(columns['location'][position]),
+            'salary': round(float(columns['salary'][position])),
+            'type': text(columns['type'][position]).lower(),
+            'company_id': company_id,
+        })
+    return values
+
+def import_rows(engine, model, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Validate and insert `rows` (dicts) into `model`'s table, one transaction per chunk.
+
+    `model` is Company or Job. Job rows name their company with either a
+    `company_id` or a `company` name. Returns an ImportReport.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    if model not in (Company, Job):
+        raise ValueError(f"Importing into '{model.__tablename__}' is not supported.")
+
+    report = ImportReport()
+    started = time.perf_counter()
+    companies = None
+    if model is Job:
+        with engine.connect() as connection:
+            companies = company_directory(connection)
+
+    numbered = enumerate(rows, start=1)
+    while True:
+        chunk = list(itertools.islice(numbered, chunk_size))
+        if not chunk:
+            break
+        report.received += len(chunk)
+        values = company_values(chunk, report) if model is Company else job_values(chunk, report, companies)
+        if values:
+            with engine.begin() as connection:
+                if model is Job:
+                    with deferred_job_indexing(connection):
+                        connection.execute(insert(model.__table__), values)
+                else:
+                    connection.execute(insert(model.__table__), values)
+            report.inserted += len(values)
+    report.seconds = time.perf_counter() - started
+    return report
+
+def import_file(engine, model, path, format=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream a CSV/JSONL/Parquet file (optionally .gz for the text formats) into `model`'s table."""
+    return import_rows(engine, model, read_rows(path, format or detect_format(path)), chunk_size=chunk_size)
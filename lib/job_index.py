@@ -0,0 +1,122 @@
+"""In-memory index for filtered job browsing in a long-lived process.
+
+Built once from a single SELECT, it answers salary-range and category
+filters without touching the database:
+
+- salaries are kept sorted (with the job positions in that order), so a
+  range is two binary searches (`searchsorted`) and a slice;
+- each contract type and location has a bitmap (one bit per job, packed
+  eight to a byte), so "any of these types" is an OR of a few bitmaps and
+  combining filters is an AND.
+
+Matches come back as job ids in ascending order, ready for keyset paging
+and for fetching the rows to display.
+"""
+import numpy as np
+
+from lib.matching import encode
+from lib.models import Job
+
+class JobIndex:
+    """Sorted salary column plus per-type and per-location bitmaps over all jobs."""
+
+    def __init__(self, ids, salary, type_codes, types, location_codes, locations, company_ids):
+        # positions are row numbers in id order
+        order = np.argsort(np.asarray(ids, dtype=np.int64), kind='stable')
+        self.ids = np.asarray(ids, dtype=np.int64)[order]
+        salary = np.asarray(salary, dtype=np.float64)[order]
+        # NaN (no salary) sorts last, after every finite bound
+        self.salary_order = np.argsort(salary, kind='stable')
+        self.sorted_salary = salary[self.salary_order]
+        self.company_ids = np.asarray(company_ids, dtype=np.int64)[order]
+        self.type_bitmaps = bitmaps(np.asarray(type_codes, dtype=np.int32)[order], types)
+        self.location_bitmaps = bitmaps(np.asarray(location_codes, dtype=np.int32)[order], locations)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, session):
+        """Build the index from the database with one SELECT."""
+        rows = session.query(Job.id, Job._salary, Job._type, Job._location, Job.company_id).order_by(Job.id).all()
+        ids, salaries, types, locations, company_ids = zip(*rows) if rows else ((),) * 5
+        type_codes, type_names = encode(types)
+        location_codes, location_names = encode(locations)
+        return cls(
+            ids,
+            [np.nan if salary is None else salary for salary in salaries],
+            type_codes, type_names,
+            location_codes, location_names,
+            [-1 if company_id is None else company_id for company_id in company_ids],
+        )
+
+    def salary_positions(self, min_salary=None, max_salary=None):
+        """Positions of jobs paid within [min_salary, max_salary], in salary order."""
+        low = 0 if min_salary is None else np.searchsorted(self.sorted_salary, min_salary, side='left')
+        if max_salary is None:
+            # everything with a salary, i.e. up to the trailing NaNs
+            high = np.searchsorted(self.sorted_salary, np.inf, side='right')
+        else:
+            high = np.searchsorted(self.sorted_salary, max_salary, side='right')
+        return self.salary_order[low:high]
+
+    def positions(self, min_salary=None, max_salary=None, types=(), locations=(), company_ids=()):
+        """Positions (ascending, so also in id order) of the jobs passing every given filter."""
+        if min_salary is not None and max_salary is not None and min_salary > max_salary:
+            raise ValueError("Minimum salary cannot be greater than maximum salary.")
+        size = len(self.ids)
+        packed = None
+        for index, values in ((self.type_bitmaps, [value.strip().lower() for value in types]),
+                              (self.location_bitmaps, list(locations))):
+            if values:
+                either = any_of(index, values, size)
+                packed = either if packed is None else packed & either
+
+        if min_salary is not None or max_salary is not None:
+            mask = np.zeros(size, dtype=bool)
+            mask[self.salary_positions(min_salary, max_salary)] = True
+            if packed is not None:
+                mask &= np.unpackbits(packed, count=size).view(bool)
+        elif packed is not None:
+            mask = np.unpackbits(packed, count=size).view(bool)
+        else:
+            mask = np.ones(size, dtype=bool)
+        positions = np.flatnonzero(mask)
+
+        # companies are too many for bitmaps; check only what is left
+        if company_ids:
+            wanted = np.asarray(list(company_ids), dtype=np.int64)
+            positions = positions[np.isin(self.company_ids[positions], wanted)]
+        return positions
+
+    def search(self, min_salary=None, max_salary=None, types=(), locations=(), company_ids=(), after_id=None, limit=None):
+        """Ids of matching jobs in ascending order, optionally after `after_id` and at most `limit`."""
+        ids = self.ids[self.positions(min_salary, max_salary, types, locations, company_ids)]
+        if after_id is not None:
+            ids = ids[np.searchsorted(ids, after_id, side='right'):]
+        return ids if limit is None else ids[:limit]
+
+    def count(self, min_salary=None, max_salary=None, types=(), locations=(), company_ids=()):
+        return len(self.positions(min_salary, max_salary, types, locations, company_ids))
+
+def bitmaps(codes, vocabulary):
+    """{value: packed bitmap of the positions whose code is that value's}."""
+    # one stable sort groups the positions of each code, instead of a full
+    # comparison pass per value
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(vocabulary) + 1))
+    result = {}
+    for code, value in enumerate(vocabulary):
+        bits = np.zeros(len(codes), dtype=bool)
+        bits[order[bounds[code]:bounds[code + 1]]] = True
+        result[value] = np.packbits(bits)
+    return result
+
+def any_of(index, values, size):
+    """OR of the bitmaps of `values`; values not in the index match nothing."""
+    packed = np.zeros((size + 7) // 8, dtype=np.uint8)
+    for value in values:
+        bitmap = index.get(value)
+        if bitmap is not None:
+            packed |= bitmap
+    return packed
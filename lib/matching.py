@@ -0,0 +1,229 @@
+"""Ranked job feed for applicants.
+
+Every job is reduced to a row of a feature matrix (salary plus integer codes
+for type, location and company industry). A feed scores all jobs at once
+with NumPy array operations and picks the top K with argpartition, so the
+cost per feed is a handful of vector passes rather than a Python loop over
+jobs. The matrix is kept between feeds (`job_features`) and reloaded only
+when the change feed shows a job or company changed.
+"""
+import numpy as np
+
+from lib.changes import database_now, has_changes
+from lib.models import Company, Job, Application
+
+# How much each past application status says about a user's taste
+STATUS_WEIGHTS = {
+    'applied': 0.5,
+    'interviewing': 1.0,
+    'offered': 1.5,
+    'accepted': 2.0,
+    'rejected': -1.0,
+}
+
+# Relative importance of each signal in the final score
+SALARY_WEIGHT = 2.0
+TYPE_WEIGHT = 1.5
+LOCATION_WEIGHT = 1.0
+INDUSTRY_WEIGHT = 1.0
+
+DEFAULT_TOP_K = 10
+
+def encode(values):
+    """Intern strings to integer codes; returns (codes, vocabulary). Missing values get -1."""
+    vocabulary = {}
+    codes = np.fromiter(
+        (-1 if value is None else vocabulary.setdefault(value, len(vocabulary)) for value in values),
+        dtype=np.int32,
+    )
+    return codes, list(vocabulary)
+
+class JobFeatures:
+    """Column arrays describing every job, aligned by position and sorted by id."""
+
+    def __init__(self, ids, salary, type_codes, types, location_codes, locations, industry_codes, industries):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.salary = np.asarray(salary, dtype=np.float64)
+        self.type_codes = np.asarray(type_codes, dtype=np.int32)
+        self.location_codes = np.asarray(location_codes, dtype=np.int32)
+        self.industry_codes = np.asarray(industry_codes, dtype=np.int32)
+        self.types = list(types)
+        self.locations = list(locations)
+        self.industries = list(industries)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, session):
+        """Build the matrix from the database with one SELECT."""
+        rows = (
+            session.query(Job.id, Job._salary, Job._type, Job._location, Company._industry)
+            .outerjoin(Company, Job.company_id == Company.id)
+            .order_by(Job.id)
+            .all()
+        )
+        ids, salaries, types, locations, industries = zip(*rows) if rows else ((),) * 5
+        type_codes, type_names = encode(types)
+        location_codes, location_names = encode(locations)
+        industry_codes, industry_names = encode(industries)
+        return cls(
+            ids,
+            [np.nan if salary is None else salary for salary in salaries],
+            type_codes, type_names,
+            location_codes, location_names,
+            industry_codes, industry_names,
+        )
+
+    def positions(self, job_ids):
+        """Row positions of `job_ids`, plus a mask of which ids were found at all."""
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        if not len(self.ids):
+            return job_ids[:0], np.zeros(len(job_ids), dtype=bool)
+        found = np.minimum(np.searchsorted(self.ids, job_ids), len(self.ids) - 1)
+        known = self.ids[found] == job_ids
+        return found[known], known
+
+class FeatureCache:
+    """The JobFeatures of the last database used, reloaded when it goes stale.
+
+    Each use asks the change feed (lib.changes) whether any job or company
+    changed or was deleted since the last load: two index probes instead of
+    reading every job. Anything at all triggers a full reload. Writes that
+    bypass `updated_at` (raw SQL) go unnoticed until then. On backends
+    without a delete feed every use reloads.
+    """
+
+    def __init__(self):
+        self.features = None
+        self.url = None
+        self.watermark = None
+        self.loads = 0
+        self.hits = 0
+
+    def get(self, session):
+        connection = session.connection()
+        url = str(connection.engine.url)
+        # taken before loading, so writes made during the load are seen as changes next time
+        now = database_now(connection)
+        if self.features is not None and url == self.url and self.fresh(connection):
+            self.watermark = now
+            self.hits += 1
+            return self.features
+        self.features = JobFeatures.load(session)
+        self.url, self.watermark = url, now
+        self.loads += 1
+        return self.features
+
+    def fresh(self, connection):
+        try:
+            # no upper bound: a write in the current second must not be missed
+            return not any(has_changes(connection, table, self.watermark) for table in ('jobs', 'companies'))
+        except ValueError:
+            return False
+
+    def clear(self):
+        self.features = None
+        self.url = None
+        self.watermark = None
+
+job_features = FeatureCache()
+
+class Preferences:
+    """Explicit filters an applicant can pass to the feed. All optional."""
+
+    def __init__(self, min_salary=None, max_salary=None, types=(), locations=(), industries=()):
+        if min_salary is not None and max_salary is not None and min_salary > max_salary:
+            raise ValueError("Minimum salary cannot be greater than maximum salary.")
+        self.min_salary = min_salary
+        self.max_salary = max_salary
+        self.types = [value.strip().lower() for value in types]
+        self.locations = list(locations)
+        self.industries = list(industries)
+
+def application_history(session, user_id):
+    """(job ids, status weights) of everything the user has applied to."""
+    rows = session.query(Application._job_id, Application._status).filter(Application._user_id == user_id).all()
+    job_ids = np.array([job_id for job_id, _ in rows], dtype=np.int64)
+    weights = np.array([STATUS_WEIGHTS.get(status, 0.0) for _, status in rows], dtype=np.float64)
+    return job_ids, weights
+
+def category_scores(codes, vocabulary, preferred, history_positions, history_weights):
+    """Per-job score for one categorical column.
+
+    Explicit preferences count 1.0. History adds the status-weighted share of
+    past applications that had the same value, so a category the user keeps
+    being rejected from drifts negative. The lookup table carries one extra
+    trailing slot so that code -1 (missing) scores 0.
+    """
+    table = np.zeros(len(vocabulary) + 1)
+    lookup = {value: code for code, value in enumerate(vocabulary)}
+    for value in preferred:
+        if value in lookup:
+            table[lookup[value]] += 1.0
+
+    if len(history_positions):
+        affinity = np.zeros(len(vocabulary) + 1)
+        np.add.at(affinity, codes[history_positions], history_weights)
+        affinity[-1] = 0.0
+        table += affinity / np.abs(history_weights).sum()
+
+    return table[codes]
+
+def salary_scores(salary, low, high):
+    """1.0 inside [low, high], falling off linearly with the relative distance outside it."""
+    scores = np.ones_like(salary)
+    if low is not None:
+        below = salary < low
+        scores[below] = 1.0 - (low - salary[below]) / max(low, 1)
+    if high is not None:
+        above = salary > high
+        scores[above] = 1.0 - (salary[above] - high) / max(high, 1)
+    scores[np.isnan(salary)] = 0.0
+    return np.clip(scores, -1.0, 1.0)
+
+def rank_jobs(features, preferences, history_job_ids=(), history_weights=(), top_k=DEFAULT_TOP_K):
+    """Score every job the user hasn't applied to and return the best `top_k`.
+
+    Returns a list of (job id, score), best first.
+    """
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1.")
+    if not len(features):
+        return []
+
+    history_positions, known = features.positions(history_job_ids)
+    history_weights = np.asarray(history_weights, dtype=np.float64)[known]
+
+    low, high = preferences.min_salary, preferences.max_salary
+    liked = history_positions[history_weights > 0]
+    if low is None and high is None and len(liked):
+        liked_salaries = features.salary[liked]
+        liked_salaries = liked_salaries[~np.isnan(liked_salaries)]
+        if len(liked_salaries):
+            low, high = float(liked_salaries.min()), float(liked_salaries.max())
+
+    scores = (
+        SALARY_WEIGHT * salary_scores(features.salary, low, high)
+        + TYPE_WEIGHT * category_scores(features.type_codes, features.types, preferences.types, history_positions, history_weights)
+        + LOCATION_WEIGHT * category_scores(features.location_codes, features.locations, preferences.locations, history_positions, history_weights)
+        + INDUSTRY_WEIGHT * category_scores(features.industry_codes, features.industries, preferences.industries, history_positions, history_weights)
+    )
+    scores[history_positions] = -np.inf
+
+    candidates = int(np.count_nonzero(np.isfinite(scores)))
+    k = min(top_k, candidates)
+    if k == 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return [(int(features.ids[i]), float(scores[i])) for i in top]
+
+def job_feed(session, user_id, preferences=None, top_k=DEFAULT_TOP_K, features=None):
+    """Top `top_k` unapplied jobs for `user_id`, as (job id, score) pairs.
+
+    Without `features`, the cached matrix (`job_features`) is used.
+    """
+    features = features if features is not None else job_features.get(session)
+    job_ids, weights = application_history(session, user_id)
+    return rank_jobs(features, preferences or Preferences(), job_ids, weights, top_k=top_k)
@@ -14,6 +14,10 @@ from lib.models import User, Company, Job, Application
 # access to the values within the .ini file in use.
 config = context.config
 
+# SWIPEMATCH_DATABASE_URL (see lib/db.py) takes precedence over alembic.ini
+if os.environ.get('SWIPEMATCH_DATABASE_URL'):
+    config.set_main_option('sqlalchemy.url', os.environ['SWIPEMATCH_DATABASE_URL'].replace('%', '%%'))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
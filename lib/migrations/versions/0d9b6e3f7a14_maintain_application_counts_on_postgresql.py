@@ -0,0 +1,77 @@
+"""Maintain application counts on PostgreSQL
+
+Revision ID: 0d9b6e3f7a14
+Revises: f4a7c2e9b318
+Create Date: 2026-10-18 21:37:52.614083
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0d9b6e3f7a14'
+down_revision = 'f4a7c2e9b318'
+branch_labels = None
+depends_on = None
+
+STATUSES = ('applied', 'interviewing', 'rejected', 'offered', 'accepted')
+SUMMARIES = (('job_application_counts', 'job_id'), ('user_application_counts', 'user_id'))
+TRIGGERS = (
+    ('application_counts_after_insert', 'INSERT'),
+    ('application_counts_after_delete', 'DELETE'),
+    ('application_counts_after_update', 'UPDATE OF status, job_id, user_id, date'),
+)
+
+
+def open_since(row=None):
+    prefix = f"{row}." if row else ""
+    return (f"CASE WHEN {prefix}status IN ('applied', 'interviewing') "
+            f"THEN COALESCE(EXTRACT(EPOCH FROM {prefix}date) / 86400 + 2440587.5, 0) ELSE 0 END")
+
+
+def add(table, key):
+    flags = ', '.join(f"CASE WHEN new.status = '{status}' THEN 1 ELSE 0 END" for status in STATUSES)
+    updates = ', '.join(f"{status} = {table}.{status} + excluded.{status}" for status in STATUSES)
+    return (f"INSERT INTO {table} ({key}, {', '.join(STATUSES)}, total, open_since_sum) "
+            f"SELECT new.{key}, {flags}, 1, {open_since('new')} WHERE new.{key} IS NOT NULL "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}, total = {table}.total + 1, "
+            f"open_since_sum = {table}.open_since_sum + excluded.open_since_sum;")
+
+
+def remove(table, key):
+    updates = ', '.join(f"{status} = {status} - CASE WHEN old.status = '{status}' THEN 1 ELSE 0 END" for status in STATUSES)
+    return (f"UPDATE {table} SET {updates}, total = total - 1, "
+            f"open_since_sum = open_since_sum - {open_since('old')} WHERE {key} = old.{key};")
+
+
+def upgrade() -> None:
+    # SQLite has had its counter triggers since e41a7c5b9d03
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    removes = ' '.join(remove(table, key) for table, key in SUMMARIES)
+    adds = ' '.join(add(table, key) for table, key in SUMMARIES)
+    op.execute("CREATE OR REPLACE FUNCTION maintain_application_counts() RETURNS trigger AS $$ BEGIN "
+               f"IF TG_OP <> 'INSERT' THEN {removes} END IF; "
+               f"IF TG_OP <> 'DELETE' THEN {adds} END IF; "
+               "RETURN NULL; END $$ LANGUAGE plpgsql")
+    for name, event in TRIGGERS:
+        op.execute(f"CREATE TRIGGER {name} AFTER {event} ON applications "
+                   f"FOR EACH ROW EXECUTE FUNCTION maintain_application_counts()")
+
+    # nothing maintained the tables until now, so recount them
+    sums = ', '.join(f"SUM(CASE WHEN status = '{status}' THEN 1 ELSE 0 END)" for status in STATUSES)
+    for table, key in SUMMARIES:
+        op.execute(f"DELETE FROM {table}")
+        op.execute(f"""
+            INSERT INTO {table} ({key}, {', '.join(STATUSES)}, total, open_since_sum)
+            SELECT {key}, {sums}, COUNT(*), SUM({open_since()}) FROM applications
+            WHERE {key} IS NOT NULL GROUP BY {key}
+        """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, _ in reversed(TRIGGERS):
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON applications")
+    op.execute("DROP FUNCTION IF EXISTS maintain_application_counts()")
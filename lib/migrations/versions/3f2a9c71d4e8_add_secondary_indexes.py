@@ -0,0 +1,35 @@
+"""Add secondary indexes
+
+Revision ID: 3f2a9c71d4e8
+Revises: bc1d36456021
+Create Date: 2026-10-18 09:12:40.518312
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c71d4e8'
+down_revision = 'bc1d36456021'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_applications_user_id', 'applications', ['user_id'])
+    # (job_id, status) also serves lookups on job_id alone, so no separate job_id index
+    op.create_index('ix_applications_job_id_status', 'applications', ['job_id', 'status'])
+    op.create_index('ix_jobs_company_id', 'jobs', ['company_id'])
+    op.create_index('ix_jobs_type', 'jobs', ['type'])
+    op.create_index('ix_jobs_location', 'jobs', ['location'])
+    op.create_index('ix_jobs_salary', 'jobs', ['salary'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_salary', table_name='jobs')
+    op.drop_index('ix_jobs_location', table_name='jobs')
+    op.drop_index('ix_jobs_type', table_name='jobs')
+    op.drop_index('ix_jobs_company_id', table_name='jobs')
+    op.drop_index('ix_applications_job_id_status', table_name='applications')
+    op.drop_index('ix_applications_user_id', table_name='applications')
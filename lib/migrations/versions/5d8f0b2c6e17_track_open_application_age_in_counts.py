@@ -0,0 +1,84 @@
+"""Track open application age in count summaries
+
+Revision ID: 5d8f0b2c6e17
+Revises: e41a7c5b9d03
+Create Date: 2026-10-18 15:03:48.226590
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d8f0b2c6e17'
+down_revision = 'e41a7c5b9d03'
+branch_labels = None
+depends_on = None
+
+STATUSES = ('applied', 'interviewing', 'rejected', 'offered', 'accepted')
+SUMMARIES = (('job_application_counts', 'job_id'), ('user_application_counts', 'user_id'))
+TRIGGERS = ('application_counts_after_insert', 'application_counts_after_delete', 'application_counts_after_update')
+
+
+def open_since(row=None):
+    prefix = f"{row}." if row else ""
+    return f"CASE WHEN {prefix}status IN ('applied', 'interviewing') THEN IFNULL(julianday({prefix}date), 0) ELSE 0 END"
+
+
+def add(table, key, tracked):
+    flags = ', '.join(f"new.status IS '{status}'" for status in STATUSES)
+    updates = ', '.join(f"{status} = {status} + excluded.{status}" for status in STATUSES)
+    if not tracked:
+        return (f"INSERT INTO {table} ({key}, {', '.join(STATUSES)}, total) "
+                f"SELECT new.{key}, {flags}, 1 WHERE new.{key} IS NOT NULL "
+                f"ON CONFLICT ({key}) DO UPDATE SET {updates}, total = total + 1;")
+    return (f"INSERT INTO {table} ({key}, {', '.join(STATUSES)}, total, open_since_sum) "
+            f"SELECT new.{key}, {flags}, 1, {open_since('new')} WHERE new.{key} IS NOT NULL "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}, total = total + 1, "
+            f"open_since_sum = open_since_sum + excluded.open_since_sum;")
+
+
+def remove(table, key, tracked):
+    updates = ', '.join(f"{status} = {status} - (old.status IS '{status}')" for status in STATUSES)
+    since = f", open_since_sum = open_since_sum - {open_since('old')}" if tracked else ""
+    return f"UPDATE {table} SET {updates}, total = total - 1{since} WHERE {key} = old.{key};"
+
+
+def create_triggers(tracked):
+    adds = ' '.join(add(table, key, tracked) for table, key in SUMMARIES)
+    removes = ' '.join(remove(table, key, tracked) for table, key in SUMMARIES)
+    columns = "status, job_id, user_id, date" if tracked else "status, job_id, user_id"
+    op.execute(f"CREATE TRIGGER application_counts_after_insert AFTER INSERT ON applications BEGIN {adds} END")
+    op.execute(f"CREATE TRIGGER application_counts_after_delete AFTER DELETE ON applications BEGIN {removes} END")
+    op.execute(f"CREATE TRIGGER application_counts_after_update AFTER UPDATE OF {columns} ON applications "
+               f"BEGIN {removes} {adds} END")
+
+
+def upgrade() -> None:
+    for table, _ in SUMMARIES:
+        op.add_column(table, sa.Column('open_since_sum', sa.Float(), nullable=False, server_default='0'))
+
+    # the sums are only maintained (and only computable with julianday) on SQLite
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for table, key in SUMMARIES:
+        op.execute(f"""
+            UPDATE {table} SET open_since_sum = (
+                SELECT IFNULL(SUM({open_since()}), 0) FROM applications WHERE applications.{key} = {table}.{key}
+            )
+        """)
+    create_triggers(tracked=True)
+
+
+def downgrade() -> None:
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    if sqlite:
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for table, _ in SUMMARIES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('open_since_sum')
+    if sqlite:
+        create_triggers(tracked=False)
@@ -0,0 +1,78 @@
+"""Add job full-text search
+
+Revision ID: 9c4e1b7a2f60
+Revises: 3f2a9c71d4e8
+Create Date: 2026-10-18 10:41:07.204519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e1b7a2f60'
+down_revision = '3f2a9c71d4e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite FTS5 table plus the triggers that keep it in sync with jobs/companies
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("""
+        CREATE VIRTUAL TABLE jobs_fts USING fts5(
+            name, description, location, company,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER jobs_fts_after_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, name, description, location, company)
+            VALUES (new.id, new.name, new.description, new.location,
+                    (SELECT name FROM companies WHERE id = new.company_id));
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER jobs_fts_after_update
+        AFTER UPDATE OF id, name, description, location, company_id ON jobs BEGIN
+            DELETE FROM jobs_fts WHERE rowid = old.id;
+            INSERT INTO jobs_fts (rowid, name, description, location, company)
+            VALUES (new.id, new.name, new.description, new.location,
+                    (SELECT name FROM companies WHERE id = new.company_id));
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER jobs_fts_after_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM jobs_fts WHERE rowid = old.id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER companies_fts_after_update AFTER UPDATE OF name ON companies BEGIN
+            UPDATE jobs_fts SET company = new.name
+            WHERE rowid IN (SELECT id FROM jobs WHERE company_id = new.id);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER companies_fts_after_delete AFTER DELETE ON companies BEGIN
+            UPDATE jobs_fts SET company = NULL
+            WHERE rowid IN (SELECT id FROM jobs WHERE company_id = old.id);
+        END
+    """)
+    # Index the jobs that already exist
+    op.execute("""
+        INSERT INTO jobs_fts (rowid, name, description, location, company)
+        SELECT jobs.id, jobs.name, jobs.description, jobs.location, companies.name
+        FROM jobs LEFT JOIN companies ON companies.id = jobs.company_id
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS companies_fts_after_delete")
+    op.execute("DROP TRIGGER IF EXISTS companies_fts_after_update")
+    op.execute("DROP TRIGGER IF EXISTS jobs_fts_after_delete")
+    op.execute("DROP TRIGGER IF EXISTS jobs_fts_after_update")
+    op.execute("DROP TRIGGER IF EXISTS jobs_fts_after_insert")
+    op.execute("DROP TABLE IF EXISTS jobs_fts")
@@ -0,0 +1,66 @@
+"""Cascade deletes to jobs and applications
+
+Revision ID: a2c6f4e8d151
+Revises: 5d8f0b2c6e17
+Create Date: 2026-10-18 16:41:09.517342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2c6f4e8d151'
+down_revision = '5d8f0b2c6e17'
+branch_labels = None
+depends_on = None
+
+# (table, column, parent table). Databases built by these migrations have
+# fk_<table>_<column>_<parent> on jobs and no constraints on applications
+# (bc1d36456021 rebuilt it without them); create_all leaves them unnamed.
+FOREIGN_KEYS = (
+    ('jobs', 'company_id', 'companies'),
+    ('applications', 'user_id', 'users'),
+    ('applications', 'job_id', 'jobs'),
+)
+# names reflected unnamed SQLite constraints the same way
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def replace_foreign_keys(ondelete):
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        for table, column, parent in FOREIGN_KEYS:
+            name = f'fk_{table}_{column}_{parent}'
+            op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}')
+            op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_{column}_fkey')
+            op.create_foreign_key(name, table, parent, [column], ['id'], ondelete=ondelete)
+        return
+
+    # SQLite can only change a foreign key by rebuilding the table. Triggers
+    # on (or mentioning) the rebuilt tables would be dropped or break the
+    # rename, so every trigger is set aside and recreated afterwards.
+    triggers = bind.exec_driver_sql("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").all()
+    for name, _ in triggers:
+        op.execute(f"DROP TRIGGER {name}")
+    inspector = sa.inspect(bind)
+    for table in ('jobs', 'applications'):
+        existing = {tuple(fk['constrained_columns']) for fk in inspector.get_foreign_keys(table)}
+        with op.batch_alter_table(table, recreate='always', naming_convention=NAMING_CONVENTION) as batch_op:
+            for child, column, parent in FOREIGN_KEYS:
+                if child != table:
+                    continue
+                name = f'fk_{table}_{column}_{parent}'
+                if (column,) in existing:
+                    batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, parent, [column], ['id'], ondelete=ondelete)
+    for _, sql in triggers:
+        op.execute(sql)
+
+
+def upgrade() -> None:
+    replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    replace_foreign_keys(None)
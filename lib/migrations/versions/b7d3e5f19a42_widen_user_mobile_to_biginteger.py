@@ -0,0 +1,29 @@
+"""Widen users.mobile to BigInteger
+
+Revision ID: b7d3e5f19a42
+Revises: 9c4e1b7a2f60
+Create Date: 2026-10-18 13:05:52.877140
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e5f19a42'
+down_revision = '9c4e1b7a2f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite stores both as INTEGER already; server databases need the wider type
+    if op.get_bind().dialect.name == 'sqlite':
+        return
+    op.alter_column('users', 'mobile', existing_type=sa.Integer(), type_=sa.BigInteger())
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        return
+    op.alter_column('users', 'mobile', existing_type=sa.BigInteger(), type_=sa.Integer())
@@ -0,0 +1,82 @@
+"""Unique application per user and job
+
+Revision ID: c83e1f6a4b27
+Revises: a2c6f4e8d151
+Create Date: 2026-10-18 17:26:52.681045
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c83e1f6a4b27'
+down_revision = 'a2c6f4e8d151'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 10000
+
+
+def remove_duplicates(bind):
+    """Keep the oldest application of each (user_id, job_id), with the newest one's status.
+
+    Streams the table ordered by pair and then ID, so only the current pair
+    is held in memory; the rows to change are applied once the read is done.
+    """
+    # per statement: Connection.execution_options() would change the migration's
+    # connection and stream (server-side cursor) every statement after this one
+    rows = bind.execute(sa.text(
+        "SELECT id, user_id, job_id, status FROM applications "
+        "WHERE user_id IS NOT NULL AND job_id IS NOT NULL ORDER BY user_id, job_id, id"
+    ), execution_options={'yield_per': BATCH_SIZE})
+    doomed, statuses = [], []
+    pair = keep = None
+    for id, user_id, job_id, status in rows:
+        if (user_id, job_id) != pair:
+            pair, keep, kept_status = (user_id, job_id), id, status
+            continue
+        doomed.append(id)
+        if status != kept_status:
+            statuses.append({'id': keep, 'status': status})
+            kept_status = status
+    rows.close()
+
+    for start in range(0, len(doomed), BATCH_SIZE):
+        bind.execute(sa.text("DELETE FROM applications WHERE id IN :ids").bindparams(sa.bindparam('ids', expanding=True)),
+                     {'ids': doomed[start:start + BATCH_SIZE]})
+    # a keeper may be listed several times; executemany applies them in order
+    if statuses:
+        bind.execute(sa.text("UPDATE applications SET status = :status WHERE id = :id"), statuses)
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        # no rows to stream in a SQL script: the same rule, set-based
+        op.execute("""
+            UPDATE applications SET status = (
+                SELECT newest.status FROM applications newest
+                WHERE newest.user_id = applications.user_id AND newest.job_id = applications.job_id
+                ORDER BY newest.id DESC LIMIT 1
+            )
+            WHERE id IN (
+                SELECT MIN(id) FROM applications
+                WHERE user_id IS NOT NULL AND job_id IS NOT NULL
+                GROUP BY user_id, job_id HAVING COUNT(*) > 1
+            )
+        """)
+        op.execute("""
+            DELETE FROM applications
+            WHERE user_id IS NOT NULL AND job_id IS NOT NULL
+              AND id NOT IN (SELECT MIN(id) FROM applications GROUP BY user_id, job_id)
+        """)
+    else:
+        remove_duplicates(op.get_bind())
+    op.create_index('ix_applications_user_id_job_id', 'applications', ['user_id', 'job_id'], unique=True)
+    # user_id is the unique index's leading column, so it serves user_id lookups too
+    op.drop_index('ix_applications_user_id', table_name='applications')
+
+
+def downgrade() -> None:
+    op.create_index('ix_applications_user_id', 'applications', ['user_id'])
+    op.drop_index('ix_applications_user_id_job_id', table_name='applications')
@@ -0,0 +1,67 @@
+"""Add application count summaries
+
+Revision ID: e41a7c5b9d03
+Revises: b7d3e5f19a42
+Create Date: 2026-10-18 14:22:31.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41a7c5b9d03'
+down_revision = 'b7d3e5f19a42'
+branch_labels = None
+depends_on = None
+
+STATUSES = ('applied', 'interviewing', 'rejected', 'offered', 'accepted')
+SUMMARIES = (('job_application_counts', 'job_id', 'jobs'), ('user_application_counts', 'user_id', 'users'))
+
+
+def add(table, key):
+    flags = ', '.join(f"new.status IS '{status}'" for status in STATUSES)
+    updates = ', '.join(f"{status} = {status} + excluded.{status}" for status in STATUSES)
+    return (f"INSERT INTO {table} ({key}, {', '.join(STATUSES)}, total) "
+            f"SELECT new.{key}, {flags}, 1 WHERE new.{key} IS NOT NULL "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}, total = total + 1;")
+
+
+def remove(table, key):
+    updates = ', '.join(f"{status} = {status} - (old.status IS '{status}')" for status in STATUSES)
+    return f"UPDATE {table} SET {updates}, total = total - 1 WHERE {key} = old.{key};"
+
+
+def upgrade() -> None:
+    for table, key, parent in SUMMARIES:
+        op.create_table(
+            table,
+            sa.Column(key, sa.Integer(), sa.ForeignKey(f'{parent}.id', name=f'fk_{table}_{key}_{parent}', ondelete='CASCADE'), primary_key=True),
+            *(sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in STATUSES + ('total',)),
+        )
+        sums = ', '.join(f"SUM(CASE WHEN status = '{status}' THEN 1 ELSE 0 END)" for status in STATUSES)
+        op.execute(f"""
+            INSERT INTO {table} ({key}, {', '.join(STATUSES)}, total)
+            SELECT {key}, {sums}, COUNT(*) FROM applications
+            WHERE {key} IS NOT NULL GROUP BY {key}
+        """)
+
+    # counters are kept current by triggers on SQLite only
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("CREATE TRIGGER application_counts_after_insert AFTER INSERT ON applications BEGIN "
+               + ' '.join(add(table, key) for table, key, _ in SUMMARIES) + " END")
+    op.execute("CREATE TRIGGER application_counts_after_delete AFTER DELETE ON applications BEGIN "
+               + ' '.join(remove(table, key) for table, key, _ in SUMMARIES) + " END")
+    op.execute("CREATE TRIGGER application_counts_after_update AFTER UPDATE OF status, job_id, user_id ON applications BEGIN "
+               + ' '.join(remove(table, key) for table, key, _ in SUMMARIES) + ' '
+               + ' '.join(add(table, key) for table, key, _ in SUMMARIES) + " END")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS application_counts_after_update")
+        op.execute("DROP TRIGGER IF EXISTS application_counts_after_delete")
+        op.execute("DROP TRIGGER IF EXISTS application_counts_after_insert")
+    op.drop_table('user_application_counts')
+    op.drop_table('job_application_counts')
@@ -0,0 +1,62 @@
+"""Track changes with updated_at and tombstones
+
+Revision ID: f4a7c2e9b318
+Revises: c83e1f6a4b27
+Create Date: 2026-10-18 19:04:15.227390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a7c2e9b318'
+down_revision = 'c83e1f6a4b27'
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'companies', 'jobs')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # rows never updated had no updated_at; the feed starts them at creation
+        op.execute(f"UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL")
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'])
+
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('record_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_tombstones_table_name_deleted_at', 'tombstones', ['table_name', 'deleted_at'])
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for table in TABLES:
+            op.execute(f"CREATE TRIGGER {table}_tombstone_after_delete AFTER DELETE ON {table} BEGIN "
+                       f"INSERT INTO tombstones (table_name, record_id) VALUES ('{table}', old.id); END")
+    elif dialect == 'postgresql':
+        op.execute("CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$ BEGIN "
+                   "INSERT INTO tombstones (table_name, record_id) VALUES (TG_TABLE_NAME, old.id); "
+                   "RETURN NULL; END $$ LANGUAGE plpgsql")
+        for table in TABLES:
+            op.execute(f"CREATE TRIGGER {table}_tombstone_after_delete AFTER DELETE ON {table} "
+                       f"FOR EACH ROW EXECUTE FUNCTION record_tombstone()")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for table in reversed(TABLES):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstone_after_delete")
+    elif dialect == 'postgresql':
+        for table in reversed(TABLES):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstone_after_delete ON {table}")
+        op.execute("DROP FUNCTION IF EXISTS record_tombstone()")
+    op.drop_index('ix_tombstones_table_name_deleted_at', table_name='tombstones')
+    op.drop_table('tombstones')
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
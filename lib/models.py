@@ -1,11 +1,17 @@
-from sqlalchemy import create_engine
-from sqlalchemy import ForeignKey, Column, Integer, String, func, CheckConstraint, UniqueConstraint, DateTime 
+from sqlalchemy import ForeignKey, Column, Integer, BigInteger, Float, String, func, CheckConstraint, UniqueConstraint, DateTime, Index
+from sqlalchemy import event
 from sqlalchemy.orm import relationship, backref
 from lib.base import Base
+from lib import validators
 from datetime import datetime
-import re
 
-engine = create_engine('sqlite:///swipe_match_hired.db')
+def __getattr__(name):
+    # The engine used to be created at import time; it now lives in lib.db and is
+    # only created when first requested.
+    if name == 'engine':
+        from lib.db import get_engine
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # user
 class User(Base):
@@ -17,12 +23,16 @@ class User(Base):
     id = Column(Integer, primary_key=True)
     _name = Column("name", String)
     _email = Column("email", String)
-    _mobile = Column("mobile", Integer)
+    # 10-digit numbers overflow a 32-bit INTEGER on server databases
+    _mobile = Column("mobile", BigInteger)
     _role = Column("role", String)
     created_at = Column(DateTime(), server_default=func.now())
-    updated_at = Column(DateTime(), onupdate=func.now())
+    # stamped on insert too, and indexed, for the change feed in lib/changes.py
+    updated_at = Column(DateTime(), default=func.now(), onupdate=func.now(), index=True)
     
-    applications = relationship("Application", back_populates="user")
+    # the database deletes a user's applications (ON DELETE CASCADE); the ORM
+    # only deletes the ones already loaded instead of fetching the rest
+    applications = relationship("Application", back_populates="user", cascade="all, delete", passive_deletes=True)
     
     def __repr__(self):
         return f'User(id={self.id}, ' + \
@@ -35,9 +45,7 @@ class User(Base):
 
     @name.setter
     def name(self, value):
-        if not value or not value.strip():
-            raise ValueError("Name cannot be empty.")
-        self._name = value.strip()
+        self._name = validators.required_text(value, "Name")
 
     @property
     def email(self):
@@ -45,12 +53,7 @@ class User(Base):
 
     @email.setter
     def email(self, value):
-        if not value or not isinstance(value, str):
-            raise ValueError("Email must be a non-empty string.")
-        email_regex = r'^\S+@\S+\.\S+$'
-        if not re.match(email_regex, value):
-            raise ValueError("Invalid email format.")
-        self._email = value
+        self._email = validators.email(value)
 
     @property
     def mobile(self):
@@ -58,12 +61,7 @@ class User(Base):
 
     @mobile.setter
     def mobile(self, value):
-        print(len(str(value)))
-        if not isinstance(int(value),int):
-            raise ValueError("Mobile must be a valid number. Use format 759233322")
-        if len(str(value)) < 9:
-            raise ValueError("Mobile must be a valid number with at least 10 digits. Use format 759233322")
-        self._mobile = int(value)
+        self._mobile = validators.mobile(value)
 
     @property
     def role(self):
@@ -71,10 +69,7 @@ class User(Base):
 
     @role.setter
     def role(self, value):
-        print(value)
-        if value not in ['applicant', 'employer']:
-            raise ValueError("Role must be either 'applicant' or 'employer'.")
-        self._role = value
+        self._role = validators.role(value)
         
 # company
 class Company(Base):
@@ -85,9 +80,10 @@ class Company(Base):
     _industry = Column("industry", String())
     _website = Column("website", String())
     created_at = Column(DateTime(), server_default=func.now())
-    updated_at = Column(DateTime(), onupdate=func.now())
+    # stamped on insert too, and indexed, for the change feed in lib/changes.py
+    updated_at = Column(DateTime(), default=func.now(), onupdate=func.now(), index=True)
     
-    jobs = relationship('Job', back_populates='company')
+    jobs = relationship('Job', back_populates='company', cascade="all, delete", passive_deletes=True)
     
     def __repr__(self):
         return f'Company(id={self.id}, ' + \
@@ -100,9 +96,7 @@ class Company(Base):
 
     @name.setter
     def name(self, value):
-        if not value or not value.strip():
-            raise ValueError("Company name cannot be empty.")
-        self._name = value.strip()
+        self._name = validators.required_text(value, "Company name")
 
     # Industry validation
     @property
@@ -111,9 +105,7 @@ class Company(Base):
 
     @industry.setter
     def industry(self, value):
-        if not value or not value.strip():
-            raise ValueError("Industry cannot be empty.")
-        self._industry = value.strip()
+        self._industry = validators.required_text(value, "Industry")
 
     # Website validation
     @property
@@ -122,11 +114,7 @@ class Company(Base):
 
     @website.setter
     def website(self, value):
-        if not value or not value.strip():
-            raise ValueError("Website cannot be empty.")
-        if not value.startswith("http://") and not value.startswith("https://"):
-            raise ValueError("Website must start with http:// or https://")
-        self._website = value.strip()
+        self._website = validators.website(value)
       
 # # job
 class Job(Base):
@@ -134,17 +122,18 @@ class Job(Base):
 
     id = Column(Integer, primary_key=True)
     _name = Column("name", String)
-    _location = Column("location", String)
+    _location = Column("location", String, index=True)
     _description = Column("description", String)
-    _salary = Column("salary",Integer)
-    _type = Column("type", String)
+    _salary = Column("salary",Integer, index=True)
+    _type = Column("type", String, index=True)
     created_at = Column(DateTime(), server_default=func.now())
-    updated_at = Column(DateTime(), onupdate=func.now())
+    # stamped on insert too, and indexed, for the change feed in lib/changes.py
+    updated_at = Column(DateTime(), default=func.now(), onupdate=func.now(), index=True)
     
-    company_id = Column(Integer, ForeignKey('companies.id'))
+    company_id = Column(Integer, ForeignKey('companies.id', ondelete='CASCADE'), index=True)
 
     company = relationship("Company", back_populates="jobs")
-    applications = relationship("Application", back_populates="job")
+    applications = relationship("Application", back_populates="job", cascade="all, delete", passive_deletes=True)
     
     def __repr__(self):
         return f'Job(id={self.id}, ' + \
@@ -156,9 +145,7 @@ class Job(Base):
 
     @name.setter
     def name(self, value):
-        if not value or not value.strip():
-            raise ValueError("Job name cannot be empty.")
-        self._name = value.strip()
+        self._name = validators.required_text(value, "Job name")
 
     @property
     def location(self):
@@ -166,9 +153,7 @@ class Job(Base):
 
     @location.setter
     def location(self, value):
-        if not value or not value.strip():
-            raise ValueError("Job location cannot be empty.")
-        self._location = value.strip()
+        self._location = validators.required_text(value, "Job location")
 
     @property
     def description(self):
@@ -176,9 +161,7 @@ class Job(Base):
 
     @description.setter
     def description(self, value):
-        if not value or not value.strip():
-            raise ValueError("Job description cannot be empty.")
-        self._description = value.strip()
+        self._description = validators.required_text(value, "Job description")
 
     @property
     def type(self):
@@ -186,11 +169,7 @@ class Job(Base):
 
     @type.setter
     def type(self, value):
-        allowed_types = ['full-time', 'part-time', 'contract', 'internship']
-        value = value.strip().lower()
-        if value not in allowed_types:
-            raise ValueError(f"Job type must be one of: {', '.join(allowed_types)}.")
-        self._type = value
+        self._type = validators.job_type(value)
 
     @property
     def salary(self):
@@ -198,18 +177,23 @@ class Job(Base):
 
     @salary.setter
     def salary(self, value):
-        if not isinstance(value, (int, float)) or value < 0:
-            raise ValueError("Salary must be a positive number.")
-        self._salary = value
+        self._salary = validators.salary(value)
 
 # # application
 
 class Application(Base):
     __tablename__ = 'applications'
+    __table_args__ = (
+        # Leading job_id also serves plain per-job lookups
+        Index('ix_applications_job_id_status', 'job_id', 'status'),
+        # one application per user and job; repeat swipes upsert onto it. Leading
+        # user_id also serves plain per-user lookups
+        Index('ix_applications_user_id_job_id', 'user_id', 'job_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
-    _user_id = Column("user_id", Integer, ForeignKey('users.id'))
-    _job_id = Column("job_id", Integer, ForeignKey('jobs.id'))
+    _user_id = Column("user_id", Integer, ForeignKey('users.id', ondelete='CASCADE'))
+    _job_id = Column("job_id", Integer, ForeignKey('jobs.id', ondelete='CASCADE'))
     _status = Column("status", String)
     date = Column(DateTime(), server_default=func.now())
 
@@ -226,9 +210,7 @@ class Application(Base):
 
     @user_id.setter
     def user_id(self, value):
-        if not value or not str(value).isdigit():
-            raise ValueError("user_id must be a valid numeric ID.")
-        self._user_id = int(value)
+        self._user_id = validators.numeric_id(value, "user_id")
 
     # job_id property
     @property
@@ -237,9 +219,7 @@ class Application(Base):
 
     @job_id.setter
     def job_id(self, value):
-        if not value or not str(value).isdigit():
-            raise ValueError("job_id must be a valid numeric ID.")
-        self._job_id = int(value)
+        self._job_id = validators.numeric_id(value, "job_id")
 
     # status property
     @property
@@ -248,12 +228,84 @@ class Application(Base):
 
     @status.setter
     def status(self, value):
-        allowed = ['applied', 'interviewing', 'rejected', 'offered', 'accepted']
-        if not value or value.lower() not in allowed:
-            raise ValueError(f"Status must be one of: {', '.join(allowed)}")
-        self._status = value.lower()
+        self._status = validators.status(value)
     
 
+# application counts, maintained by the triggers in lib/counters.py
+class ApplicationCountsMixin:
+    applied = Column(Integer, nullable=False, server_default='0')
+    interviewing = Column(Integer, nullable=False, server_default='0')
+    rejected = Column(Integer, nullable=False, server_default='0')
+    offered = Column(Integer, nullable=False, server_default='0')
+    accepted = Column(Integer, nullable=False, server_default='0')
+    total = Column(Integer, nullable=False, server_default='0')
+    # sum of julianday(date) over applications still applied/interviewing,
+    # so their average age is one subtraction away
+    open_since_sum = Column(Float, nullable=False, server_default='0')
+
+class JobApplicationCounts(ApplicationCountsMixin, Base):
+    __tablename__ = 'job_application_counts'
+
+    job_id = Column(Integer, ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+
+    def __repr__(self):
+        return f'JobApplicationCounts(job_id={self.job_id}, total={self.total})'
+
+class UserApplicationCounts(ApplicationCountsMixin, Base):
+    __tablename__ = 'user_application_counts'
+
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+
+    def __repr__(self):
+        return f'UserApplicationCounts(user_id={self.user_id}, total={self.total})'
+
+# ids of deleted users, companies and jobs, recorded by the triggers in lib/changes.py
+class Tombstone(Base):
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        Index('ix_tombstones_table_name_deleted_at', 'table_name', 'deleted_at'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String, nullable=False)
+    record_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(), nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f'Tombstone(table_name={self.table_name}, record_id={self.record_id})'
+
+# Objects metadata.create_all can't express: SQLite's FTS table and triggers,
+# and the counter and tombstone triggers, which PostgreSQL gets too
+@event.listens_for(Base.metadata, "after_create")
+def create_sqlite_extras(target, connection, **kw):
+    if connection.dialect.name == 'postgresql':
+        from lib.counters import ensure_application_counts
+        from lib.changes import ensure_tombstones
+        ensure_application_counts(connection)
+        ensure_tombstones(connection)
+    if connection.dialect.name == 'sqlite':
+        from lib.search import ensure_job_search
+        from lib.counters import ensure_application_counts
+        from lib.changes import ensure_tombstones
+        ensure_job_search(connection)
+        ensure_application_counts(connection)
+        ensure_tombstones(connection)
+
+@event.listens_for(Base.metadata, "before_drop")
+def drop_sqlite_extras(target, connection, **kw):
+    if connection.dialect.name == 'postgresql':
+        from lib.counters import uninstall_application_counts
+        from lib.changes import uninstall_tombstones
+        uninstall_application_counts(connection)
+        uninstall_tombstones(connection)
+    if connection.dialect.name == 'sqlite':
+        from lib.search import uninstall_job_search
+        from lib.counters import uninstall_application_counts
+        from lib.changes import uninstall_tombstones
+        uninstall_job_search(connection)
+        uninstall_application_counts(connection)
+        uninstall_tombstones(connection)
+
 """_Relationships_
     user -> application (1-many)
     company -> job (1-many)
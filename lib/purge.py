@@ -0,0 +1,69 @@
+"""Bulk deletes that leave the children to the database.
+
+Jobs, applications and the count summaries reference their parents with
+ON DELETE CASCADE, so removing a company is one DELETE of the company row:
+the database removes its jobs, their applications and their counters in
+the same statement, and the search and counter triggers fire for each
+removed row. Nothing is loaded into the ORM.
+"""
+import itertools
+
+from sqlalchemy import delete, select
+
+from lib.models import User, Company, Job, Application
+
+# IDs per DELETE; keeps the IN list under SQLite's bound-parameter limit
+DEFAULT_CHUNK_SIZE = 5000
+
+def require_foreign_keys(connection):
+    """Switch on SQLite's foreign key enforcement for `connection` if it's off.
+
+    Without it a cascade silently doesn't happen and children are orphaned.
+    Must run before the connection's transaction has written anything.
+    """
+    if connection.dialect.name != 'sqlite':
+        return
+    if not connection.exec_driver_sql("PRAGMA foreign_keys").scalar():
+        connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+        if not connection.exec_driver_sql("PRAGMA foreign_keys").scalar():
+            raise ValueError("Foreign keys can't be enabled inside a transaction; purge needs them for cascades.")
+
+def purge(engine, model, ids, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Delete `model` rows by ID (children cascade in the database); returns the count deleted."""
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    table = model.__table__
+    ids = iter(ids)
+
+    deleted = 0
+    while True:
+        chunk = list(itertools.islice(ids, chunk_size))
+        if not chunk:
+            return deleted
+        with engine.begin() as connection:
+            require_foreign_keys(connection)
+            deleted += connection.execute(delete(table).where(table.c.id.in_(chunk))).rowcount
+
+def purge_orphans(engine):
+    """Delete jobs and applications whose parent row no longer exists.
+
+    Such rows are left over from deletes made before the foreign keys
+    cascaded. Returns {table name: rows deleted}.
+    """
+    companies, jobs, users, applications = (model.__table__ for model in (Company, Job, User, Application))
+    statements = (
+        (jobs, delete(jobs).where(
+            jobs.c.company_id.is_not(None),
+            jobs.c.company_id.not_in(select(companies.c.id)),
+        )),
+        (applications, delete(applications).where(
+            (applications.c.user_id.is_not(None) & applications.c.user_id.not_in(select(users.c.id)))
+            | (applications.c.job_id.is_not(None) & applications.c.job_id.not_in(select(jobs.c.id)))
+        )),
+    )
+    deleted = {}
+    with engine.begin() as connection:
+        require_foreign_keys(connection)
+        for table, statement in statements:
+            deleted[table.name] = connection.execute(statement).rowcount
+    return deleted
@@ -0,0 +1,147 @@
+from sqlalchemy import func, select
+
+from lib.db import DEFAULT_BATCH_SIZE
+from lib.models import User, Company, Job, Application
+
+def user_rows(session):
+    """Users as plain column tuples: (id, name, email, role, mobile)."""
+    return session.query(User.id, User._name, User._email, User._role, User._mobile)
+
+def company_rows(session):
+    """Companies as plain column tuples: (id, name, industry, website)."""
+    return session.query(Company.id, Company._name, Company._industry, Company._website)
+
+def job_rows(session):
+    """Jobs joined to their company name, loaded in a single SELECT."""
+    return (
+        session.query(
+            Job.id,
+            Job._name,
+            Job._description,
+            Job._location,
+            Job._salary,
+            Job._type,
+            Job.company_id,
+            Company._name,
+        )
+        .outerjoin(Company, Job.company_id == Company.id)
+    )
+
+def filter_jobs(query, min_salary=None, max_salary=None, types=(), locations=(), company=None):
+    """Narrow a `job_rows` query; every filter is optional and they combine with AND.
+
+    `company` is a company id or name (matched case-insensitively). Each
+    filter is a plain comparison on an indexed jobs column, so SQLite can
+    drive the query from whichever index is most selective.
+    """
+    if min_salary is not None and max_salary is not None and min_salary > max_salary:
+        raise ValueError("Minimum salary cannot be greater than maximum salary.")
+    if min_salary is not None:
+        query = query.filter(Job._salary >= min_salary)
+    if max_salary is not None:
+        query = query.filter(Job._salary <= max_salary)
+    if types:
+        query = query.filter(Job._type.in_([value.strip().lower() for value in types]))
+    if locations:
+        query = query.filter(Job._location.in_(list(locations)))
+    if company is not None:
+        company = str(company).strip()
+        if company.isdigit():
+            query = query.filter(Job.company_id == int(company))
+        else:
+            query = query.filter(Job.company_id.in_(
+                select(Company.id).where(func.lower(Company._name) == company.lower())
+            ))
+    return query
+
+def application_rows(session):
+    """Applications joined to their user and job, loaded in a single SELECT.
+
+    Returns plain column tuples (no ORM instances), so listing never
+    triggers per-row lazy loads of `Application.user` / `Application.job`.
+    """
+    return (
+        session.query(
+            Application.id,
+            Application._user_id,
+            User._name,
+            Application._job_id,
+            Job._name,
+            Application._status,
+            Application.date,
+        )
+        .outerjoin(User, Application._user_id == User.id)
+        .outerjoin(Job, Application._job_id == Job.id)
+        .order_by(Application.id)
+    )
+
+def user_details(session, user_id):
+    """One user as a row with name, email, mobile and role, or None."""
+    return (
+        session.query(User.id, User._name.label('name'), User._email.label('email'),
+                      User._mobile.label('mobile'), User._role.label('role'))
+        .filter(User.id == user_id)
+        .first()
+    )
+
+def company_details(session, company_id):
+    """One company as a row with name, industry and website, or None."""
+    return (
+        session.query(Company.id, Company._name.label('name'), Company._industry.label('industry'),
+                      Company._website.label('website'))
+        .filter(Company.id == company_id)
+        .first()
+    )
+
+def job_details(session, job_id):
+    """One job with its company name, in a single SELECT, or None."""
+    return (
+        session.query(Job.id, Job._name.label('name'), Job._description.label('description'),
+                      Job._location.label('location'), Job._salary.label('salary'), Job._type.label('type'),
+                      Job.company_id, Company._name.label('company_name'))
+        .outerjoin(Company, Job.company_id == Company.id)
+        .filter(Job.id == job_id)
+        .first()
+    )
+
+def application_details(session, application_id):
+    """One application with its user and job names, in a single SELECT, or None."""
+    return (
+        session.query(Application.id, Application._user_id.label('user_id'), User._name.label('user_name'),
+                      Application._job_id.label('job_id'), Job._name.label('job_name'),
+                      Application._status.label('status'), Application.date)
+        .outerjoin(User, Application._user_id == User.id)
+        .outerjoin(Job, Application._job_id == Job.id)
+        .filter(Application.id == application_id)
+        .first()
+    )
+
+def keyset_pages(query, id_column, after_id=None, limit=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield lists of rows from `query` in `id_column` order, one page at a time.
+
+    Each page is its own `WHERE id > :last ORDER BY id LIMIT :n` query, so
+    memory stays bounded by `batch_size` no matter how large the table is,
+    and the first page is available without scanning the rest. Rows must
+    carry the id as their first column.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+
+        page_query = query.order_by(None)
+        if after_id is not None:
+            page_query = page_query.filter(id_column > after_id)
+        page = page_query.order_by(id_column).limit(size).all()
+
+        if not page:
+            return
+        yield page
+
+        after_id = page[-1][0]
+        if remaining is not None:
+            remaining -= len(page)
+        if len(page) < size:
+            return
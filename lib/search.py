@@ -0,0 +1,155 @@
+"""Full-text job search backed by an SQLite FTS5 table.
+
+`jobs_fts` holds one row per job (rowid = jobs.id) with the job's name,
+description, location and company name. Triggers on `jobs` and
+`companies` keep it in sync, so callers never write to it directly.
+"""
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from lib.db import begin_sqlite_transaction
+
+FTS_TABLE = 'jobs_fts'
+
+# bm25 column weights, in FTS column order: a hit in the title counts most
+BM25_WEIGHTS = (10.0, 1.0, 3.0, 5.0)
+
+INSTALL_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        name, description, location, company,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_after_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, name, description, location, company)
+        VALUES (new.id, new.name, new.description, new.location,
+                (SELECT name FROM companies WHERE id = new.company_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_after_update
+    AFTER UPDATE OF id, name, description, location, company_id ON jobs BEGIN
+        DELETE FROM jobs_fts WHERE rowid = old.id;
+        INSERT INTO jobs_fts (rowid, name, description, location, company)
+        VALUES (new.id, new.name, new.description, new.location,
+                (SELECT name FROM companies WHERE id = new.company_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_after_delete AFTER DELETE ON jobs BEGIN
+        DELETE FROM jobs_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS companies_fts_after_update AFTER UPDATE OF name ON companies BEGIN
+        UPDATE jobs_fts SET company = new.name
+        WHERE rowid IN (SELECT id FROM jobs WHERE company_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS companies_fts_after_delete AFTER DELETE ON companies BEGIN
+        UPDATE jobs_fts SET company = NULL
+        WHERE rowid IN (SELECT id FROM jobs WHERE company_id = old.id);
+    END
+    """,
+]
+
+UNINSTALL_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS companies_fts_after_delete",
+    "DROP TRIGGER IF EXISTS companies_fts_after_update",
+    "DROP TRIGGER IF EXISTS jobs_fts_after_delete",
+    "DROP TRIGGER IF EXISTS jobs_fts_after_update",
+    "DROP TRIGGER IF EXISTS jobs_fts_after_insert",
+    "DROP TABLE IF EXISTS jobs_fts",
+]
+
+def install_job_search(connection):
+    """Create the FTS table and its sync triggers (idempotent)."""
+    for statement in INSTALL_STATEMENTS:
+        connection.exec_driver_sql(statement)
+
+def uninstall_job_search(connection):
+    for statement in UNINSTALL_STATEMENTS:
+        connection.exec_driver_sql(statement)
+
+INDEX_JOBS = """
+    INSERT INTO jobs_fts (rowid, name, description, location, company)
+    SELECT jobs.id, jobs.name, jobs.description, jobs.location, companies.name
+    FROM jobs LEFT JOIN companies ON companies.id = jobs.company_id
+    WHERE jobs.id > ?
+"""
+
+def rebuild_job_search(connection):
+    """Repopulate the FTS table from `jobs` (for databases created before it existed)."""
+    connection.exec_driver_sql("DELETE FROM jobs_fts")
+    connection.exec_driver_sql(INDEX_JOBS, (0,))
+
+@contextmanager
+def deferred_job_indexing(connection):
+    """Index the jobs inserted inside the block in one set-based pass.
+
+    The per-row insert trigger costs several times the insert itself; it is
+    dropped for the block and recreated afterwards. The transaction is begun
+    before the DROP TRIGGER (pysqlite would otherwise autocommit it), so if
+    the block fails the rollback brings the trigger back, and other
+    connections never see it missing. The trigger is also recreated when the
+    block raises, for callers that handle the error and commit anyway. Only
+    rows with ids above the current maximum are indexed, which holds for
+    inserts that let the database assign ids. No-op on other backends.
+    """
+    if connection.dialect.name != 'sqlite':
+        yield
+        return
+    begin_sqlite_transaction(connection)
+    ensure_job_search(connection)
+    last_id = connection.exec_driver_sql("SELECT COALESCE(MAX(id), 0) FROM jobs").scalar()
+    connection.exec_driver_sql("DROP TRIGGER IF EXISTS jobs_fts_after_insert")
+    try:
+        yield
+        connection.exec_driver_sql(INDEX_JOBS, (last_id,))
+    finally:
+        install_job_search(connection)
+
+def ensure_job_search(connection):
+    """Install and backfill the search index if this database doesn't have it yet.
+
+    Returns True when it had to be created.
+    """
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    if not exists:
+        install_job_search(connection)
+        rebuild_job_search(connection)
+    return not exists
+
+def match_expression(query):
+    """Turn free text into an FTS5 query that matches rows containing every word.
+
+    Each word is quoted, so user input can't produce FTS5 syntax errors.
+    """
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        raise ValueError("Search query must contain at least one word.")
+    return ' '.join(f'"{term}"' for term in terms)
+
+def search_jobs(session, query, limit=20):
+    """Jobs matching `query`, best bm25 score first.
+
+    Returns tuples of (id, name, location, salary, type, company name, score).
+    """
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    statement = text(f"""
+        SELECT jobs.id, jobs.name, jobs.location, jobs.salary, jobs.type,
+               jobs_fts.company, bm25(jobs_fts, {weights}) AS score
+        FROM jobs_fts
+        JOIN jobs ON jobs.id = jobs_fts.rowid
+        WHERE jobs_fts MATCH :match
+        ORDER BY score
+        LIMIT :limit
+    """)
+    return session.execute(statement, {'match': match_expression(query), 'limit': limit}).all()
@@ -1,90 +1,266 @@
 #!/usr/bin/env python3
+"""Seed the database with fake users, companies, jobs and applications.
 
-from faker import Faker
+Usage (from the project root):
+    python lib/seed.py [--users N] [--companies N] [--jobs N] [--applications N]
+
+Rows are written with Core executemany inserts in large batches inside one
+transaction. Faker is only used to build small pools of realistic values;
+each batch then draws from those pools, which is what makes generating
+millions of rows feasible.
+"""
+
+import argparse
+import math
 import random
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert, delete, func, inspect, select, text
 
-from lib.models import User, Company, Job, Application
+from lib.models import User, Company, Job, Application, Tombstone
 from lib.base import Base
+from lib.db import begin_sqlite_transaction
+from lib.search import install_job_search, uninstall_job_search, rebuild_job_search
+from lib.counters import (install_application_counts, uninstall_application_counts, rebuild_application_counts,
+                          maintains_counts)
+from lib.changes import install_tombstones, uninstall_tombstones
+from lib.swipes import application_upsert
+
+ROLES = ['applicant', 'employer']
+INDUSTRIES = ['Technology', 'Finance', 'DevOps', 'CyberSecurity']
+JOB_TYPES = ['full-time', 'part-time', 'contract', 'internship']
+STATUSES = ['applied', 'interviewing', 'rejected', 'offered', 'accepted']
+
+POOL_SIZE = 1000
+DEFAULT_SEED_BATCH_SIZE = 10_000
+
+class FakePools:
+    """Pools of Faker values that batches sample from."""
+
+    def __init__(self, size=POOL_SIZE):
+        from faker import Faker
+        fake = Faker()
+        self.first_names = [fake.first_name() for _ in range(size)]
+        self.last_names = [fake.last_name() for _ in range(size)]
+        self.domains = [fake.free_email_domain() for _ in range(50)]
+        self.companies = [fake.company() for _ in range(size)]
+        self.jobs = [fake.job() for _ in range(size)]
+        self.cities = [fake.city() for _ in range(200)]
+        self.sentences = [fake.sentence(nb_words=12) for _ in range(size)]
+
+def next_id(connection, model):
+    return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+def user_batch(pools, start, count):
+    firsts = random.choices(pools.first_names, k=count)
+    lasts = random.choices(pools.last_names, k=count)
+    domains = random.choices(pools.domains, k=count)
+    roles = random.choices(ROLES, k=count)
+    return [
+        {
+            'id': start + i,
+            'name': f"{firsts[i]} {lasts[i]}",
+            # the id suffix keeps emails unique however many rows are generated
+            'email': f"{firsts[i]}.{lasts[i]}{start + i}@{domains[i]}".lower(),
+            'mobile': random.randint(700000000, 799999999),
+            'role': roles[i],
+        }
+        for i in range(count)
+    ]
+
+def company_batch(pools, start, count):
+    names = random.choices(pools.companies, k=count)
+    industries = random.choices(INDUSTRIES, k=count)
+    return [
+        {
+            'id': start + i,
+            'name': names[i],
+            'industry': industries[i],
+            'website': f"https://company{start + i}.example.com",
+        }
+        for i in range(count)
+    ]
+
+def job_batch(pools, start, count, company_ids):
+    names = random.choices(pools.jobs, k=count)
+    cities = random.choices(pools.cities, k=count)
+    descriptions = random.choices(pools.sentences, k=count)
+    types = random.choices(JOB_TYPES, k=count)
+    return [
+        {
+            'id': start + i,
+            'name': names[i],
+            'location': cities[i],
+            'description': descriptions[i],
+            'salary': random.randint(50000, 200000),
+            'type': types[i],
+            'company_id': random.randint(*company_ids),
+        }
+        for i in range(count)
+    ]
+
+def pair_picker(user_ids, job_ids):
+    """Map consecutive numbers to distinct (user_id, job_id) pairs in a scattered order.
+
+    Steps through all users x jobs pairs with a random stride coprime to
+    their count, so no pair repeats until every one has been used.
+    """
+    first_user, last_user = user_ids
+    first_job, last_job = job_ids
+    jobs = last_job - first_job + 1
+    total = (last_user - first_user + 1) * jobs
+    offset = random.randrange(total)
+    stride = 1
+    if total > 2:
+        stride = random.randrange(1, total)
+        while math.gcd(stride, total) != 1:
+            stride = random.randrange(1, total)
+
+    def pick(number):
+        pair = (offset + number * stride) % total
+        return first_user + pair // jobs, first_job + pair % jobs
+    return pick
+
+def application_batch(pools, start, count, pick):
+    statuses = random.choices(STATUSES, k=count)
+    rows = []
+    for i in range(count):
+        user_id, job_id = pick(start + i)
+        rows.append({'id': start + i, 'user_id': user_id, 'job_id': job_id, 'status': statuses[i]})
+    return rows
+
+def insert_batches(connection, model, total, make_batch, batch_size, statement=None):
+    """Insert `total` generated rows into `model`'s table; returns (first_id, rows_per_second)."""
+    start = next_id(connection, model)
+    statement = statement if statement is not None else insert(model.__table__)
+    began = time.perf_counter()
+    for offset in range(0, total, batch_size):
+        rows = make_batch(start + offset, min(batch_size, total - offset))
+        connection.execute(statement, rows)
+    elapsed = time.perf_counter() - began
+    return start, (total / elapsed if elapsed else 0.0)
+
+def require_application_index(connection):
+    """Applications are written with ON CONFLICT (user_id, job_id), which needs
+    the unique index; create_all can't add it to an existing table."""
+    for index in inspect(connection).get_indexes('applications'):
+        if index['unique'] and index['column_names'] == ['user_id', 'job_id']:
+            return
+    raise ValueError("This database predates the unique applications (user_id, job_id) index. "
+                     "Upgrade it first: see 'Upgrading an existing database' in the README.")
+
+def reset(connection):
+    # children first so foreign keys stay satisfied
+    for model in (Application, Job, Company, User):
+        connection.execute(delete(model.__table__))
+    # the deletes aren't changes to feed; consumers must resync after a reseed
+    connection.execute(delete(Tombstone.__table__))
+
+def bulk_seed(engine, users=20, companies=20, jobs=20, applications=20,
+              batch_size=DEFAULT_SEED_BATCH_SIZE, clear=True, report=print):
+    """Generate and insert fake rows in a single transaction.
+
+    Generated jobs point at the companies created by the same call, and
+    applications at its users and jobs, at most one per (user, job) pair.
+    Clearing the tables also clears `tombstones`, so change-feed consumers
+    (lib.changes) must do a full sync after a reseed.
+    Returns {table name: rows per second}.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+    if jobs and not companies:
+        raise ValueError("Jobs need at least one company.")
+    if applications and not (users and jobs):
+        raise ValueError("Applications need at least one user and one job.")
+    if applications > users * jobs:
+        raise ValueError(f"{users} users and {jobs} jobs allow at most {users * jobs} applications (one per pair).")
 
-if __name__ == '__main__':
-    engine = create_engine('sqlite:///swipe_match_hired.db')
     Base.metadata.create_all(engine)
-    
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-    session.query(User).delete()
-    session.query(Company).delete()
-    session.query(Job).delete()
-    session.query(Application).delete()
-    fake = Faker()
-    
-    roles = ['applicant', 'employer']
-    users = []
-    for i in range(20):
-        user = User(
-            name=fake.unique.name(),
-            email=fake.unique.email(),
-            mobile=123456789,
-            role=random.choice(roles)
-        )
+    pools = FakePools()
+    rates = {}
 
-        # add and commit individually to get IDs back
-        session.add(user)
-        session.commit()
+    with engine.begin() as connection:
+        require_application_index(connection)
+        # Per-row search and counter triggers would dominate the insert cost; drop
+        # them for the load and rebuild both in one set-based pass at the end. The
+        # tombstone triggers go too, so a reset doesn't record every row it clears.
+        sqlite = connection.dialect.name == 'sqlite'
+        counted = maintains_counts(connection)
+        if sqlite:
+            # BEGIN before the DDL, so a failed load rolls the drops back with the rows
+            begin_sqlite_transaction(connection)
+            uninstall_job_search(connection)
+            uninstall_application_counts(connection)
+            uninstall_tombstones(connection)
+        elif counted:
+            uninstall_application_counts(connection)
+        try:
+            if clear:
+                reset(connection)
 
-        users.append(user)
+            first_user, rates['users'] = insert_batches(
+                connection, User, users, lambda start, n: user_batch(pools, start, n), batch_size)
+            first_company, rates['companies'] = insert_batches(
+                connection, Company, companies, lambda start, n: company_batch(pools, start, n), batch_size)
 
-    industries = ['Technology', 'Finance','DevOps', 'CyberSecurity']
-    companies = []
-    for i in range(20):
-        company = Company(
-            name=fake.unique.name(),
-            industry=random.choice(industries),
-            website=fake.url(),
-        )
+            company_ids = (first_company, first_company + companies - 1)
+            first_job, rates['jobs'] = insert_batches(
+                connection, Job, jobs, lambda start, n: job_batch(pools, start, n, company_ids), batch_size)
 
-        # add and commit individually to get IDs back
-        session.add(company)
-        session.commit()
+            user_ids = (first_user, first_user + users - 1)
+            job_ids = (first_job, first_job + jobs - 1)
+            pick = pair_picker(user_ids, job_ids) if applications else None
+            _, rates['applications'] = insert_batches(
+                connection, Application, applications,
+                lambda start, n: application_batch(pools, start, n, pick), batch_size,
+                statement=application_upsert(connection))
+        finally:
+            if sqlite:
+                install_job_search(connection)
+                install_application_counts(connection)
+                install_tombstones(connection)
+            elif counted:
+                install_application_counts(connection)
 
-        companies.append(company)
+        if sqlite:
+            rebuild_job_search(connection)
+        rebuild_application_counts(connection)
+        if connection.dialect.name == 'postgresql':
+            # ids were assigned explicitly, so move the serial sequences past them
+            for model in (User, Company, Job, Application):
+                table = model.__tablename__
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+                ))
 
-    jobs = []
-    for _ in range(20):
-        job = Job(
-            name=fake.job(),
-            salary=random.randint(50000, 200000),
-            company=random.choice(companies)
-        )
-        session.add(job)
-        session.commit()
-        jobs.append(job)
-        
-    
-    users = session.query(User).all()
-    jobs = session.query(Job).all()
-    statuses = ['applied', 'interviewing', 'rejected', 'offered','accepted']
-
-    applications = []
-    for _ in range(20):  # Generate 20 applications
-        user = random.choice(users)
-        job = random.choice(jobs)
-
-        application = Application(
-            user_id=random.randint(1, 20),
-            job_id=random.randint(1, 20),
-            status=random.choice(statuses),
-        )
-        applications.append(application)
+    for table, count in (('users', users), ('companies', companies), ('jobs', jobs), ('applications', applications)):
+        report(f"{table:<13} {count:>11,} rows  {rates[table]:>12,.0f} rows/sec")
+    return rates
 
-    session.bulk_save_objects(applications)
-    session.commit()
-        
-    print("🌱 Seeding complete!")   
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Seed the database with fake data.")
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--companies', type=int, default=20)
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--applications', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_SEED_BATCH_SIZE)
+    parser.add_argument('--append', action='store_true', help="Keep existing rows instead of clearing the tables first.")
+    args = parser.parse_args()
+
+    from lib.db import get_engine
+    try:
+        bulk_seed(
+            get_engine(),
+            users=args.users,
+            companies=args.companies,
+            jobs=args.jobs,
+            applications=args.applications,
+            batch_size=args.batch_size,
+            clear=not args.append,
+        )
+    except ValueError as error:
+        parser.exit(1, f"Error: {error}\n")
+    print("🌱 Seeding complete!")
@@ -0,0 +1,110 @@
+"""Interactive shell over the click command group.
+
+Every command runs inside the same process, so the engine, its connection
+pool, the configured mappers and anything the commands cached stay warm
+between commands instead of being rebuilt by a fresh `python app.py`.
+"""
+import cmd
+import shlex
+import time
+
+import click
+
+from lib import db
+
+class CliShell(cmd.Cmd):
+    intro = "SwipeMatch shell. Type 'help' for commands, 'timing on' to time them, 'exit' to leave."
+    prompt = "swipematch> "
+
+    def __init__(self, group, stdin=None, stdout=None):
+        super().__init__(stdin=stdin, stdout=stdout)
+        if stdin is not None:
+            self.use_rawinput = False
+        self.group = group
+        self.timing = False
+
+    def preloop(self):
+        if self.use_rawinput:
+            try:
+                import readline
+            except ImportError:
+                pass
+            else:
+                # command and option names contain '-', one of readline's default
+                # word breaks; complete whole space-separated words instead
+                readline.set_completer_delims(' \t\n')
+        # Pay for mapper configuration and the first connection up front
+        from sqlalchemy.orm import configure_mappers
+        import lib.models  # noqa: F401  (registers the mappers)
+        configure_mappers()
+        db.get_session().connection()
+        db.release()
+
+    def emptyline(self):
+        pass
+
+    def default(self, line):
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            self.stdout.write(f"Error: {e}\n")
+            return
+        if args[0] not in self.group.commands:
+            self.stdout.write(f"Unknown command '{args[0]}'. Type 'help' for a list.\n")
+            return
+        if args[0] == 'shell':
+            self.stdout.write("Already in the shell.\n")
+            return
+        self.run(args)
+
+    def run(self, args):
+        started = time.perf_counter()
+        try:
+            self.group.main(args, prog_name='', standalone_mode=False)
+        except click.exceptions.Abort:
+            self.stdout.write("Aborted.\n")
+        except click.exceptions.ClickException as e:
+            e.show()
+        except SystemExit:
+            pass  # --help and friends exit after printing
+        finally:
+            db.release()
+        if self.timing:
+            self.stdout.write(f"⏱  {(time.perf_counter() - started) * 1000:.1f} ms\n")
+
+    def do_timing(self, arg):
+        """timing on|off: print how long each command takes"""
+        if arg.strip() not in ('on', 'off'):
+            self.stdout.write(f"Timing is {'on' if self.timing else 'off'}. Use 'timing on' or 'timing off'.\n")
+            return
+        self.timing = arg.strip() == 'on'
+
+    def do_help(self, arg):
+        """help [command]: list commands, or show one command's options"""
+        self.run([arg, '--help'] if arg else ['--help'])
+        if not arg:
+            self.stdout.write("\nShell commands:\n  timing on|off  Print per-command latency\n  exit           Leave the shell\n")
+
+    def do_exit(self, arg):
+        """exit: leave the shell"""
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg):
+        self.stdout.write("\n")
+        return True
+
+    def completenames(self, text, *ignored):
+        names = [name for name in self.group.commands if name != 'shell'] + ['timing', 'help', 'exit']
+        return sorted(name for name in names if name.startswith(text))
+
+    def completedefault(self, text, line, begidx, endidx):
+        command = self.group.commands.get(line.split()[0])
+        if command is None:
+            return []
+        options = [opt for param in command.params for opt in getattr(param, 'opts', []) if opt.startswith('-')]
+        return sorted(opt for opt in options if opt.startswith(text))
+
+    def complete_help(self, text, line, begidx, endidx):
+        return [name for name in self.completenames(text) if name in self.group.commands]
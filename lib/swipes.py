@@ -0,0 +1,184 @@
+"""Batch ingestion of swipe decisions.
+
+A swipe is a `(user_id, job_id, decision)` record. A right swipe (or an
+explicit application status) becomes an `Application`; a left swipe is
+counted and dropped. Records are validated in bulk, one chunk at a time:
+all user and job ids of a chunk are checked with one query each, existing
+applications with one more, and the survivors are written with a single
+executemany insert in the chunk's own transaction. The insert is an upsert
+on (user_id, job_id), so a swipe recorded concurrently by another writer
+is counted as a duplicate rather than failing the chunk.
+"""
+import csv
+import itertools
+import json
+import time
+
+from sqlalchemy import select
+
+from lib.models import User, Job, Application
+from lib.validators import STATUSES
+
+DEFAULT_CHUNK_SIZE = 10000
+
+RIGHT_SWIPES = frozenset(['right', 'like', 'yes', 'apply'])
+LEFT_SWIPES = frozenset(['left', 'pass', 'no', 'skip'])
+
+# Only the first few problems are kept; the rest are just counted
+MAX_REPORTED_ERRORS = 20
+
+class SwipeReport:
+    """Counters for one ingestion run."""
+
+    def __init__(self):
+        self.received = 0
+        self.inserted = 0
+        self.passed = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def rate(self):
+        return self.received / self.seconds if self.seconds else 0.0
+
+    def reject(self, number, reason):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((number, reason))
+
+def status_for(decision):
+    """Application status for a decision, None for a left swipe."""
+    decision = str(decision).strip().lower()
+    if decision in RIGHT_SWIPES:
+        return 'applied'
+    if decision in LEFT_SWIPES:
+        return None
+    if decision in STATUSES:
+        return decision
+    raise ValueError(f"Unknown decision '{decision}'.")
+
+def record_id(value):
+    """An ID from an int or a string of digits; floats (3.9 in JSON) and bools are refused
+    rather than truncated."""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"'{value}' is not an integer ID.")
+    return int(value)
+
+def read_swipes(stream, format):
+    """Yield (user_id, job_id, decision) from a 'jsonl' or 'csv' text stream.
+
+    CSV input needs a header row naming user_id, job_id and decision. A line
+    that isn't a JSON object yields None, so one bad line doesn't abort a feed.
+    """
+    if format == 'jsonl':
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+                continue
+            yield (record.get('user_id'), record.get('job_id'), record.get('decision')) if isinstance(record, dict) else None
+    elif format == 'csv':
+        for record in csv.DictReader(stream):
+            yield record.get('user_id'), record.get('job_id'), record.get('decision')
+    else:
+        raise ValueError(f"Unsupported swipe format '{format}'. Use jsonl or csv.")
+
+def application_upsert(connection, update_status=True):
+    """INSERT into `applications` that resolves a repeated (user_id, job_id) in the database.
+
+    With `update_status` the existing application takes the new status;
+    otherwise the repeat is dropped. Either way a concurrent double swipe
+    can't create a second row or fail on the unique index.
+    """
+    if connection.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif connection.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        raise ValueError(f"Upserting applications is not supported on {connection.dialect.name}.")
+    statement = dialect_insert(Application.__table__)
+    keys = ['user_id', 'job_id']
+    if update_status:
+        return statement.on_conflict_do_update(index_elements=keys, set_={'status': statement.excluded.status})
+    return statement.on_conflict_do_nothing(index_elements=keys)
+
+def existing_ids(connection, column, ids):
+    return set(connection.execute(select(column).where(column.in_(ids))).scalars().all())
+
+def ingest_chunk(connection, numbered, report):
+    parsed = []
+    for number, record in numbered:
+        if record is None:
+            report.reject(number, "Malformed record.")
+            continue
+        user_id, job_id, decision = record
+        try:
+            user_id, job_id = record_id(user_id), record_id(job_id)
+        except ValueError:
+            report.reject(number, "user_id and job_id must be numeric IDs.")
+            continue
+        try:
+            status = status_for(decision)
+        except ValueError as ve:
+            report.reject(number, str(ve))
+            continue
+        parsed.append((number, user_id, job_id, status))
+
+    users = existing_ids(connection, User.id, {user_id for _, user_id, _, _ in parsed})
+    jobs = existing_ids(connection, Job.id, {job_id for _, _, job_id, _ in parsed})
+    # Filtering on user_id alone lets SQLite walk ix_applications_user_id_job_id;
+    # adding job_id IN (...) makes it scan instead.
+    applied = {
+        (user_id, job_id)
+        for user_id, job_id in connection.execute(
+            select(Application._user_id, Application._job_id).where(Application._user_id.in_(users))
+        ).all()
+    }
+
+    rows = []
+    for number, user_id, job_id, status in parsed:
+        if user_id not in users:
+            report.reject(number, f"User {user_id} does not exist.")
+        elif job_id not in jobs:
+            report.reject(number, f"Job {job_id} does not exist.")
+        elif status is None:
+            report.passed += 1
+        elif (user_id, job_id) in applied:
+            report.duplicates += 1
+        else:
+            applied.add((user_id, job_id))
+            rows.append({'user_id': user_id, 'job_id': job_id, 'status': status})
+
+    if rows:
+        # another writer may have recorded the same swipe since the check above
+        inserted = connection.execute(application_upsert(connection, update_status=False), rows).rowcount
+        report.duplicates += len(rows) - inserted
+        report.inserted += inserted
+
+def ingest_swipes(engine, records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Validate and insert swipe records, one transaction per chunk.
+
+    `records` is any iterable of (user_id, job_id, decision). A pair that
+    already has an application (or appears twice in the input) is counted
+    as a duplicate, not inserted again. Returns a SwipeReport.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+
+    report = SwipeReport()
+    started = time.perf_counter()
+    numbered = enumerate(records, start=1)
+    while True:
+        chunk = list(itertools.islice(numbered, chunk_size))
+        if not chunk:
+            break
+        report.received += len(chunk)
+        with engine.begin() as connection:
+            ingest_chunk(connection, chunk, report)
+    report.seconds = time.perf_counter() - started
+    return report
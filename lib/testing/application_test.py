@@ -1,6 +1,6 @@
 import pytest
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, clear_mappers
+from sqlalchemy.orm import sessionmaker
 
 from lib.models import User, Company, Application, Job, engine
 from lib.base import Base
@@ -15,7 +15,6 @@ def setup_db():
     # Teardown DB
     engine.dispose()  # close all pooled connections
     Base.metadata.drop_all(engine)
-    clear_mappers()  # clears class-to-table mappings to avoid lingering connections
 
 @pytest.fixture(scope="function")
 def session(setup_db):
@@ -0,0 +1,102 @@
+import asyncio
+from importlib.util import find_spec
+
+import pytest
+from sqlalchemy import text
+
+from lib import async_queries, db
+from lib.matching import job_feed
+from lib.models import User, Company, Job
+from lib.queries import job_details
+
+def run(db_engine, scenario):
+    """Run `scenario(engine)` on a fresh event loop, with an async engine for the test database."""
+    async def main():
+        engine = db.create_async_engine_for(db_engine.url.render_as_string(hide_password=False))
+        try:
+            return await scenario(engine)
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+def add_rows(db_session):
+    company = Company(name="Acme", industry="Tech", website="https://acme.example")
+    db_session.add(company)
+    db_session.flush()
+    db_session.add_all(
+        [Job(name=f"Job {i}", description="Work", location="Remote", salary=40000 + i * 1000,
+             type="contract" if i % 2 else "full-time", company_id=company.id) for i in range(30)]
+        + [User(name=f"User {i}", email=f"user{i}@example.com", mobile="0712345678", role="applicant") for i in range(5)]
+    )
+    db_session.commit()
+
+def test_async_urls_use_asyncio_drivers():
+    assert db.async_url('sqlite:///swipe.db').drivername == 'sqlite+aiosqlite'
+    if find_spec('asyncpg'):
+        assert db.async_url('postgresql+psycopg2://u@host/db').drivername == 'postgresql+asyncpg'
+    else:
+        with pytest.raises(ValueError, match="asyncpg"):
+            db.async_url('postgresql://u@host/db')
+    with pytest.raises(ValueError, match="No asyncio driver"):
+        db.async_url('mysql://u@host/db')
+
+def test_concurrent_fetches_match_the_sync_queries(db_engine, db_session):
+    add_rows(db_session)
+
+    async def scenario(engine):
+        make_session = async_queries.session_factory(engine)
+        async def fetch(job_id):
+            async with make_session() as session:
+                return await async_queries.fetch_job(session, job_id)
+        return await asyncio.gather(*(fetch(job_id) for job_id in range(1, 33)))
+
+    assert run(db_engine, scenario) == [job_details(db_session, job_id) for job_id in range(1, 33)]
+
+def test_list_pages_and_filters(db_engine, db_session):
+    add_rows(db_session)
+
+    async def scenario(engine):
+        make_session = async_queries.session_factory(engine)
+        async with make_session() as session:
+            first = await async_queries.list_jobs(session, limit=10, types=['contract'])
+            second = await async_queries.list_jobs(session, after_id=first[-1][0], limit=10, types=['contract'])
+            users = await async_queries.list_users(session, limit=3)
+            return first, second, users
+
+    first, second, users = run(db_engine, scenario)
+    assert [row[0] for row in first + second] == list(range(2, 31, 2))
+    assert [row[0] for row in users] == [1, 2, 3]
+
+def test_creates_validate_and_upsert(db_engine, db_session):
+    add_rows(db_session)
+
+    async def scenario(engine):
+        make_session = async_queries.session_factory(engine)
+        async with make_session() as session:
+            user_id = await async_queries.create(session, User, name="Amina", email="amina@example.com",
+                                                 mobile="0712345678", role="applicant")
+            with pytest.raises(ValueError):
+                await async_queries.create(session, User, name="", email="x@example.com", mobile="0712345678", role="applicant")
+            first = await async_queries.create_application(session, user_id, 3, "applied")
+            again = await async_queries.create_application(session, user_id, 3, "interviewing")
+            foreign_keys = (await session.execute(text("PRAGMA foreign_keys"))).scalar()
+            return user_id, first, again, foreign_keys
+
+    user_id, first, again, foreign_keys = run(db_engine, scenario)
+    assert first == again
+    assert foreign_keys == 1
+    assert db_session.execute(text("SELECT status FROM applications WHERE user_id = :id"), {'id': user_id}).scalar() == "interviewing"
+
+def test_feeds_for_many_users_match_the_sync_feed(db_engine, db_session):
+    add_rows(db_session)
+
+    async def scenario(engine):
+        make_session = async_queries.session_factory(engine)
+        async with make_session() as session:
+            await async_queries.create_application(session, 1, 5, "applied")
+        return await async_queries.feeds(engine, [1, 2, 3], top_k=5, concurrency=2)
+
+    results = run(db_engine, scenario)
+    assert [user_id for user_id, _ in results] == [1, 2, 3]
+    assert results == [(user_id, job_feed(db_session, user_id, top_k=5)) for user_id in (1, 2, 3)]
+    assert 5 not in [job_id for job_id, _ in results[0][1]]
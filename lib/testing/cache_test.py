@@ -0,0 +1,102 @@
+import pytest
+
+from lib.cache import IdentityCache, records
+from lib.models import Company, Job
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_eviction_and_ttl_expiry():
+    clock = Clock()
+    cache = IdentityCache(maxsize=2, ttl=10, clock=clock)
+    loads = []
+
+    def loader(value):
+        return lambda: loads.append(value) or value
+
+    cache.get(Job, 1, loader("a"))
+    cache.get(Job, 2, loader("b"))
+    assert cache.get(Job, "1", loader("a again")) == "a"
+    cache.get(Job, 3, loader("c"))  # evicts job 2, the least recently used
+
+    assert cache.get(Job, 2, loader("b again")) == "b again"
+    clock.now = 11
+    assert cache.get(Job, 3, loader("c again")) == "c again"
+    assert loads == ["a", "b", "c", "b again", "c again"]
+    assert (cache.hits, cache.misses, cache.evictions, cache.expirations) == (1, 5, 2, 1)
+
+def test_missing_rows_are_not_cached():
+    cache = IdentityCache()
+
+    assert cache.get(Job, 7, lambda: None) is None
+    assert cache.get(Job, 7, lambda: "created since") == "created since"
+
+def test_orm_updates_invalidate_the_record_and_its_dependents(db_session):
+    company = Company(name="Acme", industry="Tech", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    job = Job(name="Engineer", salary=1, company_id=company.id)
+    db_session.add(job)
+    db_session.commit()
+    records.clear()
+    records.get(Company, company.id, lambda: "company row")
+    records.get(Job, job.id, lambda: "job row with company name")
+
+    company.name = "Acme Corp"
+    db_session.commit()
+
+    assert len(records) == 0
+
+def test_core_writes_invalidate_the_table(db_engine, db_session):
+    from lib.models import Application, User
+    from lib.transitions import transition_ids
+    user = User(name="Alice Doe", email="alice@example.com", mobile=759233322, role="applicant")
+    job = Job(name="Engineer", salary=1)
+    db_session.add_all([user, job])
+    db_session.flush()
+    application = Application(user_id=user.id, job_id=job.id, status="applied")
+    db_session.add(application)
+    db_session.commit()
+    records.clear()
+    records.get(Application, application.id, lambda: "application row")
+    records.get(Job, job.id, lambda: "job row")
+
+    assert transition_ids(db_engine, [application.id], "applied", "interviewing") == 1
+
+    assert records.get(Application, application.id, lambda: "reloaded") == "reloaded"
+    assert records.get(Job, job.id, lambda: "reloaded") == "job row"
+
+@pytest.mark.parametrize("command, option", [("fetch-job", "--job-id"), ("fetch-company", "--company-id")])
+def test_fetch_commands_hit_the_database_once(command, option, db_engine, db_session):
+    from click.testing import CliRunner
+    from sqlalchemy import event
+    from app import cli
+    from lib import db
+    company = Company(name="Acme", industry="Tech", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    db_session.add(Job(name="Engineer", salary=1, company_id=company.id))
+    db_session.commit()
+    url = db.current_url()
+    db.configure(db_engine.url.render_as_string(hide_password=False))
+    records.clear()
+    selects = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(db.get_engine(), "before_cursor_execute", record)
+    try:
+        runner = CliRunner()
+        first = runner.invoke(cli, [command, option, "1"])
+        second = runner.invoke(cli, [command, option, "1"])
+    finally:
+        db.configure(url)
+
+    assert "Acme" in first.output and second.output == first.output
+    assert len(selects) == 1
@@ -0,0 +1,148 @@
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from lib.catalog import JobCatalog
+from lib.job_index import JobIndex
+from lib.models import Company, Job
+
+def add_jobs(db_session):
+    acme = Company(name="Acme", industry="Tech", website="https://acme.example")
+    umoja = Company(name="Umoja", industry="Finance", website="https://umoja.example")
+    db_session.add_all([acme, umoja])
+    db_session.flush()
+    db_session.add_all([
+        Job(name="Backend Engineer", description="APIs", location="Nairobi", salary=120000, type="full-time", company_id=acme.id),
+        Job(name="Data Analyst ✨", description="SQL", location="Remote", salary=80000, type="contract", company_id=umoja.id),
+        Job(name="Intern", description="Learn", location="Nairobi", salary=20000, type="internship", company_id=acme.id),
+    ])
+    db_session.flush()
+    # a job with no salary and no company
+    db_session.add(Job(name="Volunteer", description="Help", location="Remote", salary=0, type="part-time"))
+    db_session.commit()
+    db_session.query(Job).filter(Job._name == "Volunteer").update({Job._salary: None})
+    db_session.commit()
+    return acme, umoja
+
+def test_build_interns_strings_and_keeps_id_order(db_engine, db_session):
+    acme, umoja = add_jobs(db_session)
+    with db_engine.connect() as connection:
+        catalog = JobCatalog.build(connection, batch_size=2)
+
+    assert len(catalog) == 4
+    assert catalog.ids.tolist() == sorted(catalog.ids.tolist())
+    assert catalog.companies == ["Acme", "Umoja"]
+    assert catalog.row(catalog.ids[1]) == {
+        'id': int(catalog.ids[1]), 'name': "Data Analyst ✨", 'salary': 80000.0, 'type': "contract",
+        'location': "Remote", 'company_id': umoja.id, 'company_name': "Umoja",
+    }
+    volunteer = catalog.row(catalog.ids[3])
+    assert (volunteer['salary'], volunteer['company_id'], volunteer['company_name']) == (None, None, None)
+    assert catalog.row(999) is None
+
+def test_save_and_open_round_trip_through_memory_maps(db_engine, db_session, tmp_path):
+    add_jobs(db_session)
+    with db_engine.connect() as connection:
+        built = JobCatalog.build(connection)
+    snapshots = tmp_path / 'snapshots'
+    snapshots.mkdir()
+    built.save(snapshots / 'catalog')
+    # saving again replaces the snapshot in place
+    built.save(snapshots / 'catalog')
+
+    opened = JobCatalog.open(snapshots / 'catalog')
+    assert isinstance(opened.ids, np.memmap)
+    assert not opened.salary.flags.writeable
+    assert [opened.row(job_id) for job_id in opened.ids] == [built.row(job_id) for job_id in built.ids]
+    assert (snapshots / 'catalog').is_symlink()
+    # the published version and the one it replaced; nothing older
+    assert len([path for path in snapshots.iterdir() if path.name.startswith('.catalog.v-')]) == 2
+
+def test_save_swaps_the_published_catalog_in_one_rename(db_engine, db_session, tmp_path, monkeypatch):
+    with db_engine.connect() as connection:
+        empty = JobCatalog.build(connection)
+    add_jobs(db_session)
+    with db_engine.connect() as connection:
+        built = JobCatalog.build(connection)
+    # a catalog saved as a plain directory is moved behind the link
+    empty.save(tmp_path / 'old')
+    path = tmp_path / 'catalog'
+    shutil.copytree(tmp_path / 'old', path)
+    built.save(path)
+    assert path.is_symlink() and len(JobCatalog.open(path)) == len(built)
+
+    replace = os.replace
+    swaps = []
+    def checked_replace(source, target):
+        # the old catalog stays readable right up to the swap, and the new
+        # one is readable right after it
+        assert len(JobCatalog.open(path)) == len(built)
+        replace(source, target)
+        swaps.append(len(JobCatalog.open(path)))
+    monkeypatch.setattr(os, 'replace', checked_replace)
+    empty.save(path)
+    assert swaps == [0]
+
+def test_job_index_from_a_catalog_matches_one_loaded_from_the_database(db_engine, db_session, tmp_path):
+    add_jobs(db_session)
+    with db_engine.connect() as connection:
+        JobCatalog.build(connection).save(tmp_path / 'catalog')
+    from_catalog = JobCatalog.open(tmp_path / 'catalog').job_index()
+    from_database = JobIndex.load(db_session)
+
+    for filters in ({'types': ['full-time', 'internship']}, {'locations': ['Remote']}, {'min_salary': 50000}):
+        assert from_catalog.search(**filters).tolist() == from_database.search(**filters).tolist()
+
+def test_empty_table_and_missing_snapshot(db_engine, tmp_path):
+    with db_engine.connect() as connection:
+        catalog = JobCatalog.build(connection)
+    catalog.save(tmp_path / 'empty')
+    assert len(JobCatalog.open(tmp_path / 'empty')) == 0
+
+    with pytest.raises(ValueError, match="No job catalog"):
+        JobCatalog.open(tmp_path / 'nowhere')
+
+def rows(catalog):
+    return [catalog.row(job_id) for job_id in catalog.ids], catalog.watermark
+
+def test_refresh_applies_updates_inserts_deletes_and_renames(db_engine, db_session, tmp_path):
+    acme, umoja = add_jobs(db_session)
+    with db_engine.connect() as connection:
+        JobCatalog.build(connection).save(tmp_path / 'catalog')
+    snapshot = JobCatalog.open(tmp_path / 'catalog')
+
+    jobs = db_session.query(Job).order_by(Job.id).all()
+    jobs[0].salary = 135000
+    jobs[0].type = "contract"
+    jobs[2].name = "Graduate Trainee"
+    db_session.delete(jobs[1])
+    db_session.add(Job(name="Designer", description="UI", location="Kisumu", salary=90000, type="part-time", company_id=umoja.id))
+    db_session.commit()
+
+    with db_engine.connect() as connection:
+        refreshed = snapshot.refresh(connection, until=datetime(2100, 1, 1))
+        connection.execute(update(Company.__table__).where(Company.id == acme.id).values(name="Acme Group"))
+        connection.commit()
+        renamed = snapshot.refresh(connection, until=datetime(2100, 1, 2))
+        rebuilt = JobCatalog.build(connection)
+
+    assert len(refreshed) == 4
+    assert refreshed.row(jobs[0].id)['salary'] == 135000 and refreshed.row(jobs[0].id)['type'] == "contract"
+    assert refreshed.row(jobs[2].id)['name'] == "Graduate Trainee"
+    assert refreshed.row(jobs[1].id) is None
+    assert refreshed.row(refreshed.ids[-1])['location'] == "Kisumu"
+    assert rows(renamed)[0] == rows(rebuilt)[0]
+    assert renamed.row(jobs[0].id)['company_name'] == "Acme Group"
+    assert renamed.watermark == datetime(2100, 1, 2)
+
+def test_refresh_without_changes_keeps_every_row(db_engine, db_session):
+    add_jobs(db_session)
+    with db_engine.connect() as connection:
+        built = JobCatalog.build(connection)
+        refreshed = built.refresh(connection, until=built.watermark)
+    assert rows(refreshed)[0] == rows(built)[0]
+    assert refreshed.name_bytes.tobytes() == built.name_bytes.tobytes()
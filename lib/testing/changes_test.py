@@ -0,0 +1,118 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, select, text
+
+from lib.changes import changes_since, prune_tombstones, window
+from lib.models import Company, Job, User
+from lib.purge import purge
+
+PAST = datetime(2026, 1, 1, 12, 0, 0)
+LATER = datetime(2026, 1, 1, 12, 0, 5)
+FUTURE = datetime(2100, 1, 1)
+
+def add_rows(db_session):
+    company = Company(name="Acme", industry="Tech", website="https://acme.example")
+    db_session.add(company)
+    db_session.flush()
+    jobs = [Job(name=f"Job {i}", description="Work", location="Remote", salary=50000, type="contract", company_id=company.id)
+            for i in range(3)]
+    db_session.add_all(jobs)
+    db_session.commit()
+    return company, jobs
+
+def backdate(connection, table, stamp):
+    connection.execute(text(f"UPDATE {table} SET updated_at = :stamp"), {'stamp': stamp.strftime('%Y-%m-%d %H:%M:%S')})
+
+def test_inserts_are_stamped_by_the_orm_and_by_core(db_engine, db_session):
+    add_rows(db_session)
+    with db_engine.begin() as connection:
+        connection.execute(insert(User.__table__), [{'name': "Amina", 'email': "amina@example.com", 'role': "applicant"}])
+
+    assert db_session.query(Job).filter(Job.updated_at.is_(None)).count() == 0
+    assert db_session.query(User).filter(User.updated_at.is_(None)).count() == 0
+
+def test_feed_returns_rows_changed_within_the_window(db_engine, db_session):
+    _, jobs = add_rows(db_session)
+    with db_engine.begin() as connection:
+        backdate(connection, 'jobs', PAST)
+    jobs[1].salary = 65000
+    db_session.commit()
+
+    with db_engine.connect() as connection:
+        everything = changes_since(connection, 'jobs', until=FUTURE)
+        since_past = changes_since(connection, 'jobs', since=LATER, until=FUTURE)
+        # the second of the watermark itself is included
+        from_the_start = changes_since(connection, 'jobs', since=PAST, until=LATER)
+
+    assert [row.id for row in everything.changed] == [jobs[0].id, jobs[2].id, jobs[1].id]
+    assert [row.id for row in since_past.changed] == [jobs[1].id]
+    assert since_past.changed[0].salary == 65000
+    assert since_past.watermark == FUTURE
+    assert [row.id for row in from_the_start.changed] == [jobs[0].id, jobs[2].id]
+
+def test_default_watermark_excludes_the_current_second(db_engine, db_session):
+    add_rows(db_session)
+    with db_engine.connect() as connection:
+        feed = changes_since(connection, 'jobs', since=PAST)
+        # rows stamped in the second the poll ran in wait for the next poll
+        assert all(row.updated_at < feed.watermark for row in feed.changed)
+        again = changes_since(connection, 'jobs', since=feed.watermark, until=FUTURE)
+    assert len(feed.changed) + len(again.changed) >= 3
+
+def test_cascaded_deletes_leave_tombstones(db_engine, db_session):
+    company, jobs = add_rows(db_session)
+    job_ids = [job.id for job in jobs]
+    purge(db_engine, Company, [company.id])
+
+    with db_engine.connect() as connection:
+        deleted_jobs = changes_since(connection, 'jobs', since=PAST, until=FUTURE)
+        deleted_companies = changes_since(connection, 'companies', since=PAST, until=FUTURE)
+        before_the_deletes = changes_since(connection, 'jobs', since=PAST, until=PAST)
+
+    assert deleted_jobs.changed == [] and sorted(deleted_jobs.deleted) == sorted(job_ids)
+    assert deleted_companies.deleted == [company.id]
+    assert len(before_the_deletes) == 0
+
+def test_pruning_tombstones(db_engine, db_session):
+    company, _ = add_rows(db_session)
+    purge(db_engine, Company, [company.id])
+    with db_engine.begin() as connection:
+        assert prune_tombstones(connection, PAST) == 0
+        assert prune_tombstones(connection, FUTURE) == 4
+        assert changes_since(connection, 'jobs', since=PAST, until=FUTURE).deleted == []
+
+def test_unknown_table_is_rejected(db_engine):
+    with db_engine.connect() as connection, pytest.raises(ValueError, match="No change feed"):
+        changes_since(connection, 'applications')
+
+def test_feed_reads_the_updated_at_index(db_session):
+    jobs = Job.__table__
+    statement = (select(jobs).where(window(db_session.connection(), jobs.c.updated_at, PAST, FUTURE))
+                 .order_by(jobs.c.updated_at, jobs.c.id))
+    sql = str(statement.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True}))
+    plan = " | ".join(row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+    assert "USING INDEX ix_jobs_updated_at" in plan, plan
+
+def test_incremental_polls_need_recorded_deletes(db_engine, monkeypatch):
+    from lib import changes
+    # as on a backend without delete triggers
+    monkeypatch.setattr(changes, 'TRIGGER_CATALOGS', {})
+
+    with db_engine.connect() as connection:
+        assert len(changes_since(connection, 'jobs', until=FUTURE)) == 0
+        with pytest.raises(ValueError, match="Deletes aren't recorded"):
+            changes_since(connection, 'jobs', since=PAST)
+
+def test_ensure_restores_a_missing_delete_trigger(db_engine, db_session):
+    from lib.changes import ensure_tombstones
+    company, jobs = add_rows(db_session)
+    with db_engine.begin() as connection:
+        connection.execute(text("DROP TRIGGER jobs_tombstone_after_delete"))
+        assert ensure_tombstones(connection) is True
+        assert ensure_tombstones(connection) is False
+    purge(db_engine, Job, [jobs[0].id])
+
+    with db_engine.connect() as connection:
+        assert changes_since(connection, 'jobs', since=PAST, until=FUTURE).deleted == [jobs[0].id]
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def test_help_does_not_import_the_database_stack():
+    script = (
+        "import runpy, sys\n"
+        "sys.argv = ['app.py', '--help']\n"
+        "try:\n"
+        "    runpy.run_path('app.py', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "heavy = sorted({m.split('.')[0] for m in sys.modules} & {'sqlalchemy', 'rich', 'faker'})\n"
+        "print(','.join(heavy), file=sys.stderr)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert 'list-applications' in result.stdout
+    assert result.stderr.strip() == ''
+
+def test_engine_is_created_lazily():
+    from lib import db
+    db.dispose()
+
+    assert db._engine is None
+    assert db.get_engine() is db.get_engine()
+
+def test_listings_print_each_page_before_fetching_the_next(monkeypatch):
+    import app
+    printed = []
+    monkeypatch.setattr(app, 'console', SimpleNamespace(print=printed.append))
+    def pages():
+        yield [(1, "Ada"), (2, "Grace")]
+        assert len(printed) == 1
+        yield [(3, "Linus")]
+
+    app.print_listing("Users", ["ID", "Name"], pages(), lambda row: (str(row[0]), row[1]))
+    assert [table.row_count for table in printed] == [2, 1]
+
+    printed.clear()
+    app.print_listing("Users", ["ID", "Name"], [[(1, "Ada"), (2, "Grace")], [(3, "Linus")]],
+                      lambda row: (str(row[0]), row[1]), stream=False)
+    assert [table.row_count for table in printed] == [3]
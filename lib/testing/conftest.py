@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from lib import db
+from lib.base import Base
+
+# Point the app-wide engine at a scratch database before any test module
+# imports it, so the test run never rewrites the shipped swipe_match_hired.db.
+db.configure(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'swipe_match_hired.db')}")
+
+@pytest.fixture
+def db_engine(tmp_path):
+    # Throwaway database per test, so the shipped swipe_match_hired.db is never touched
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    db.enforce_foreign_keys(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db_session(db_engine):
+    session = sessionmaker(bind=db_engine)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def query_counter(db_engine):
+    """Collects every SQL statement executed on `db_engine`."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(db_engine, "before_cursor_execute", record)
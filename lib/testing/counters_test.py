@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import text
+
+from lib.counters import (application_counts, rebuild_application_counts, uninstall_application_counts,
+                          ensure_application_counts, grouped_counts, summary_counts)
+from lib.models import Company, Job, User, Application
+from lib.seed import bulk_seed
+
+@pytest.fixture
+def people(db_session):
+    company = Company(name="Acme", industry="Tech", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    jobs = [Job(name=f"Job {i}", salary=1, company_id=company.id) for i in range(2)]
+    users = [User(name=f"User {i}", email=f"user{i}@example.com", mobile="759233322", role="applicant") for i in range(2)]
+    db_session.add_all(jobs + users)
+    db_session.commit()
+    return jobs, users
+
+def test_counts_follow_inserts_updates_and_deletes(db_session, people):
+    (job, other_job), (alice, bob) = people
+    first = Application(user_id=alice.id, job_id=job.id, status="applied")
+    second = Application(user_id=bob.id, job_id=job.id, status="applied")
+    db_session.add_all([first, second])
+    db_session.commit()
+    assert application_counts(db_session, Job, job.id)['applied'] == 2
+
+    second.status = "offered"
+    first.job_id = other_job.id
+    db_session.commit()
+    assert application_counts(db_session, Job, job.id) == {
+        'applied': 0, 'interviewing': 0, 'rejected': 0, 'offered': 1, 'accepted': 0, 'total': 1,
+    }
+    assert application_counts(db_session, Job, other_job.id)['applied'] == 1
+
+    db_session.delete(second)
+    db_session.commit()
+    assert application_counts(db_session, Job, job.id)['total'] == 0
+    assert application_counts(db_session, User, alice.id)['total'] == 1
+    assert application_counts(db_session, User, 999)['total'] == 0
+
+def summaries(session):
+    return {
+        # open_since_sum is a float sum, so allow for the order it was added up in
+        table: session.execute(text(
+            f"SELECT {key}, applied, interviewing, rejected, offered, accepted, total, ROUND(open_since_sum, 6) "
+            f"FROM {table} WHERE total > 0 ORDER BY 1"
+        )).all()
+        for table, key in (('job_application_counts', 'job_id'), ('user_application_counts', 'user_id'))
+    }
+
+def test_seeded_counts_match_a_full_rebuild(db_engine, db_session):
+    bulk_seed(db_engine, users=30, companies=3, jobs=20, applications=300, report=lambda line: None)
+    with db_engine.begin() as connection:
+        connection.execute(text("UPDATE applications SET status = 'accepted' WHERE id % 7 = 0"))
+        connection.execute(text("DELETE FROM applications WHERE id % 5 = 0"))
+    maintained = summaries(db_session)
+
+    with db_engine.begin() as connection:
+        rebuild_application_counts(connection)
+
+    assert maintained == summaries(db_session)
+    assert sum(row[-2] for row in maintained['job_application_counts']) == db_session.query(Application).count()
+
+def test_ensure_backfills_existing_applications(db_session, people):
+    (job, _), (alice, _) = people
+    uninstall_application_counts(db_session.connection())
+    db_session.add(Application(user_id=alice.id, job_id=job.id, status="interviewing"))
+    db_session.flush()
+
+    assert ensure_application_counts(db_session.connection()) is True
+    assert application_counts(db_session, Job, job.id)['interviewing'] == 1
+
+def test_ensure_restores_any_missing_trigger(db_session, people):
+    (job, _), (alice, _) = people
+    application = Application(user_id=alice.id, job_id=job.id, status="applied")
+    db_session.add(application)
+    db_session.flush()
+    db_session.execute(text("DROP TRIGGER application_counts_after_update"))
+    application.status = "offered"
+    db_session.flush()
+
+    assert ensure_application_counts(db_session.connection()) is True
+    assert ensure_application_counts(db_session.connection()) is False
+    assert application_counts(db_session, Job, job.id)['offered'] == 1
+    application.status = "accepted"
+    db_session.flush()
+    assert application_counts(db_session, Job, job.id)['accepted'] == 1
+
+def test_grouped_counts_agree_with_the_summaries(db_engine, db_session):
+    # grouped_counts is what application_counts reads on backends without the triggers
+    bulk_seed(db_engine, users=10, companies=2, jobs=8, applications=60, report=lambda line: None)
+
+    for model, ids in ((Job, range(1, 10)), (User, range(1, 12))):
+        for record_id in ids:
+            assert grouped_counts(db_session, model, record_id) == summary_counts(db_session, model, record_id)
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import text
+
+from lib.dashboard import summary_funnel, grouped_funnel, funnel_totals
+from lib.models import Company, Job
+from lib.seed import bulk_seed
+
+def snapshot(funnels):
+    return sorted((funnel.job_id, funnel.name, funnel.counts, round(funnel.days_open or 0, 3)) for funnel in funnels)
+
+def test_summary_and_group_by_funnels_agree(db_engine, db_session):
+    bulk_seed(db_engine, users=40, companies=2, jobs=15, applications=400, report=lambda line: None)
+    with db_engine.begin() as connection:
+        connection.execute(text("UPDATE applications SET date = datetime('now', '-' || (id % 30) || ' days')"))
+        connection.execute(text("UPDATE applications SET status = 'applied' WHERE id % 4 = 0"))
+        connection.execute(text("DELETE FROM applications WHERE id % 9 = 0"))
+    company_id = db_session.query(Job.company_id).first()[0]
+
+    summary = summary_funnel(db_session, company_id)
+
+    assert snapshot(summary) == snapshot(grouped_funnel(db_session, company_id))
+    assert {funnel.job_id for funnel in summary} == {job_id for (job_id,) in db_session.query(Job.id).filter(Job.company_id == company_id)}
+
+def test_jobs_without_applications_have_an_empty_funnel(db_session):
+    company = Company(name="Acme", industry="Tech", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    db_session.add(Job(name="Engineer", salary=1, company_id=company.id))
+    db_session.commit()
+
+    (funnel,) = summary_funnel(db_session, company.id)
+    totals = funnel_totals([funnel])
+
+    assert (funnel.total, funnel.days_open, funnel.rate(funnel.offers)) == (0, None, 0.0)
+    assert (totals.total, totals.days_open) == (0, None)
+
+def test_totals_weight_days_open_by_open_applications():
+    from lib.dashboard import JobFunnel
+    counts = dict(applied=0, interviewing=0, rejected=0, offered=0, accepted=0)
+    busy = JobFunnel(1, "Busy", {**counts, 'applied': 3}, 10.0)
+    quiet = JobFunnel(2, "Quiet", {**counts, 'interviewing': 1, 'accepted': 1}, 2.0)
+
+    totals = funnel_totals([busy, quiet])
+
+    assert totals.total == 5 and totals.interviewed == 2
+    assert totals.days_open == pytest.approx(8.0)
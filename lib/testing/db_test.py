@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy import text
+
+from lib.db import create_engine_for
+
+def pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+def test_throughput_profile_applies_pragmas_to_each_connection(tmp_path):
+    engine = create_engine_for(f"sqlite:///{tmp_path / 'fast.db'}", 'throughput')
+
+    assert pragma(engine, 'journal_mode') == 'wal'
+    assert pragma(engine, 'synchronous') == 1  # NORMAL
+    assert pragma(engine, 'temp_store') == 2  # MEMORY
+    assert pragma(engine, 'cache_size') == -65536
+    assert pragma(engine, 'busy_timeout') == 5000
+
+def test_default_profile_leaves_sqlite_defaults(tmp_path):
+    engine = create_engine_for(f"sqlite:///{tmp_path / 'plain.db'}")
+
+    assert pragma(engine, 'journal_mode') == 'delete'
+    assert pragma(engine, 'synchronous') == 2  # FULL
+
+def test_unknown_profile_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        create_engine_for(f"sqlite:///{tmp_path / 'x.db'}", 'turbo')
@@ -0,0 +1,66 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from lib.exports import export_rows
+from lib.models import Company, Job, User, Application
+
+@pytest.fixture
+def applications(db_session):
+    company = Company(name="Acme", industry="Tech", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    job = Job(name="Engineer", salary=100000, company_id=company.id)
+    users = [User(name=f"User {i}", email=f"user{i}@example.com", mobile="759233322", role="applicant") for i in range(5)]
+    db_session.add_all([job] + users)
+    db_session.flush()
+    db_session.add_all([Application(user_id=user.id, job_id=job.id, status="applied") for user in users])
+    db_session.commit()
+
+def test_export_users_to_csv_in_batches(db_engine, applications, tmp_path, query_counter):
+    path = tmp_path / "users.csv"
+    with db_engine.connect() as connection:
+        rows, _ = export_rows(connection, 'users', str(path), batch_size=2)
+
+    records = list(csv.DictReader(path.open()))
+    assert rows == 5 and len(records) == 5
+    assert records[0]['email'] == "user0@example.com"
+    assert len(query_counter) == 1
+
+def test_export_application_view_to_gzipped_jsonl(db_engine, applications, tmp_path):
+    path = tmp_path / "applications.jsonl.gz"
+    with db_engine.connect() as connection:
+        export_rows(connection, 'application-view', str(path), compression='gzip')
+
+    records = [json.loads(line) for line in gzip.open(path, 'rt')]
+    assert [record['user_name'] for record in records] == [f"User {i}" for i in range(5)]
+    assert {(record['job_name'], record['company_name'], record['status']) for record in records} == {("Engineer", "Acme", "applied")}
+    assert records[0]['date'][:4].isdigit()
+
+def test_gzip_export_to_stdout_is_compressed(db_engine, applications, monkeypatch):
+    import io
+    import sys
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    with db_engine.connect() as connection:
+        rows, _ = export_rows(connection, 'users', '-', 'csv', compression='gzip')
+
+    lines = gzip.decompress(stdout.buffer.getvalue()).decode().splitlines()
+    assert rows == 5 and len(lines) == 6
+    assert "user0@example.com" in lines[1]
+
+def test_export_jobs_to_parquet(db_engine, applications, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "jobs.parquet"
+    with db_engine.connect() as connection:
+        export_rows(connection, 'jobs', str(path), compression='zstd', batch_size=1)
+
+    table = pq.read_table(path)
+    assert table.column('name').to_pylist() == ["Engineer"]
+    assert str(table.schema.field('salary').type) == 'int64'
+
+def test_text_exports_reject_parquet_codecs(db_engine, tmp_path):
+    with db_engine.connect() as connection, pytest.raises(ValueError):
+        export_rows(connection, 'users', str(tmp_path / "users.csv"), compression='snappy')
@@ -0,0 +1,128 @@
+import gzip
+import json
+
+import pytest
+from sqlalchemy import text
+
+from lib.imports import import_file, import_rows
+from lib.models import Company, Job
+
+@pytest.fixture
+def acme(db_session):
+    company = Company(name="Acme", industry="Tech", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.commit()
+    return company.id
+
+def test_import_companies_from_csv(db_engine, db_session, tmp_path):
+    path = tmp_path / "companies.csv"
+    path.write_text(
+        "name,industry,website\n"
+        "Acme,Tech,https://acme.example.com\n"
+        "Globex,Energy,globex.example.com\n"
+        " Initech ,Software,http://initech.example.com\n"
+    )
+
+    report = import_file(db_engine, Company, str(path), chunk_size=2)
+
+    assert (report.received, report.inserted, report.rejected) == (3, 2, 1)
+    assert report.errors == [(2, "Website must start with http:// or https://")]
+    assert sorted(name for (name,) in db_session.query(Company._name)) == ["Acme", "Initech"]
+
+def test_list_valued_fields_reject_only_their_row(db_engine, db_session, tmp_path):
+    path = tmp_path / "companies.jsonl"
+    path.write_text(
+        '{"name": ["Bad"], "industry": "Tech", "website": "https://bad.example.com"}\n'
+        '{"name": "Globex", "industry": {"sector": "Energy"}, "website": "https://globex.example.com"}\n'
+        '{"name": "Initech", "industry": "Software", "website": "https://initech.example.com"}\n'
+    )
+
+    report = import_file(db_engine, Company, str(path))
+
+    assert (report.received, report.inserted, report.rejected) == (3, 1, 2)
+    assert report.errors == [(1, "Company name cannot be empty."), (2, "Industry cannot be empty.")]
+    assert [name for (name,) in db_session.query(Company._name)] == ["Initech"]
+
+def test_import_jobs_resolves_company_names(db_engine, db_session, acme, tmp_path):
+    records = [
+        {'name': "Engineer", 'description': "Build", 'location': "Nairobi", 'salary': 90000, 'type': "Full-Time", 'company': "acme"},
+        {'name': "Analyst", 'description': "Count", 'location': "Kisumu", 'salary': "85000.4", 'type': "contract", 'company_id': acme},
+        {'name': "Ghost", 'description': "Haunt", 'location': "Nowhere", 'salary': 1, 'type': "contract", 'company': "Umbrella"},
+        {'name': "Orphan", 'description': "Wander", 'location': "Nowhere", 'salary': 1, 'type': "contract"},
+        {'name': "Cheap", 'description': "Work", 'location': "Nairobi", 'salary': -1, 'type': "contract", 'company': "Acme"},
+    ]
+    path = tmp_path / "jobs.jsonl.gz"
+    with gzip.open(path, 'wt') as feed:
+        for record in records:
+            feed.write(json.dumps(record) + "\n")
+        feed.write("not json\n")
+
+    report = import_file(db_engine, Job, str(path))
+
+    assert (report.received, report.inserted, report.rejected) == (6, 2, 4)
+    assert [reason for _, reason in report.errors] == [
+        "Company 'Umbrella' does not exist.",
+        "Each job needs a company or company_id.",
+        "Salary must be a positive number.",
+        "Malformed record.",
+    ]
+    jobs = db_session.query(Job._name, Job._salary, Job._type, Job.company_id).order_by(Job.id).all()
+    assert jobs == [("Engineer", 90000, "full-time", acme), ("Analyst", 85000, "contract", acme)]
+
+def test_import_jobs_from_parquet(db_engine, db_session, acme, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    path = tmp_path / "jobs.parquet"
+    pq.write_table(pa.table({
+        'name': ["Engineer", "Designer"],
+        'description': ["Build", "Draw"],
+        'location': ["Nairobi", "Mombasa"],
+        'salary': [90000, 70000],
+        'type': ["full-time", "internship"],
+        'company_id': [acme, acme],
+    }), path)
+
+    report = import_file(db_engine, Job, str(path))
+
+    assert (report.inserted, report.rejected) == (2, 0)
+    assert db_session.query(Job).count() == 2
+
+def test_import_writes_one_insert_per_chunk(db_engine, query_counter, acme):
+    rows = [{'name': f"Job {i}", 'description': "d", 'location': "l", 'salary': 1, 'type': "contract", 'company_id': acme} for i in range(10)]
+
+    import_rows(db_engine, Job, rows, chunk_size=4)
+
+    assert sum(statement.startswith("INSERT INTO jobs (") for statement in query_counter) == 3
+
+def test_imported_jobs_are_searchable(db_engine, db_session, acme):
+    from lib.search import search_jobs
+    rows = [{'name': "Rust Developer", 'description': "Systems work", 'location': "Remote", 'salary': 1, 'type': "contract", 'company': "Acme"}]
+
+    import_rows(db_engine, Job, rows)
+    import_rows(db_engine, Job, rows)
+
+    assert [row[1] for row in search_jobs(db_session, "rust acme")] == ["Rust Developer", "Rust Developer"]
+    trigger = db_session.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts_after_insert'")).first()
+    assert trigger is not None
+
+def insert_trigger(connection):
+    return connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts_after_insert'")).first()
+
+def test_failed_chunk_keeps_the_index_trigger(db_engine, acme):
+    from lib.search import deferred_job_indexing
+    job = {'name': "Engineer", 'description': "d", 'location': "l", 'salary': 1, 'type': "contract", 'company_id': acme}
+
+    with pytest.raises(RuntimeError), db_engine.begin() as connection:
+        with deferred_job_indexing(connection):
+            connection.execute(Job.__table__.insert(), [job])
+            with db_engine.connect() as other:
+                # the drop isn't committed, so other connections still have the trigger
+                assert insert_trigger(other) is not None
+            raise RuntimeError("chunk failed")
+
+    with db_engine.begin() as connection:
+        assert insert_trigger(connection) is not None
+        with pytest.raises(RuntimeError), deferred_job_indexing(connection):
+            raise RuntimeError("handled by the caller, who commits anyway")
+    with db_engine.connect() as connection:
+        assert insert_trigger(connection) is not None
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import text
+
+from lib.models import Job, Application
+from lib.queries import job_rows, filter_jobs
+
+def query_plan(session, query):
+    sql = str(query.statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True}))
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+@pytest.mark.parametrize("build, index", [
+    (lambda s: s.query(Application).filter(Application._user_id == 1), "ix_applications_user_id_job_id"),
+    (lambda s: s.query(Application).filter(Application._job_id == 1), "ix_applications_job_id_status"),
+    (lambda s: s.query(Application.id).filter(Application._job_id == 1, Application._status == "applied"), "ix_applications_job_id_status"),
+    (lambda s: s.query(Job).filter(Job.company_id == 1), "ix_jobs_company_id"),
+    (lambda s: s.query(Job).filter(Job._type == "contract"), "ix_jobs_type"),
+    (lambda s: s.query(Job).filter(Job._location == "Remote"), "ix_jobs_location"),
+    (lambda s: s.query(Job).filter(Job._salary.between(50000, 90000)), "ix_jobs_salary"),
+    (lambda s: filter_jobs(job_rows(s), min_salary=50000, max_salary=90000).order_by(Job.id).limit(50), "ix_jobs_salary"),
+    (lambda s: filter_jobs(job_rows(s), types=["contract"], company="3").order_by(Job.id).limit(50), "ix_jobs_"),
+])
+def test_hot_queries_use_an_index(db_session, build, index):
+    plan = query_plan(db_session, build(db_session))
+
+    assert f"USING INDEX {index}" in plan or f"USING COVERING INDEX {index}" in plan, plan
@@ -0,0 +1,64 @@
+import random
+
+import numpy as np
+import pytest
+
+from lib.job_index import JobIndex
+from lib.models import Company, Job
+from lib.queries import job_rows, filter_jobs
+
+def index():
+    # ids deliberately out of order; job 5 has no salary, job 6 no location
+    return JobIndex(
+        ids=[3, 1, 2, 6, 5, 4],
+        salary=[90000, 60000, 120000, 150000, np.nan, 75000],
+        type_codes=[0, 1, 0, 2, 1, 0], types=['full-time', 'contract', 'internship'],
+        location_codes=[0, 0, 1, -1, 1, 1], locations=['Nairobi', 'Remote'],
+        company_ids=[10, 10, 20, 20, 10, -1],
+    )
+
+def test_salary_range_uses_inclusive_bounds_and_skips_missing_salaries():
+    assert index().search(min_salary=75000, max_salary=120000).tolist() == [2, 3, 4]
+    assert index().search(min_salary=100000).tolist() == [2, 6]
+    assert index().search(max_salary=60000).tolist() == [1]
+
+def test_categories_combine_with_any_of_and_all_filters():
+    jobs = index()
+    assert jobs.search(types=['Full-Time', 'internship']).tolist() == [2, 3, 4, 6]
+    assert jobs.search(types=['full-time'], locations=['Remote']).tolist() == [2, 4]
+    assert jobs.search(types=['full-time'], locations=['Remote'], max_salary=100000).tolist() == [4]
+    assert jobs.search(locations=['Atlantis']).tolist() == []
+    assert jobs.search(company_ids=[10]).tolist() == [1, 3, 5]
+    assert jobs.count(types=['contract']) == 2
+
+def test_paging_after_an_id():
+    assert index().search(after_id=2, limit=2).tolist() == [3, 4]
+
+def test_inverted_salary_range_is_rejected():
+    with pytest.raises(ValueError):
+        index().search(min_salary=2, max_salary=1)
+
+def test_index_agrees_with_the_sql_filters(db_session):
+    rng = random.Random(3)
+    companies = [Company(name=f"Company {i}", industry="Tech", website="https://example.com") for i in range(3)]
+    db_session.add_all(companies)
+    db_session.flush()
+    db_session.add_all(
+        Job(name=f"Job {i}", salary=rng.randrange(30000, 200000, 5000), type=rng.choice(['full-time', 'contract']),
+            location=rng.choice(['Nairobi', 'Remote', 'Mombasa']), company_id=rng.choice(companies).id)
+        for i in range(200)
+    )
+    db_session.commit()
+    jobs = JobIndex.load(db_session)
+
+    for filters in (
+        {'min_salary': 80000, 'max_salary': 150000},
+        {'types': ['contract'], 'locations': ['Remote', 'Mombasa']},
+        {'min_salary': 100000, 'types': ['full-time'], 'company': str(companies[1].id)},
+    ):
+        expected = [row[0] for row in filter_jobs(job_rows(db_session), **filters).order_by(Job.id)]
+        company = filters.pop('company', None)
+        in_memory = jobs.search(company_ids=[int(company)] if company else (), **filters)
+        assert in_memory.tolist() == expected
+
+    assert [row[0] for row in filter_jobs(job_rows(db_session), company="company 2").order_by(Job.id)] == jobs.search(company_ids=[companies[2].id]).tolist()
@@ -0,0 +1,80 @@
+import numpy as np
+from sqlalchemy import text
+
+from lib.models import Company, Job, User, Application
+from lib.matching import JobFeatures, Preferences, rank_jobs, job_feed
+
+def features():
+    # ids 1..6: (salary, type, location, industry)
+    return JobFeatures(
+        ids=[1, 2, 3, 4, 5, 6],
+        salary=[60000, 120000, 150000, np.nan, 90000, 200000],
+        type_codes=[0, 1, 0, 2, 1, -1], types=['full-time', 'contract', 'internship'],
+        location_codes=[0, 0, 1, 1, 0, 1], locations=['Nairobi', 'Remote'],
+        industry_codes=[0, 1, 1, 0, 0, 1], industries=['Finance', 'Technology'],
+    )
+
+def ids(ranked):
+    return [job_id for job_id, _ in ranked]
+
+def test_explicit_preferences_rank_matching_jobs_first():
+    ranked = rank_jobs(features(), Preferences(min_salary=100000, types=['Contract'], locations=['Nairobi']), top_k=2)
+
+    assert ids(ranked) == [2, 5]
+    assert ranked[0][1] > ranked[1][1]
+
+def test_applied_jobs_are_excluded_and_history_shapes_the_score():
+    # rejected from a Technology contract job, offered a Finance full-time job
+    ranked = rank_jobs(features(), Preferences(), history_job_ids=[2, 1], history_weights=[-1.0, 1.5], top_k=6)
+
+    # 5 shares the offered job's location and industry; 6 is far off the liked salary
+    assert ids(ranked) == [5, 4, 3, 6]
+
+def test_top_k_is_capped_by_candidates():
+    assert len(rank_jobs(features(), Preferences(), history_job_ids=[1, 2, 3, 99], history_weights=[1, 1, 1, 1], top_k=10)) == 3
+
+def test_job_feed_reads_features_and_history_from_the_database(db_session):
+    company = Company(name="Acme", industry="Technology", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    jobs = [
+        Job(name=f"Job {i}", location="Remote", description="Work", salary=100000 + i, type="contract", company_id=company.id)
+        for i in range(5)
+    ]
+    user = User(name="Alice", email="alice@example.com", mobile="759233322", role="applicant")
+    db_session.add_all(jobs + [user])
+    db_session.flush()
+    db_session.add(Application(user_id=user.id, job_id=jobs[0].id, status="applied"))
+    db_session.commit()
+
+    ranked = job_feed(db_session, user.id, top_k=10)
+
+    assert sorted(ids(ranked)) == sorted(job.id for job in jobs[1:])
+
+def test_feature_cache_reloads_only_after_job_or_company_changes(db_session):
+    from lib.matching import FeatureCache
+    company = Company(name="Acme", industry="Technology", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    jobs = [Job(name=f"Job {i}", salary=100000, type="contract", company_id=company.id) for i in range(3)]
+    db_session.add_all(jobs)
+    db_session.commit()
+    # stamps in the current second would count as changes after the first load
+    for table in ('companies', 'jobs'):
+        db_session.execute(text(f"UPDATE {table} SET updated_at = '2026-01-01 12:00:00'"))
+    db_session.commit()
+    cache = FeatureCache()
+
+    first = cache.get(db_session)
+    assert cache.get(db_session) is first and cache.loads == 1
+
+    jobs[0].salary = 50000
+    db_session.commit()
+    assert cache.get(db_session).salary[0] == 50000
+    company.industry = "Finance"
+    db_session.commit()
+    assert cache.get(db_session).industries == ["Finance"]
+    db_session.delete(jobs[2])
+    db_session.commit()
+    assert list(cache.get(db_session).ids) == [jobs[0].id, jobs[1].id]
+    assert cache.loads == 4
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from lib.counters import application_counts
+from lib.models import Company, Job, User, Application
+from lib.purge import purge, purge_orphans, require_foreign_keys
+from lib.search import search_jobs
+
+@pytest.fixture
+def acme(db_session):
+    companies = [Company(name=name, industry="Tech", website="https://example.com") for name in ("Acme", "Globex")]
+    db_session.add_all(companies)
+    db_session.flush()
+    jobs = [Job(name=f"Welder {i}", salary=1, company_id=companies[i % 2].id) for i in range(4)]
+    users = [User(name=f"User {i}", email=f"user{i}@example.com", mobile="759233322", role="applicant") for i in range(3)]
+    db_session.add_all(jobs + users)
+    db_session.flush()
+    db_session.add_all(Application(user_id=user.id, job_id=job.id, status="applied") for job in jobs for user in users)
+    db_session.commit()
+    return companies[0].id, users[0].id
+
+def test_purging_a_company_is_one_delete(db_engine, db_session, acme, query_counter):
+    company_id, user_id = acme
+
+    assert purge(db_engine, Company, [company_id]) == 1
+
+    deletes = [statement for statement in query_counter if statement.startswith("DELETE")]
+    assert deletes == ["DELETE FROM companies WHERE companies.id IN (?)"]
+    assert db_session.query(Job).count() == 2
+    assert db_session.query(Application).count() == 6
+    assert application_counts(db_session, User, user_id)['total'] == 2
+    assert db_session.execute(text("SELECT COUNT(*) FROM job_application_counts")).scalar() == 2
+    assert len(search_jobs(db_session, "welder")) == 2
+
+def test_orm_delete_leaves_children_to_the_database(db_session, acme, query_counter):
+    company_id, _ = acme
+    company = db_session.get(Company, company_id)
+
+    db_session.delete(company)
+    db_session.commit()
+
+    assert not any("FROM jobs" in statement or "FROM applications" in statement for statement in query_counter)
+    assert db_session.query(Application).count() == 6
+
+def test_foreign_keys_are_switched_on_for_plain_engines(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plain.db'}")
+    with engine.begin() as connection:
+        assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar() == 0
+        require_foreign_keys(connection)
+        assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+    engine.dispose()
+
+def test_orphans_left_by_unenforced_deletes_are_purged(db_engine, db_session, acme):
+    company_id, user_id = acme
+    with db_engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        connection.execute(text("DELETE FROM companies WHERE id = :id"), {'id': company_id})
+        connection.execute(text("DELETE FROM jobs WHERE id = (SELECT MAX(id) FROM jobs)"))
+        connection.commit()
+        # pooled connections keep their PRAGMAs
+        connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+
+    assert purge_orphans(db_engine) == {'jobs': 2, 'applications': 3}
+    assert db_session.query(Job).count() == 1
+    assert db_session.query(Application).count() == 3
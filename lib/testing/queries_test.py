@@ -0,0 +1,69 @@
+from lib.models import User, Company, Job, Application
+from lib.queries import job_rows, application_rows, keyset_pages
+
+def seed_applications(session, count):
+    company = Company(name="Google", industry="Tech", website="https://google.com")
+    session.add(company)
+    session.flush()
+
+    users = [
+        User(name=f"User {i}", email=f"user{i}@example.com", mobile="759233322", role="applicant")
+        for i in range(count)
+    ]
+    jobs = [Job(name=f"Job {i}", salary=100000, company_id=company.id) for i in range(count)]
+    session.add_all(users + jobs)
+    session.flush()
+
+    session.add_all([
+        Application(user_id=user.id, job_id=job.id, status="applied")
+        for user, job in zip(users, jobs)
+    ])
+    session.commit()
+    session.expunge_all()
+
+def test_application_rows_is_a_single_query(db_session, query_counter):
+    seed_applications(db_session, 25)
+    query_counter.clear()
+
+    rows = application_rows(db_session).all()
+
+    assert len(rows) == 25
+    assert len(query_counter) == 1, query_counter
+
+def test_application_rows_include_user_and_job_names(db_session):
+    seed_applications(db_session, 3)
+
+    app_id, user_id, user_name, job_id, job_name, status, date = application_rows(db_session).first()
+
+    assert user_name == "User 0"
+    assert job_name == "Job 0"
+    assert status == "applied"
+    assert date is not None
+
+def test_job_rows_is_a_single_query(db_session, query_counter):
+    seed_applications(db_session, 10)
+    query_counter.clear()
+
+    rows = job_rows(db_session).all()
+
+    assert len(rows) == 10
+    assert all(row[-1] == "Google" for row in rows)
+    assert len(query_counter) == 1, query_counter
+
+def test_keyset_pages_walks_the_table_in_batches(db_session, query_counter):
+    seed_applications(db_session, 10)
+    query_counter.clear()
+
+    pages = list(keyset_pages(application_rows(db_session), Application.id, batch_size=4))
+
+    assert [len(page) for page in pages] == [4, 4, 2]
+    assert [row[0] for page in pages for row in page] == sorted(row[0] for page in pages for row in page)
+    assert len(query_counter) == 3
+
+def test_keyset_pages_respects_cursor_and_limit(db_session):
+    seed_applications(db_session, 10)
+    ids = [row[0] for row in application_rows(db_session)]
+
+    pages = list(keyset_pages(application_rows(db_session), Application.id, after_id=ids[2], limit=5, batch_size=2))
+
+    assert [row[0] for page in pages for row in page] == ids[3:8]
@@ -0,0 +1,56 @@
+import pytest
+
+from lib.models import Company, Job
+from lib.search import search_jobs, ensure_job_search, uninstall_job_search, match_expression
+
+@pytest.fixture
+def jobs(db_session):
+    company = Company(name="Acme Robotics", industry="Tech", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    jobs = [
+        Job(name="Python Developer", location="Nairobi", description="Build APIs", salary=90000, type="full-time", company_id=company.id),
+        Job(name="Data Analyst", location="Remote", description="Python and SQL reporting", salary=70000, type="contract", company_id=company.id),
+        Job(name="Accountant", location="Mombasa", description="Ledgers", salary=60000, type="part-time", company_id=company.id),
+    ]
+    db_session.add_all(jobs)
+    db_session.commit()
+    return jobs
+
+def names(results):
+    return [row[1] for row in results]
+
+def test_search_ranks_title_matches_first(db_session, jobs):
+    assert names(search_jobs(db_session, "python")) == ["Python Developer", "Data Analyst"]
+
+def test_search_covers_location_and_company(db_session, jobs):
+    assert names(search_jobs(db_session, "mombasa")) == ["Accountant"]
+    assert len(search_jobs(db_session, "acme")) == 3
+
+def test_index_follows_updates_and_deletes(db_session, jobs):
+    jobs[2].name = "Senior Python Accountant"
+    db_session.delete(jobs[0])
+    db_session.commit()
+
+    assert names(search_jobs(db_session, "python")) == ["Senior Python Accountant", "Data Analyst"]
+    assert search_jobs(db_session, "developer") == []
+
+def test_index_follows_company_renames(db_session, jobs):
+    company = db_session.get(Company, jobs[0].company_id)
+    company.name = "Globex"
+    db_session.commit()
+
+    assert len(search_jobs(db_session, "globex")) == 3
+    assert search_jobs(db_session, "acme") == []
+
+def test_ensure_backfills_existing_jobs(db_session, jobs):
+    uninstall_job_search(db_session.connection())
+
+    assert ensure_job_search(db_session.connection()) is True
+    assert ensure_job_search(db_session.connection()) is False
+    assert len(search_jobs(db_session, "acme")) == 3
+
+def test_match_expression_quotes_user_input():
+    assert match_expression('python "OR* dev') == '"python" "OR" "dev"'
+    with pytest.raises(ValueError):
+        match_expression('"*')
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import func, text
+
+from lib.models import User, Company, Job, Application
+from lib.seed import bulk_seed
+
+def test_bulk_seed_inserts_requested_rows(db_engine, db_session):
+    bulk_seed(db_engine, users=30, companies=5, jobs=40, applications=100, batch_size=7, report=lambda line: None)
+
+    assert db_session.query(User).count() == 30
+    assert db_session.query(Company).count() == 5
+    assert db_session.query(Job).count() == 40
+    assert db_session.query(Application).count() == 100
+    assert db_session.query(func.count(func.distinct(User._email))).scalar() == 30
+
+def test_bulk_seed_references_existing_rows(db_engine, db_session):
+    bulk_seed(db_engine, users=10, companies=3, jobs=10, applications=50, report=lambda line: None)
+    bulk_seed(db_engine, users=10, companies=3, jobs=10, applications=50, clear=False, report=lambda line: None)
+
+    orphan_jobs = db_session.query(Job).outerjoin(Company, Job.company_id == Company.id).filter(Company.id.is_(None))
+    orphan_apps = (
+        db_session.query(Application)
+        .outerjoin(User, Application._user_id == User.id)
+        .outerjoin(Job, Application._job_id == Job.id)
+        .filter((User.id.is_(None)) | (Job.id.is_(None)))
+    )
+    assert db_session.query(Application).count() == 100
+    assert orphan_jobs.count() == 0
+    assert orphan_apps.count() == 0
+
+def test_bulk_seed_rebuilds_job_search(db_engine, db_session):
+    bulk_seed(db_engine, users=0, companies=2, jobs=25, applications=0, report=lambda line: None)
+
+    assert db_session.execute(text("SELECT count(*) FROM jobs_fts")).scalar() == 25
+    assert db_session.execute(text("SELECT count(*) FROM sqlite_master WHERE name = 'jobs_fts_after_insert'")).scalar() == 1
+
+def test_bulk_seed_uses_each_user_job_pair_once(db_engine, db_session):
+    bulk_seed(db_engine, users=4, companies=1, jobs=5, applications=20, report=lambda line: None)
+
+    pairs = db_session.query(Application._user_id, Application._job_id).distinct().count()
+    assert pairs == 20
+    with pytest.raises(ValueError, match="at most 20 applications"):
+        bulk_seed(db_engine, users=4, companies=1, jobs=5, applications=21, report=lambda line: None)
+
+def test_failed_seed_keeps_rows_and_triggers(db_engine, db_session, monkeypatch):
+    from lib import seed
+    from lib.search import search_jobs
+    bulk_seed(db_engine, users=5, companies=2, jobs=5, applications=5, report=lambda line: None)
+    triggers = "SELECT name FROM sqlite_master WHERE type = 'trigger' ORDER BY name"
+    before = db_session.execute(text(triggers)).scalars().all()
+    db_session.rollback()
+
+    def broken_batch(*args):
+        raise RuntimeError("generator failed")
+    monkeypatch.setattr(seed, 'application_batch', broken_batch)
+    with pytest.raises(RuntimeError):
+        bulk_seed(db_engine, users=5, companies=2, jobs=5, applications=5, report=lambda line: None)
+
+    assert db_session.execute(text(triggers)).scalars().all() == before
+    assert db_session.query(Job).count() == 5
+    assert db_session.query(Application).count() == 5
+    db_session.add(Job(name="Welder", salary=1, company_id=db_session.query(Company.id).first()[0]))
+    db_session.commit()
+    assert [row[1] for row in search_jobs(db_session, "welder")] == ["Welder"]
+
+def test_reseeding_leaves_no_tombstones(db_engine, db_session):
+    bulk_seed(db_engine, users=10, companies=3, jobs=10, applications=20, report=lambda line: None)
+    bulk_seed(db_engine, users=10, companies=3, jobs=10, applications=20, report=lambda line: None)
+
+    assert db_session.execute(text("SELECT count(*) FROM tombstones")).scalar() == 0
+    db_session.delete(db_session.get(Job, 1))
+    db_session.commit()
+    assert db_session.execute(text("SELECT record_id FROM tombstones WHERE table_name = 'jobs'")).scalars().all() == [1]
+
+def test_seed_refuses_databases_without_the_application_index(db_engine, db_session):
+    with db_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_applications_user_id_job_id"))
+
+    with pytest.raises(ValueError, match="Upgrade it first"):
+        bulk_seed(db_engine, users=2, companies=1, jobs=2, applications=2, report=lambda line: None)
+    assert db_session.query(User).count() == 0
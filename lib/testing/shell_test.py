@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+from lib import db
+from lib.base import Base
+import lib.models  # noqa: F401  (registers the tables for create_all)
+from lib.shell import CliShell
+
+def run_shell(script):
+    from app import cli
+    out = io.StringIO()
+    CliShell(cli, stdin=io.StringIO(script), stdout=out).cmdloop(intro="")
+    return out.getvalue()
+
+def test_shell_reuses_one_engine_and_times_commands(capsys):
+    Base.metadata.create_all(db.get_engine())
+    engine = db.get_engine()
+
+    output = run_shell("list-users --limit 1\ntiming on\nlist-companies\nbogus\nexit\n")
+
+    assert db.get_engine() is engine
+    assert output.count("⏱") == 1
+    assert "Unknown command 'bogus'" in output
+    assert "Users" in capsys.readouterr().out
+
+def test_shell_completes_commands_and_options():
+    from app import cli
+    shell = CliShell(cli, stdin=io.StringIO(), stdout=io.StringIO())
+
+    assert shell.completenames("list-j") == ["list-jobs"]
+    assert "--after-id" in shell.completedefault("--a", "list-jobs --a", 10, 13)
+
+def test_tab_completion_completes_whole_hyphenated_words(monkeypatch):
+    readline = pytest.importorskip("readline")
+    from app import cli
+    shell = CliShell(cli)
+    delims = readline.get_completer_delims()
+    shell.preloop()
+
+    def complete(line):
+        begidx = max(line.rfind(delim) for delim in readline.get_completer_delims()) + 1
+        monkeypatch.setattr(readline, "get_line_buffer", lambda: line)
+        monkeypatch.setattr(readline, "get_begidx", lambda: begidx)
+        monkeypatch.setattr(readline, "get_endidx", lambda: len(line))
+        matches = []
+        while (match := shell.complete(line[begidx:], len(matches))) is not None:
+            matches.append(match)
+        return matches
+
+    try:
+        assert complete("list-j") == ["list-jobs"]
+        assert "--after-id" in complete("list-jobs --a")
+        assert all(match.startswith("--") and not match.startswith("---") for match in complete("list-jobs --"))
+    finally:
+        readline.set_completer_delims(delims)
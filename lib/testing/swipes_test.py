@@ -0,0 +1,76 @@
+import io
+
+import pytest
+
+from lib.models import Company, Job, User, Application
+from lib.counters import application_counts
+from lib.swipes import application_upsert, ingest_swipes, read_swipes
+
+@pytest.fixture
+def ids(db_session):
+    company = Company(name="Acme", industry="Tech", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    jobs = [Job(name=f"Job {i}", salary=100000, company_id=company.id) for i in range(3)]
+    users = [User(name=f"User {i}", email=f"user{i}@example.com", mobile="759233322", role="applicant") for i in range(2)]
+    db_session.add_all(jobs + users)
+    db_session.commit()
+    return [user.id for user in users], [job.id for job in jobs]
+
+def test_ingest_records_right_swipes_and_skips_the_rest(db_engine, db_session, ids):
+    (u1, u2), (j1, j2, j3) = ids
+    db_session.add(Application(user_id=u1, job_id=j1, status="applied"))
+    db_session.commit()
+
+    report = ingest_swipes(db_engine, [
+        (u1, j1, "right"),          # already applied
+        (u1, j2, "right"),
+        (u1, j2, "like"),           # repeated in the input
+        (u1, j3, "left"),
+        (u2, j3, "interviewing"),
+        (999, j1, "right"),
+        (u2, 999, "right"),
+        ("abc", j1, "right"),
+        (u2, j1, "maybe"),
+        None,
+    ], chunk_size=3)
+
+    assert (report.received, report.inserted, report.passed, report.duplicates, report.rejected) == (10, 2, 1, 2, 5)
+    assert sorted(db_session.query(Application._user_id, Application._job_id, Application._status).all()) == sorted([
+        (u1, j1, "applied"), (u1, j2, "applied"), (u2, j3, "interviewing"),
+    ])
+    assert sorted(number for number, _ in report.errors) == [6, 7, 8, 9, 10]
+
+def test_non_integral_ids_are_rejected_not_truncated(db_engine, db_session, ids):
+    (u1, u2), (j1, j2, _) = ids
+
+    report = ingest_swipes(db_engine, read_swipes(io.StringIO(
+        f'{{"user_id": {u1}.9, "job_id": {j1}, "decision": "right"}}\n'
+        f'{{"user_id": true, "job_id": {j1}, "decision": "right"}}\n'
+        f'{{"user_id": "{u2}", "job_id": {j2}, "decision": "right"}}\n'
+    ), "jsonl"))
+
+    assert (report.inserted, report.rejected) == (1, 2)
+    assert db_session.query(Application._user_id, Application._job_id).all() == [(u2, j2)]
+
+def test_repeat_applications_upsert_onto_one_row(db_engine, db_session, ids):
+    (u1, _), (j1, _, _) = ids
+    with db_engine.begin() as connection:
+        connection.execute(application_upsert(connection), {'user_id': u1, 'job_id': j1, 'status': 'applied'})
+        connection.execute(application_upsert(connection), {'user_id': u1, 'job_id': j1, 'status': 'interviewing'})
+        skipped = connection.execute(
+            application_upsert(connection, update_status=False), {'user_id': u1, 'job_id': j1, 'status': 'rejected'})
+
+    assert skipped.rowcount == 0
+    assert db_session.query(Application._status).all() == [("interviewing",)]
+    assert application_counts(db_session, Job, j1)['total'] == 1
+    assert application_counts(db_session, Job, j1)['interviewing'] == 1
+
+def test_read_swipes_parses_jsonl_and_csv():
+    jsonl = io.StringIO('{"user_id": 1, "job_id": 2, "decision": "right"}\n\nnot json\n')
+    csv = io.StringIO("user_id,job_id,decision\n1,2,left\n")
+
+    assert list(read_swipes(jsonl, "jsonl")) == [(1, 2, "right"), None]
+    assert list(read_swipes(csv, "csv")) == [("1", "2", "left")]
+    with pytest.raises(ValueError):
+        list(read_swipes(io.StringIO(""), "xml"))
@@ -0,0 +1,74 @@
+import pytest
+
+from lib.cache import records
+from lib.counters import application_counts
+from lib.models import Company, Job, User, Application
+from lib.transitions import check_transition, read_ids, transition_job, transition_ids
+
+@pytest.fixture
+def jobs(db_session):
+    company = Company(name="Acme", industry="Tech", website="https://acme.example.com")
+    db_session.add(company)
+    db_session.flush()
+    jobs = [Job(name=f"Job {i}", salary=1, company_id=company.id) for i in range(2)]
+    users = [User(name=f"User {i}", email=f"user{i}@example.com", mobile="759233322", role="applicant") for i in range(9)]
+    db_session.add_all(jobs + users)
+    db_session.flush()
+    statuses = ["applied"] * 7 + ["interviewing"] * 2
+    db_session.add_all(Application(user_id=user.id, job_id=jobs[0].id, status=status) for user, status in zip(users, statuses))
+    db_session.add_all(Application(user_id=user.id, job_id=jobs[1].id, status="applied") for user in users[:3])
+    db_session.commit()
+    return [job.id for job in jobs]
+
+def statuses(session, job_id):
+    return sorted(status for status, in session.query(Application._status).filter(Application._job_id == job_id))
+
+def test_transition_job_updates_matching_rows_in_chunks(db_engine, db_session, jobs, query_counter):
+    closed, other = jobs
+
+    assert transition_job(db_engine, closed, "applied", "Rejected", chunk_size=3) == 7
+
+    updates = [statement for statement in query_counter if statement.startswith("UPDATE applications")]
+    assert len(updates) == 3
+    assert not any(statement.startswith("SELECT applications.id") for statement in query_counter)
+    assert statuses(db_session, closed) == ["interviewing"] * 2 + ["rejected"] * 7
+    assert statuses(db_session, other) == ["applied"] * 3
+    assert application_counts(db_session, Job, closed)['rejected'] == 7
+
+def test_transition_without_from_skips_rows_already_there(db_engine, db_session, jobs):
+    closed, _ = jobs
+    assert transition_job(db_engine, closed, None, "interviewing") == 7
+    assert transition_job(db_engine, closed, None, "interviewing") == 0
+
+def test_transition_without_from_resumes_after_the_last_chunk(db_engine, db_session, jobs, query_counter):
+    closed, other = jobs
+
+    assert transition_job(db_engine, closed, None, "interviewing", chunk_size=3) == 7
+
+    updates = [statement for statement in query_counter if statement.startswith("UPDATE applications")]
+    assert len(updates) == 3 and all("applications.id >" in statement for statement in updates)
+    assert statuses(db_session, closed) == ["interviewing"] * 9
+    assert statuses(db_session, other) == ["applied"] * 3
+
+def test_transition_ids_skips_other_statuses_and_unknown_ids(db_engine, db_session, jobs):
+    ids = [id for id, in db_session.query(Application.id).order_by(Application.id)]
+
+    assert transition_ids(db_engine, iter(ids[5:] + [9999]), "applied", "offered", chunk_size=2) == 5
+    assert sorted(status for status, in db_session.query(Application._status)).count("offered") == 5
+
+def test_transitions_are_validated_before_touching_the_database(db_engine, jobs, query_counter):
+    with pytest.raises(ValueError, match="Status must be one of"):
+        transition_job(db_engine, jobs[0], "applied", "ghosted")
+    with pytest.raises(ValueError, match="already 'rejected'"):
+        check_transition("Rejected", "rejected")
+    assert query_counter == []
+
+def test_read_ids_rejects_bad_lines():
+    assert list(read_ids(["1", "", "  2  # retry", "#header"])) == [1, 2]
+    with pytest.raises(ValueError, match="Line 2"):
+        list(read_ids(["1", "x"]))
+
+def test_cached_applications_are_dropped(db_engine, jobs):
+    records.entries[('applications', 1)] = ("stale", float("inf"))
+    transition_job(db_engine, jobs[0], "applied", "rejected")
+    assert ('applications', 1) not in records.entries
@@ -0,0 +1,104 @@
+import random
+import sys
+
+import pytest
+
+from lib import validators
+from lib.models import User, Company, Job, Application
+
+def test_setters_do_not_write_to_stdout(capsys):
+    User(name="Alice", email="alice@example.com", mobile="759233322", role="applicant")
+
+    assert capsys.readouterr().out == ""
+
+@pytest.mark.parametrize("validator, value, cleaned", [
+    (validators.email, "alice@example.com", "alice@example.com"),
+    (validators.mobile, "759233322", 759233322),
+    (validators.job_type, " Full-Time ", "full-time"),
+    (validators.status, "Offered", "offered"),
+    (validators.website, " https://example.com ", "https://example.com"),
+])
+def test_validators_return_cleaned_values(validator, value, cleaned):
+    assert validator(value) == cleaned
+
+@pytest.mark.parametrize("build, message", [
+    (lambda: User(email="not-an-email"), "Invalid email format."),
+    (lambda: User(mobile="12345"), "at least 9 digits"),
+    (lambda: User(mobile="phone"), "Mobile must be a valid number."),
+    (lambda: User(role="admin"), "Role must be either"),
+    (lambda: Job(type="gig"), "Job type must be one of: full-time, part-time, contract, internship."),
+    (lambda: Application(status="ghosted"), "Status must be one of"),
+])
+def test_setters_reject_invalid_values(build, message):
+    with pytest.raises(ValueError, match=message):
+        build()
+
+def test_validate_column_reports_errors_per_row():
+    cleaned, errors = validators.validate_column(validators.status, ["applied", "nope", None, "ACCEPTED"])
+
+    assert cleaned == ["applied", None, None, "accepted"]
+    assert errors[0] is None and errors[3] is None
+    assert errors[1].startswith("Status must be one of") and errors[2] == errors[1]
+
+EMAILS = ["alice@example.com", "a@b.co", "@example.com", "@a@b.co", "alice@example", "alice@.com",
+          "al ice@example.com", "alice@example.com\n", "", None, "a.b@c", "x@y.z.", "x@@y.z"]
+
+def test_batch_email_check_agrees_with_the_scalar_pattern():
+    result = validators.validate_batch(User, {'email': EMAILS})
+
+    expected = [validators.validate_column(validators.email, [email])[1][0] is not None for email in EMAILS]
+    assert result.columns['email'].tolist() == expected
+
+def test_validate_batch_flags_bad_rows_per_column():
+    records = [
+        {'name': "Engineer", 'location': "Nairobi", 'description': "Build", 'salary': 90000, 'type': "Full-Time"},
+        {'name': " ", 'location': "Nairobi", 'description': "Build", 'salary': "-5", 'type': "contract"},
+        {'name': "Analyst", 'location': "Kisumu", 'description': "Count", 'salary': "85000.50", 'type': "gig"},
+    ]
+
+    result = validators.validate_batch(Job, records)
+
+    assert result.invalid.tolist() == [False, True, True]
+    assert result.error_count == 2
+    assert result.reasons(1) == ["Job name cannot be empty.", "Salary must be a positive number."]
+    assert result.reasons(2) == ["Job type must be one of: full-time, part-time, contract, internship."]
+
+def test_validate_batch_only_checks_present_columns():
+    result = validators.validate_batch(Application, {'status': ["applied", "lost"], 'job_id': ["3", 0]})
+
+    assert set(result.columns) == {'status', 'job_id'}
+    assert result.invalid.tolist() == [False, True]
+    assert result.reasons(1) == ["job_id must be a valid numeric ID.", "Status must be one of: applied, interviewing, rejected, offered, accepted"]
+
+def test_whitespace_list_is_what_str_isspace_accepts():
+    assert set(validators.WHITESPACE) == {chr(c) for c in range(sys.maxunicode + 1) if chr(c).isspace()}
+
+FIXED_VALUES = [
+    None, "", " ", "0", "00", "7", " 7", "007", "-5", "+5", "5.5", "1.2.3", ".5", "5.", ".", "1e5", "1_000",
+    "\u0663\u0665", "\u00b2", "nan", "inf", 0, 7, -3, 10 ** 30, 0.0, -0.0, 2.5, -2.5, float('nan'), float('inf'),
+    True, False, "759233322", " 759233322 ", "75923332", "+254759233322", "7592 33322", 759233322, 759233322.0,
+    "9" * 40, "a@b.co", "@a.co", "a@.co", "a@b.", "a@b.c ", "a\u3000@b.co", "a@b@c.d", "x@y.z.",
+    "http://x", " https://x ", "ftp://x", "applicant", "Employer", "contract", " Full-Time ", "GIG",
+    "applied", "ACCEPTED", " applied", ["applied"], ("7",), {"a": 1},
+]
+
+ALPHABET = "aZ9 0.@-_+\t\n\xa0\u2003\u0663\u00b2\u0130"
+
+def scalar_error(model, column, value):
+    try:
+        setattr(model(), column, value)
+    except ValueError as error:
+        return str(error)
+    return None
+
+@pytest.mark.parametrize("model", [User, Company, Job, Application])
+def test_batch_and_scalar_validators_agree(model):
+    rng = random.Random(13)
+    values = FIXED_VALUES + [''.join(rng.choices(ALPHABET, k=rng.randint(0, 12))) for _ in range(400)]
+
+    for column in validators.BATCH_RULES[model.__tablename__]:
+        result = validators.validate_batch(model, {column: values})
+        for row, value in enumerate(values):
+            expected = scalar_error(model, column, value)
+            actual = result.reasons(row)
+            assert actual == ([expected] if expected else []), (column, value)
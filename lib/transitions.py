@@ -0,0 +1,103 @@
+"""Status changes for many applications at once.
+
+A transition (e.g. applied -> rejected) is validated once, then applied
+with set-based UPDATE statements of at most `chunk_size` rows, each in its
+own transaction, so closing a role with thousands of applicants neither
+loads ORM objects nor holds one long write lock. The counter triggers keep
+the per-job and per-user summaries in step, and lib.cache drops cached
+application rows as each UPDATE runs.
+"""
+import itertools
+
+from sqlalchemy import bindparam, select, update
+
+from lib import validators
+from lib.models import Application
+
+# Rows per UPDATE; also keeps ID lists well under SQLite's bound-parameter limit
+DEFAULT_CHUNK_SIZE = 5000
+
+def check_transition(from_status, to_status):
+    """Cleaned (from, to) statuses; `from_status` None means any other status."""
+    to_status = validators.status(to_status)
+    if from_status is not None:
+        from_status = validators.status(from_status)
+        if from_status == to_status:
+            raise ValueError(f"Applications are already '{to_status}'.")
+    return from_status, to_status
+
+def status_filter(from_status, to_status):
+    status = Application.__table__.c.status
+    if from_status is None:
+        return status.is_distinct_from(to_status)
+    return status == from_status
+
+def read_ids(lines, label="application"):
+    """Yield IDs from lines of text (blank lines and #-comments skipped)."""
+    for number, line in enumerate(lines, start=1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        if not line.isdigit():
+            raise ValueError(f"Line {number}: '{line}' is not a valid {label} ID.")
+        yield int(line)
+
+def transition_job(engine, job_id, from_status, to_status, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Move `job_id`'s applications from `from_status` to `to_status`; returns the count changed."""
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    from_status, to_status = check_transition(from_status, to_status)
+    applications = Application.__table__
+    condition = (applications.c.job_id == job_id) & status_filter(from_status, to_status)
+
+    if from_status is not None:
+        # Updated rows leave the (job_id, status) index range, so each pass takes the next chunk
+        chunk = select(applications.c.id).where(condition).order_by(applications.c.id).limit(chunk_size)
+        statement = update(applications).where(applications.c.id.in_(chunk.scalar_subquery())).values(status=to_status)
+        changed = 0
+        while True:
+            with engine.begin() as connection:
+                count = connection.execute(statement).rowcount
+            changed += count
+            if count < chunk_size:
+                return changed
+
+    # "Any other status" rows are spread through the job's applications; rows
+    # already in `to_status` would be rescanned on every pass, so resume after
+    # the last ID updated instead.
+    chunk = (select(applications.c.id).where(condition, applications.c.id > bindparam('after_id'))
+             .order_by(applications.c.id).limit(chunk_size))
+    statement = (update(applications).where(applications.c.id.in_(chunk.scalar_subquery()))
+                 .values(status=to_status).returning(applications.c.id))
+    changed, after_id = 0, 0
+    while True:
+        with engine.begin() as connection:
+            ids = connection.execute(statement, {'after_id': after_id}).scalars().all()
+        changed += len(ids)
+        if len(ids) < chunk_size:
+            return changed
+        after_id = max(ids)
+
+def transition_ids(engine, ids, from_status, to_status, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Move the applications in `ids` (any iterable) that are in `from_status` to `to_status`.
+
+    IDs that don't exist or are in another status are skipped. Returns the
+    count changed.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    from_status, to_status = check_transition(from_status, to_status)
+    applications = Application.__table__
+    ids = iter(ids)
+
+    changed = 0
+    while True:
+        chunk = list(itertools.islice(ids, chunk_size))
+        if not chunk:
+            return changed
+        with engine.begin() as connection:
+            changed += connection.execute(
+                update(applications)
+                .where(applications.c.id.in_(chunk), status_filter(from_status, to_status))
+                .values(status=to_status)
+            ).rowcount
@@ -0,0 +1,331 @@
+"""Field validators shared by the models and by bulk imports.
+
+Each validator takes a raw value and returns the cleaned value, raising
+ValueError with a user-facing message when it's invalid. Patterns are
+compiled once and allowed values are frozensets, so a check costs a
+lookup rather than rebuilding a list per assignment. Nothing here writes
+to stdout.
+"""
+import math
+import re
+
+EMAIL_PATTERN = re.compile(r'\S+@\S+\.\S+')
+MOBILE_MIN_DIGITS = 9
+
+# Tuples keep the order used in error messages; frozensets do the lookups
+ROLE_CHOICES = ('applicant', 'employer')
+JOB_TYPE_CHOICES = ('full-time', 'part-time', 'contract', 'internship')
+STATUS_CHOICES = ('applied', 'interviewing', 'rejected', 'offered', 'accepted')
+ROLES = frozenset(ROLE_CHOICES)
+JOB_TYPES = frozenset(JOB_TYPE_CHOICES)
+STATUSES = frozenset(STATUS_CHOICES)
+
+# Messages, shared with the batch rules below so both report the same thing
+EMAIL_REQUIRED = "Email must be a non-empty string."
+EMAIL_INVALID = "Invalid email format."
+MOBILE_INVALID = "Mobile must be a valid number. Use format 759233322"
+MOBILE_TOO_SHORT = f"Mobile must be a valid number with at least {MOBILE_MIN_DIGITS} digits. Use format 759233322"
+ROLE_INVALID = "Role must be either 'applicant' or 'employer'."
+WEBSITE_INVALID = "Website must start with http:// or https://"
+JOB_TYPE_INVALID = f"Job type must be one of: {', '.join(JOB_TYPE_CHOICES)}."
+SALARY_INVALID = "Salary must be a positive number."
+STATUS_INVALID = f"Status must be one of: {', '.join(STATUS_CHOICES)}"
+
+def empty_message(label):
+    return f"{label} cannot be empty."
+
+def id_message(label):
+    return f"{label} must be a valid numeric ID."
+
+def required_text(value, label):
+    """Strip `value`, rejecting anything but a non-blank string."""
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(empty_message(label))
+    return value.strip()
+
+def email(value):
+    if not value or not isinstance(value, str):
+        raise ValueError(EMAIL_REQUIRED)
+    if not EMAIL_PATTERN.fullmatch(value):
+        raise ValueError(EMAIL_INVALID)
+    return value
+
+def mobile(value):
+    """Digits only (surrounding whitespace allowed), at least MOBILE_MIN_DIGITS of them."""
+    digits = str(value).strip()
+    if not digits.isdecimal():
+        raise ValueError(MOBILE_INVALID)
+    if len(digits) < MOBILE_MIN_DIGITS:
+        raise ValueError(MOBILE_TOO_SHORT)
+    return int(digits)
+
+def role(value):
+    if not isinstance(value, str) or value not in ROLES:
+        raise ValueError(ROLE_INVALID)
+    return value
+
+def website(value):
+    value = required_text(value, "Website")
+    if not value.startswith(("http://", "https://")):
+        raise ValueError(WEBSITE_INVALID)
+    return value
+
+def job_type(value):
+    if not isinstance(value, str) or value.strip().lower() not in JOB_TYPES:
+        raise ValueError(JOB_TYPE_INVALID)
+    return value.strip().lower()
+
+def salary(value):
+    """A non-negative int or finite float, or a string of digits with at most one decimal point."""
+    if isinstance(value, str):
+        amount = value.strip()
+        if not amount.replace('.', '', 1).isdecimal():
+            raise ValueError(SALARY_INVALID)
+        return float(amount)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(SALARY_INVALID)
+    if value < 0 or (isinstance(value, float) and not math.isfinite(value)):
+        raise ValueError(SALARY_INVALID)
+    return value
+
+def numeric_id(value, label):
+    if not value or not str(value).isdecimal():
+        raise ValueError(id_message(label))
+    return int(value)
+
+def status(value):
+    if not value or not isinstance(value, str) or value.lower() not in STATUSES:
+        raise ValueError(STATUS_INVALID)
+    return value.lower()
+
+def validate_column(validator, values):
+    """Run `validator` over a whole column without raising.
+
+    Returns (cleaned values, errors): both lists line up with `values`, with
+    None in `cleaned` where the row failed and None in `errors` where it passed.
+    """
+    cleaned, errors = [], []
+    for value in values:
+        try:
+            cleaned.append(validator(value))
+            errors.append(None)
+        except ValueError as error:
+            cleaned.append(None)
+            errors.append(str(error))
+    return cleaned, errors
+
+# Batch validation: the same rules, one NumPy pass per column.
+
+# Every character str.isspace() accepts, which is what \S excludes
+WHITESPACE = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005'
+    '\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000'
+)
+
+class Column:
+    """One column of raw values, converted once for the checks that run over it.
+
+    `strings` holds str(value) for every row ('' for None) as a NumPy string
+    array; `text` marks the rows that really were strings.
+    """
+
+    def __init__(self, values):
+        import numpy as np
+        # filled element by element: np.asarray would turn a row holding a list
+        # (a JSON array, a Parquet list column) into an extra dimension
+        self.values = np.empty(len(values), dtype=object)
+        self.values[:] = list(values)
+        self.types = set(map(type, self.values))
+        self.missing = self.instances(type(None))
+        self.text = self.instances(str)
+        strings = np.where(self.missing, '', self.values)
+        # astype(str) would unpack these too; they're rejected anyway, so any text does
+        nested = self.instances((list, tuple, dict, set, np.ndarray))
+        if nested.any():
+            strings[nested] = [str(value) for value in self.values[nested]]
+        self.strings = strings.astype(str)
+
+    def __len__(self):
+        return len(self.values)
+
+    def instances(self, kind):
+        """Mask of the rows whose value is an instance of `kind` (a type or a tuple of types)."""
+        import numpy as np
+        # imported columns nearly always hold one type, which needs no per-row check
+        matches = {issubclass(found, kind) for found in self.types}
+        if matches != {True, False}:
+            return np.full(len(self.values), True in matches)
+        return np.frompyfunc(lambda value: isinstance(value, kind), 1, 1)(self.values).astype(bool)
+
+def blank_mask(column):
+    """Rows required_text rejects: not a string, or only whitespace."""
+    import numpy as np
+    return ~column.text | (np.strings.str_len(np.strings.strip(column.strings)) == 0)
+
+def empty_string_mask(column):
+    """Rows email rejects before matching: not a string, or ''."""
+    import numpy as np
+    return ~column.text | (np.strings.str_len(column.strings) == 0)
+
+def email_mask(column):
+    """Vector form of EMAIL_PATTERN: no whitespace, an '@' after the first
+    character and a '.' at least one character past it, with text after it."""
+    import numpy as np
+    strings = column.strings
+    candidates = WHITESPACE
+    # an all-ASCII column (the usual case) can only hold the ASCII ones
+    if len(strings) and strings.view(np.uint32).max() < 0x80:
+        candidates = [character for character in WHITESPACE if character < '\x80']
+    has_space = np.zeros(len(strings), dtype=bool)
+    for character in candidates:
+        has_space |= np.strings.find(strings, character) >= 0
+    at = np.strings.find(strings, '@', 1)
+    dot = np.strings.rfind(strings, '.', 0, np.strings.str_len(strings) - 1)
+    return column.missing | has_space | (at < 0) | (dot < at + 2)
+
+def mobile_digits(column):
+    import numpy as np
+    return np.strings.strip(np.where(column.missing, 'None', column.strings))
+
+def mobile_mask(column):
+    import numpy as np
+    return ~np.strings.isdecimal(mobile_digits(column))
+
+def mobile_length_mask(column):
+    import numpy as np
+    return np.strings.str_len(mobile_digits(column)) < MOBILE_MIN_DIGITS
+
+def salary_mask(column):
+    """Rows salary rejects: see validators.salary."""
+    import numpy as np
+    digits = np.strings.replace(np.strings.strip(column.strings), '.', '', 1)
+    bad = column.text & ~np.strings.isdecimal(digits)
+    integers = column.instances(int) & ~column.instances(bool)
+    floats = column.instances(float)
+    bad |= ~(column.text | integers | floats)
+    # ints are compared as Python objects, so any size works
+    bad[integers] = np.less(column.values[integers], 0).astype(bool)
+    amounts = column.values[floats].astype(np.float64)
+    bad[floats] = ~np.isfinite(amounts) | (amounts < 0)
+    return bad
+
+def numeric_id_mask(column):
+    """Rows numeric_id rejects: falsy values (None, '', 0) and anything whose
+    text isn't all decimal digits. Never converted, so no length overflows."""
+    import numpy as np
+    falsy = column.missing | (~column.text & (column.strings == '0'))
+    return falsy | ~np.strings.isdecimal(column.strings)
+
+def website_mask(column):
+    import numpy as np
+    strings = np.strings.strip(column.strings)
+    return ~(np.strings.startswith(strings, 'http://') | np.strings.startswith(strings, 'https://'))
+
+def choice_mask(choices, strip=False, lower=False, text_only=False):
+    """Rows whose value (optionally stripped and lower-cased) isn't one of `choices`."""
+    def mask(column):
+        import numpy as np
+        strings = column.strings
+        if strip:
+            strings = np.strings.strip(strings)
+        if lower:
+            strings = np.strings.lower(strings)
+        bad = column.missing | ~np.isin(strings, list(choices))
+        return bad | ~column.text if text_only else bad
+    return mask
+
+def required(label):
+    return [(blank_mask, empty_message(label))]
+
+# column name -> [(vectorized check returning True for bad rows, message), ...],
+# in the order the scalar validator tests them; a row reports the first that fails
+BATCH_RULES = {
+    'users': {
+        'name': required("Name"),
+        'email': [(empty_string_mask, EMAIL_REQUIRED), (email_mask, EMAIL_INVALID)],
+        'mobile': [(mobile_mask, MOBILE_INVALID), (mobile_length_mask, MOBILE_TOO_SHORT)],
+        'role': [(choice_mask(ROLES, text_only=True), ROLE_INVALID)],
+    },
+    'companies': {
+        'name': required("Company name"),
+        'industry': required("Industry"),
+        'website': required("Website") + [(website_mask, WEBSITE_INVALID)],
+    },
+    'jobs': {
+        'name': required("Job name"),
+        'location': required("Job location"),
+        'description': required("Job description"),
+        'salary': [(salary_mask, SALARY_INVALID)],
+        'type': [(choice_mask(JOB_TYPES, strip=True, lower=True, text_only=True), JOB_TYPE_INVALID)],
+    },
+    'applications': {
+        'user_id': [(numeric_id_mask, id_message("user_id"))],
+        'job_id': [(numeric_id_mask, id_message("job_id"))],
+        'status': [(choice_mask(STATUSES, lower=True, text_only=True), STATUS_INVALID)],
+    },
+}
+
+class BatchValidation:
+    """Outcome of validate_batch: one boolean error mask per checked column."""
+
+    def __init__(self, size, checks):
+        import numpy as np
+        self.size = size
+        # column -> [(mask, message), ...] in rule order
+        self.checks = checks
+        self.columns = {}
+        for column, results in checks.items():
+            mask = np.zeros(size, dtype=bool)
+            for failed, _ in results:
+                mask |= failed
+            self.columns[column] = mask
+        self.invalid = np.zeros(size, dtype=bool)
+        for mask in self.columns.values():
+            self.invalid |= mask
+
+    @property
+    def valid(self):
+        return ~self.invalid
+
+    @property
+    def error_count(self):
+        return int(self.invalid.sum())
+
+    def reasons(self, row):
+        """Error messages for one row, in column order: per column, the one
+        the scalar validator would have raised."""
+        return [
+            next(message for failed, message in self.checks[column] if failed[row])
+            for column, mask in self.columns.items() if mask[row]
+        ]
+
+def validate_batch(model, records):
+    """Check many records for `model` at once, without building ORM objects.
+
+    `records` is either a list of dicts or a dict of column lists, keyed by
+    column name ('email', 'salary', ...). Like the model setters, only the
+    columns that are present get checked, and a row fails exactly when the
+    setter would raise, with the same message. Returns a BatchValidation
+    whose `invalid` mask has one entry per record.
+    """
+    rules = BATCH_RULES.get(model.__tablename__)
+    if rules is None:
+        raise ValueError(f"No batch validation rules for '{model.__tablename__}'.")
+
+    if isinstance(records, dict):
+        columns = records
+        sizes = {len(values) for values in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("All columns must have the same length.")
+        size = sizes.pop() if sizes else 0
+    else:
+        size = len(records)
+        present = set().union(*(record.keys() for record in records)) if records else set()
+        columns = {name: [record.get(name) for record in records] for name in rules if name in present}
+
+    checks = {}
+    for name, column_rules in rules.items():
+        if name in columns:
+            column = Column(columns[name])
+            checks[name] = [(check(column), message) for check, message in column_rules]
+    return BatchValidation(size, checks)